@@ -0,0 +1,76 @@
+import os
+import functools
+from vehicle_data import DATA_PATH, load_vehicle_data
+
+# ----------------------------------
+# PRECOMPUTED DASHBOARD AGGREGATES
+# ----------------------------------
+# Every group-by the dashboard can show is computed once per dataset version;
+# changing a dashboard filter is then a dict lookup.
+
+ALL = "All"
+FILTER_COLUMN = "TYPE OF FUEL"
+
+DIMENSIONS = {
+    "Vehicle Category": "Vehicle Category",
+    "Brand": "Brand Name",
+    "Fuel Type": "TYPE OF FUEL",
+    "Transmission": "Transmission",
+}
+
+METRICS = {
+    "Combined L/100 km": "Combined Fuel Efficiency (L/100 km)",
+    "City L/100 km": "City Fuel Efficiency (L/100 km)",
+    "Highway L/100 km": "Highway Fuel Efficiency (L/100 km)",
+    "Combined mpg": "Combined Fuel Efficiency (mpg)",
+    "CO2 g/km": "CO2 Emission Rate (g/km)",
+}
+
+
+def _summarise(df, by=None):
+    agg = {label: (col, "mean") for label, col in METRICS.items()}
+    agg["Vehicles"] = (METRICS["Combined L/100 km"], "size")
+    if by is None:
+        row = {label: df[col].mean() for label, (col, _) in agg.items() if label != "Vehicles"}
+        row["Vehicles"] = len(df)
+        return row
+    table = df.groupby(by, observed=True, sort=False).agg(**agg)
+    return table.sort_values("Vehicles", ascending=False).round(2)
+
+
+def build_aggregates(df):
+    # the store keeps float32 columns; aggregate in float64 so rounded means print cleanly
+    df = df.astype({col: "float64" for col in METRICS.values()})
+    df[FILTER_COLUMN] = df[FILTER_COLUMN].astype("string").fillna("Unknown")
+    filters = [ALL] + sorted(df[FILTER_COLUMN].unique())
+
+    kpis, tables = {}, {}
+    for value in filters:
+        subset = df if value == ALL else df[df[FILTER_COLUMN] == value]
+        kpis[value] = _summarise(subset)
+        for dim, col in DIMENSIONS.items():
+            tables[(dim, value)] = _summarise(subset, col)
+    return {"filters": filters, "kpis": kpis, "tables": tables, "rows": len(df)}
+
+
+@functools.lru_cache(maxsize=4)
+def _aggregates_for_version(path, mtime_ns, size):
+    return build_aggregates(load_vehicle_data(path))
+
+
+def data_version(path=DATA_PATH):
+    # what every per-dataset cache is keyed on: a rewritten source is a new version
+    st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+
+def get_aggregates(path=DATA_PATH):
+    return _aggregates_for_version(*data_version(path))
+
+
+def group_table(aggregates, dimension, fuel=ALL):
+    return aggregates["tables"][(dimension, fuel)]
+
+
+def kpis(aggregates, fuel=ALL):
+    return aggregates["kpis"][fuel]
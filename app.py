@@ -1,105 +1,25 @@
-import time
-import re
 import os
-import base64
-import requests
-import numpy as np
-import pandas as pd
-import pickle as pk
+import html
+import logging
+from urllib.parse import urlsplit
 import streamlit as st
-from streamlit_lottie import st_lottie
-import feedparser
-import plotly.express as px
-from io import BytesIO
-
-loaded_model = pk.load(open("trained_model_lr.sav", "rb"))
-scaled_data  = pk.load(open("scaled_data.sav", "rb"))
+from predictor import vehicle_map, trans_map, fuel_map, INPUT_COLUMNS, ENGINE_RANGE, CYLINDER_RANGE, CO2_RANGE, iter_predict_csv, measured_latency
+from theme import theme_markup
+from model_registry import SERVED_MODELS, load_model
+from prediction_table import load_or_build_table, lookup
+from news import get_news_aggregator
+from warm_up import run_concurrently
+from tracing import tracer
 
 st.set_page_config(page_title="FuelSense Analysis", page_icon="⛽", layout="wide")
 
-st.markdown("""
-<style>
-/* Hide tooltips */
-button [data-baseweb="button"] + div, 
-button + div[role="tooltip"], 
-[data-testid="stTooltipHoverTarget"],
-div[role='tooltip'] {
-    display: none !important;
-}
-
-/* Fix for expander keyboard shortcuts overlapping */
-.st-emotion-cache-1itdyc2, 
-[data-testid="stExpander"] summary span:last-child,
-.streamlit-expanderHeader span:last-child {
-    display: none !important;
-}
-
-/* Ensure expander text is visible */
-[data-testid="stExpander"] summary {
-    overflow: visible !important;
-}
-</style>
-""", unsafe_allow_html=True)
+# per-section timings; no-ops unless FUELSENSE_TRACING=1 (see tracing.py)
+tracer.begin_rerun(st.session_state)
+tracer.section("theme")
+# a one-line @import of the content-hashed stylesheet under static/ (see theme.py)
+st.markdown(theme_markup(st.get_option("server.enableStaticServing")), unsafe_allow_html=True)
 
-DARK_DASHBOARD_IMAGES = [
-    "https://images.unsplash.com/photo-1492144534655-ae79c964c9d7?w=400&h=400&fit=crop&q=80",
-    "https://images.unsplash.com/photo-1449824913935-59a10b8d2000?w=400&h=400&fit=crop&q=80",
-    "https://images.unsplash.com/photo-1605559424843-9e4c228bf1c2?w=400&h=400&fit=crop&q=80",
-    "https://images.unsplash.com/photo-1494976688754-90f4743b2d1e?w=400&h=400&fit=crop&q=80",
-    "https://images.unsplash.com/photo-1503376780353-7e6692767b70?w=400&h=400&fit=crop&q=80",
-]
-
-BACKGROUND_TEXTURE_URL = "https://images.unsplash.com/photo-1617886903355-9354bb57751f?w=1920&h=1080&fit=crop&q=80"
-
-@st.cache_data
-def fetch_image_as_base64_with_mime(url, timeout=8):
-    try:
-        response = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
-        if response.status_code == 200 and response.content:
-            ctype = response.headers.get("Content-Type", "").lower()
-            if "png" in ctype:
-                mime = "image/png"
-            elif "svg" in ctype:
-                mime = "image/svg+xml"
-            elif "jpeg" in ctype or "jpg" in ctype:
-                mime = "image/jpeg"
-            else:
-                mime = "image/jpeg"
-            b64 = base64.b64encode(response.content).decode()
-            return b64, mime
-    except Exception:
-        pass
-    return None
-
-def create_dark_automotive_svg(width=120, height=120):
-    svg_content = f"""<svg xmlns='http://www.w3.org/2000/svg' width='{width}' height='{height}' viewBox='0 0 {width} {height}'>
-        <defs>
-            <radialGradient id='dashGrad' cx='50%' cy='50%' r='50%'>
-                <stop offset='0%' style='stop-color:#2a2a2a;stop-opacity:1' />
-                <stop offset='100%' style='stop-color:#0f0f0f;stop-opacity:1' />
-            </radialGradient>
-            <linearGradient id='needleGrad' x1='0%' y1='0%' x2='100%' y2='100%'>
-                <stop offset='0%' style='stop-color:#ffffff;stop-opacity:0.8' />
-                <stop offset='100%' style='stop-color:#cccccc;stop-opacity:0.6' />
-            </linearGradient>
-        </defs>
-        <rect width='100%' height='100%' fill='url(#dashGrad)' rx='12'/>
-        <circle cx='{width//2}' cy='{height//2}' r='{width//3}' fill='none' stroke='#333' stroke-width='2'/>
-        <circle cx='{width//2}' cy='{height//2}' r='{width//4}' fill='none' stroke='#444' stroke-width='1'/>
-        <line x1='{width//2}' y1='{height//2}' x2='{width//2 + width//4}' y2='{height//2 - height//8}' stroke='url(#needleGrad)' stroke-width='3' stroke-linecap='round'/>
-        <circle cx='{width//2}' cy='{height//2}' r='4' fill='url(#needleGrad)'/>
-        <text x='{width//2}' y='{height - 15}' text-anchor='middle' fill='#888' font-family='Arial' font-size='10' font-weight='bold'>FUEL</text>
-    </svg>"""
-    return base64.b64encode(svg_content.encode()).decode(), "image/svg+xml"
-
-def load_lottie(url):
-    try:
-        r = requests.get(url, timeout=8)
-        return r.json() if r.status_code == 200 else None
-    except:
-        return None
-
-def show_enhanced_loading_animation():
+def show_enhanced_loading_animation(tasks):
     loading_placeholder = st.empty()
     with loading_placeholder.container():
         st.markdown("""
@@ -120,417 +40,30 @@ def show_enhanced_loading_animation():
                 @keyframes fuelFlow { 0% { transform: translateX(-100%);} 25% { transform: translateX(-50%);} 50% { transform: translateX(0%);} 75% { transform: translateX(50%);} 100% { transform: translateX(100%);} }
             </style>
         """, unsafe_allow_html=True)
-    time.sleep(2.2)
-    loading_placeholder.empty()
+        progress = st.progress(0.0)
 
-show_enhanced_loading_animation()
+    def on_progress(done, total, name):
+        progress.progress(done / total, text=f"{name} ready ({done}/{total})")
 
-bg_texture_result = fetch_image_as_base64_with_mime(BACKGROUND_TEXTURE_URL)
-bg_texture_b64 = bg_texture_result[0] if bg_texture_result else None
+    results, errors = run_concurrently(tasks, on_progress)
+    loading_placeholder.empty()
+    return results, errors
 
-if bg_texture_b64:
-    bg_css = f"""
-    background-image: url('data:image/jpeg;base64,{bg_texture_b64}'), linear-gradient(180deg, rgba(0,0,0,0.88) 0%, rgba(8,8,10,0.92) 100%) !important;
-    background-size: cover, cover !important;
-    background-position: center, center !important;
-    background-repeat: no-repeat, no-repeat !important;
-    background-attachment: fixed, fixed !important;
-    background-blend-mode: overlay !important;
-    """
-else:
-    bg_css = "background: linear-gradient(180deg, #000000 0%, #0a0a0a 50%, #050505 100%), radial-gradient(circle at 20% 30%, rgba(255,255,255,0.015), transparent 25%), radial-gradient(circle at 80% 70%, rgba(255,255,255,0.01), transparent 20%) !important;"
+tracer.section("warm_up")
 
-st.markdown(f"""
-<style>
-  @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-
-  * {{
-    font-family: -apple-system, BlinkMacSystemFont, "SF Pro Display", Inter, sans-serif !important;
-    -webkit-font-smoothing: antialiased !important;
-    -moz-osx-font-smoothing: grayscale !important;
-    color: #f5f5f5 !important;
-  }}
-
-  /* background from Python variable */
-  .stApp {{ {bg_css} }}
-  .main {{ {bg_css} }}
-  [data-testid="stAppViewContainer"] {{ {bg_css} }}
-
-  [data-testid="stHeader"] {{ background: transparent !important; }}
-  .block-container {{ background: transparent !important; }}
-
-  /* Reduced top padding for the header area - minimizes open space */
-  .header-compact {{
-    padding: 8px 0 6px 0 !important;
-    margin-bottom: 6px !important;
-  }}
-
-  /* Tiny textured strip style (no external images used) */
-  .header-texture {{
-    width: 100%;
-    height: 58px;
-    border-radius: 10px;
-    margin: 0 auto 6px auto;
-    max-width: 900px;
-    background: linear-gradient(180deg, rgba(10,10,12,0.85), rgba(20,20,22,0.7));
-    box-shadow: 0 6px 28px rgba(0,0,0,0.6), inset 0 1px 0 rgba(255,255,255,0.02);
-    border: 1px solid rgba(255,255,255,0.02);
-    display:flex;
-    align-items:center;
-    justify-content:center;
-    overflow:hidden;
-    position:relative;
-  }}
-
-  /* subtle pattern overlay (CSS-only) */
-  .header-texture::before {{
-    content: '';
-    position: absolute;
-    inset: 0;
-    background-image:
-      linear-gradient(90deg, rgba(255,255,255,0.005) 1px, transparent 1px),
-      linear-gradient(180deg, rgba(255,255,255,0.01) 1px, transparent 1px);
-    background-size: 40px 40px, 40px 40px;
-    opacity: 0.04;
-    pointer-events: none;
-  }}
-
-  /* Big, bold title — correct class name: .fuel-main-title */
-  .fuel-main-title {{
-    font-size: 4.8rem !important;
-    font-weight: 900 !important;
-    line-height: 1.02 !important;
-    margin: 10px 0 8px 0 !important;
-    letter-spacing: -0.02em !important;
-    text-shadow: 0 3px 8px rgba(0,0,0,0.45) !important;
-    background: linear-gradient(135deg, #ffffff 0%, #e0e0e0 100%) !important;
-    -webkit-background-clip: text !important;
-    -webkit-text-fill-color: transparent !important;
-  }}
-
-  /* --- Fixed Streamlit form elements --- */
-  
-  /* Fix selectbox styling and ensure dropdown items are visible */
-  .stSelectbox > div > div > div {{
-    background-color: rgba(40, 40, 40, 0.95) !important;
-    border: 1px solid rgba(255, 255, 255, 0.1) !important;
-    border-radius: 8px !important;
-    color: #ffffff !important;
-  }}
-  
-  .stSelectbox > div > div > div > div {{
-    color: #ffffff !important;
-  }}
-  
-  /* Fix dropdown menu visibility */
-  .stSelectbox [data-baseweb="select"] > div {{
-    background-color: rgba(40, 40, 40, 0.98) !important;
-    border: 1px solid rgba(255, 255, 255, 0.1) !important;
-    color: #ffffff !important;
-  }}
-  
-  /* Fix dropdown options */
-  .stSelectbox [role="option"] {{
-    background-color: rgba(40, 40, 40, 0.95) !important;
-    color: #ffffff !important;
-  }}
-  
-  .stSelectbox [role="option"]:hover {{
-    background-color: rgba(60, 60, 60, 0.95) !important;
-    color: #ffffff !important;
-  }}
-  
-  /* Fix selected option */
-  .stSelectbox [data-baseweb="select"] span {{
-    color: #ffffff !important;
-  }}
-
-  /* --- Make Streamlit sliders match the FuelSense title tone --- */
-  :root {{
-    --fuel-title-color: #e0e0e0;
-    --fuel-title-gradient: linear-gradient(90deg, #ffffff, #e0e0e0);
-  }}
-
-  /* generic range input override (modern browsers) */
-  input[type="range"] {{
-    accent-color: var(--fuel-title-color) !important;
-  }}
-
-  /* webkit track + thumb */
-  input[type="range"]::-webkit-slider-runnable-track {{
-    background: var(--fuel-title-gradient) !important;
-    height: 6px !important;
-    border-radius: 10px !important;
-  }}
-  input[type="range"]::-webkit-slider-thumb {{
-    -webkit-appearance: none !important;
-    appearance: none !important;
-    width: 18px !important;
-    height: 18px !important;
-    border-radius: 6px !important;
-    background: var(--fuel-title-color) !important;
-    border: 2px solid rgba(255,255,255,0.08) !important;
-    margin-top: -6px !important; /* center the thumb on the track */
-    box-shadow: 0 4px 14px rgba(0,0,0,0.45) !important;
-  }}
-
-  /* Firefox */
-  input[type="range"]::-moz-range-track {{
-    background: var(--fuel-title-gradient) !important;
-    height: 6px !important;
-    border-radius: 10px !important;
-  }}
-  input[type="range"]::-moz-range-thumb {{
-    background: var(--fuel-title-color) !important;
-    width: 18px !important;
-    height: 18px !important;
-    border: 2px solid rgba(255,255,255,0.08) !important;
-    border-radius: 6px !important;
-  }}
-
-  /* Streamlit rc-slider specific overrides */
-  .stSlider .rc-slider-rail {{
-    background: rgba(255,255,255,0.08) !important;
-    height: 6px !important;
-    border-radius: 10px !important;
-  }}
-  .stSlider .rc-slider-track {{
-    background: var(--fuel-title-gradient) !important;
-    height: 6px !important;
-    border-radius: 10px !important;
-  }}
-  .stSlider .rc-slider-handle {{
-    background: var(--fuel-title-color) !important;
-    border: 2px solid rgba(255,255,255,0.08) !important;
-    box-shadow: 0 6px 18px rgba(0,0,0,0.45) !important;
-  }}
-
-  /* Subheading under title */
-  p.sub-head {{
-    text-align: center;
-    color: #c5c5c5;
-    font-size: 1.12rem;
-    margin-bottom: 30px;
-    font-weight: 500;
-    letter-spacing: 0.3px;
-    line-height: 1.4;
-  }}
-
-  /* Fix button styling to prevent text overlap */
-  .stButton > button {{
-    background: linear-gradient(135deg, rgba(255,255,255,0.1), rgba(255,255,255,0.05)) !important;
-    color: #ffffff !important;
-    border: 1px solid rgba(255,255,255,0.1) !important;
-    border-radius: 12px !important;
-    padding: 12px 24px !important;
-    font-weight: 600 !important;
-    font-size: 16px !important;
-    transition: all 0.2s ease !important;
-    min-height: 48px !important;
-    display: flex !important;
-    align-items: center !important;
-    justify-content: center !important;
-    text-align: center !important;
-    white-space: nowrap !important;
-    overflow: visible !important;
-  }}
-  
-  .stButton > button:hover {{
-    background: linear-gradient(135deg, rgba(255,255,255,0.2), rgba(255,255,255,0.1)) !important;
-    border: 1px solid rgba(255,255,255,0.2) !important;
-    transform: translateY(-2px) !important;
-    box-shadow: 0 8px 25px rgba(0,0,0,0.3) !important;
-  }}
-
-  /* Preserve all original interactive element styling below */
-  .glass-card {{
-    background: linear-gradient(180deg, rgba(15,15,15,0.85), rgba(8,8,8,0.9)) !important;
-    backdrop-filter: blur(20px) saturate(120%) !important;
-    border: 1px solid rgba(255,255,255,0.04) !important;
-    border-radius: 20px !important;
-    padding: 32px !important;
-    margin: 24px 0 !important;
-    box-shadow: 0 8px 32px rgba(0,0,0,0.3), inset 0 1px 0 rgba(255,255,255,0.05) !important;
-  }}
-
-  /* keep responsive title scaling */
-  @media (max-width: 1100px) {{
-    .fuel-main-title {{ font-size: 3.6rem !important; }}
-  }}
-  @media (max-width: 768px) {{
-    .fuel-main-title {{ font-size: 2.4rem !important; }}
-    .header-texture {{ height: 44px; }}
-  }}
-
-  /* Fix text input styling */
-  .stTextInput > div > div > input {{
-    background-color: rgba(40, 40, 40, 0.95) !important;
-    border: 1px solid rgba(255, 255, 255, 0.1) !important;
-    border-radius: 8px !important;
-    color: #ffffff !important;
-  }}
-
-  /* Fix labels */
-  .stSelectbox label, .stSlider label, .stTextInput label {{
-    color: #ffffff !important;
-    font-weight: 500 !important;
-  }}
- 
-  /* Additional dropdown visibility fixes */
-  .stSelectbox [data-baseweb="select"] [data-baseweb="popover"] {{
-    background-color: rgba(40, 40, 40, 0.98) !important;
-    border: 1px solid rgba(255, 255, 255, 0.1) !important;
-  }}
-
-  .stSelectbox [data-baseweb="select"] ul {{
-    background-color: rgba(40, 40, 40, 0.98) !important;
-  }}
-
-  .stSelectbox [data-baseweb="select"] li {{
-    background-color: rgba(40, 40, 40, 0.95) !important;
-    color: #ffffff !important;
-  }}
-
-  .stSelectbox [data-baseweb="select"] li:hover {{
-    background-color: rgba(60, 60, 60, 0.95) !important;
-    color: #ffffff !important;
-  }}
-
-  /* Fix for dropdown text visibility */
-  .stSelectbox [data-baseweb="select"] [role="listbox"] [role="option"] span {{
-    color: #ffffff !important;
-  }}
-
-  .stSelectbox [data-baseweb="select"] [role="option"] > div {{
-    color: #ffffff !important;
-  }}
-  .stSelectbox [role="listbox"] [role="option"] {{
-    color: #ffffff !important;         /* ensures text + emojis visible */
-    background-color: rgba(30,30,30,0.95) !important;
-    display: flex !important;
-    align-items: center !important;
-    padding: 6px 10px !important;
-}}
-
-.stSelectbox [role="listbox"] [role="option"]:hover {{
-    background-color: rgba(60,60,60,0.95) !important;
-    color: #ffffff !important;
-}}
-  /* Ensure all text in dropdown is visible */
-.stSelectbox * {{
-    color: #ffffff !important;
-  }}
-
-  /* Global popover coverage (covers when BaseWeb attaches popovers to body) */
-  body [data-baseweb="popover"] *,
-  body [data-baseweb="popover"] [role="option"],
-  body [data-baseweb="popover"] ul[role="listbox"] {{
-    color: #ffffff !important;
-    background-color: rgba(30,30,30,0.98) !important;
-    font-family: -apple-system, BlinkMacSystemFont, "SF Pro Display", Inter, "Segoe UI Emoji", "Noto Color Emoji", "Apple Color Emoji", sans-serif !important;
-    -webkit-text-fill-color: #ffffff !important;
-    opacity: 1 !important;
-    visibility: visible !important;
-    z-index: 9999 !important;
-  }}
-
-  /* listbox container */
-  .stSelectbox [data-baseweb="select"] ul[role="listbox"],
-  .stSelectbox [data-baseweb="select"] [role="listbox"] {{
-    background-color: rgba(30,30,30,0.98) !important;
-    color: #ffffff !important;
-    padding: 6px 0 !important;
-    border-radius: 8px !important;
-  }}
-
-  /* individual options */
-  .stSelectbox [data-baseweb="select"] [role="option"],
-  .stSelectbox [data-baseweb="select"] li[role="option"] {{
-    display: flex !important;
-    align-items: center !important;
-    gap: 10px !important;
-    padding: 8px 12px !important;
-    color: #ffffff !important;
-    background-color: rgba(30,30,30,0.95) !important;
-    -webkit-text-fill-color: #ffffff !important;
-  }}
-
-  .stSelectbox [data-baseweb="select"] [role="option"]:hover,
-  .stSelectbox [data-baseweb="select"] li[role="option"]:hover,
-  body [data-baseweb="popover"] [role="option"]:hover {{
-    background-color: rgba(60,60,60,0.95) !important;
-    color: #ffffff !important;
-  }}
-
-  /* ensure the selected value inside the control is visible (closed select) */
-  .stSelectbox [data-baseweb="select"] [data-baseweb="control"] *,
-  .stSelectbox [data-baseweb="select"] [data-baseweb="control"] {{
-    color: #ffffff !important;
-    -webkit-text-fill-color: #ffffff !important;
-    font-family: -apple-system, BlinkMacSystemFont, "SF Pro Display", Inter, "Segoe UI Emoji", "Noto Color Emoji", sans-serif !important;
-  }}
-  
-  div[data-baseweb="popover"] [role="option"] {{
-    color: #ffffff !important;               /* text color visible */
-    -webkit-text-fill-color: #ffffff !important;  /* Safari/Chrome fix */
-    font-family: "Segoe UI Emoji", "Noto Color Emoji", "Apple Color Emoji", sans-serif !important;
-    background-color: transparent !important;
-  }}
-
-  div[data-baseweb="popover"] [role="option"]:hover {{
-      background-color: rgba(70, 70, 70, 0.95) !important;
-      color: #ffffff !important;
-    }}
-  /* --- Nuclear fix for invisible dropdown options --- */
-  div[data-baseweb="popover"] [role="option"] {{
-      color: #ffffff !important;                     /* force white text */
-      -webkit-text-fill-color: #ffffff !important;   /* Chrome/Safari override */
-      background-color: #111 !important;             /* dark background for contrast */
-      opacity: 1 !important;                         /* ensure visible */
-      visibility: visible !important;                /* ensure visible */
-  }}
-
-  div[data-baseweb="popover"] [role="option"] * {{
-      color: #ffffff !important;                     /* child spans also visible */
-      -webkit-text-fill-color: #ffffff !important;
-      opacity: 1 !important;
-      visibility: visible !important;
-  }}
-
-  div[data-baseweb="popover"] [role="option"]:hover {{
-      background-color: #333 !important;             /* highlight on hover */
-      color: #ffffff !important;
-  }}
-div[data-baseweb="popover"] [role="option"] {{
-    border: 1px solid red !important;
-}}
-div[data-baseweb="popover"] [role="option"] span {{
-    color: #ffffff !important;
-    -webkit-text-fill-color: #ffffff !important;
-    font-family: "Segoe UI Emoji", "Noto Color Emoji", "Apple Color Emoji", sans-serif !important;
-    opacity: 1 !important;
-    visibility: visible !important;
-}}
-div[data-baseweb="popover"] [role="option"] span {{
-    border: 1px solid lime !important;
-}}
-
-div[data-baseweb="popover"] [role="option"],
-div[data-baseweb="popover"] [role="option"] *,
-div[data-baseweb="popover"] [role="option"]::before,
-div[data-baseweb="popover"] [role="option"]::after {{
-    color: #ffffff !important;
-    -webkit-text-fill-color: #ffffff !important;
-    background: none !important;
-    opacity: 1 !important;
-    visibility: visible !important;
-}}
-div[data-baseweb="popover"] [role="option"] {{
-    content: "TEST" !important;
-}}
-</style>
-""", unsafe_allow_html=True)
+# first run of a session warms what the first screen needs in parallel; the dashboard loads its own data when opened
+if not st.session_state.get("warmed_up"):
+    _, warm_up_errors = show_enhanced_loading_animation({
+        "Model": lambda: load_or_build_table(),
+        "News feed": lambda: get_news_aggregator().refresh(),
+    })
+    # the page still renders without them; say which load failed instead of dropping it
+    for name, error in warm_up_errors.items():
+        logging.getLogger("fuelsense.warm_up").warning("%s warm-up failed", name, exc_info=error)
+        st.warning(f"⚠️ {name} could not be loaded: {error}")
+    st.session_state["warmed_up"] = True
 
+tracer.section("header")
 st.markdown("<div class='header-compact' style='text-align:center;'>", unsafe_allow_html=True)
 
 st.markdown("<div class='header-texture' aria-hidden='true'></div>", unsafe_allow_html=True)
@@ -544,7 +77,21 @@ st.markdown("""
 
 st.markdown("</div>", unsafe_allow_html=True)
 
-with st.expander("🔧 VEHICLE CONFIGURATION & LATEST NEWS", expanded=False):
+# ----------------------------------
+# FRAGMENTS
+# ----------------------------------
+# The configuration panel, the news panel and the dashboard are fragments: a widget inside
+# one reruns only that function, not the page. Results that outlive a rerun of their
+# fragment (the last prediction, a scored fleet) are kept in session state.
+
+@st.fragment
+@tracer.fragment("configuration", st.session_state)
+def configuration_panel():
+    served_models = {label: path for label, path in SERVED_MODELS.items() if os.path.exists(path)}
+    model_choice = st.session_state.get("model_choice", next(iter(served_models)))
+    model_path = served_models.get(model_choice, next(iter(served_models.values())))
+    loaded_model = load_model(model_path)
+
     st.markdown("""
         <div style='text-align: center; margin-bottom: 28px;'>
             <h3 style='color: #ffffff; font-size: 1.7rem; font-weight: 700; margin-bottom: 8px; 
@@ -557,106 +104,162 @@ with st.expander("🔧 VEHICLE CONFIGURATION & LATEST NEWS", expanded=False):
         unsafe_allow_html=True,
     )
 
-    vehicle_map = {
-        '🏎️ Two-Seater': 'Two-seater',
-        '🚙 Compact': 'Compact', 
-        '🚗 Subcompact': 'Subcompact',
-        '🚐 Minivan': 'Minivan',
-        '🚙 SUV Small': 'SUV: Small',
-        '🚚 Pickup Standard': 'Pickup truck: Standard'
-    }
-
-    trans_map = {
-        '🔄 Automatic': 'A',
-        '⚙️ Manual': 'M',
-        '🔄 CVT': 'AV',
-        '🔀 Auto-Manual': 'AM',
-        '⚙️ Auto-Shift': 'AS'
-    }
-
-    fuel_map = {
-        '⛽ Diesel': 'D',
-        '🌱 Ethanol': 'E', 
-        '⛽ Gasoline': 'X',
-        '⚡ Electric': 'Z'
-    }
-
-    col1, col2 = st.columns(2, gap="large")
-
-    with col1:
-        veh_choice = st.selectbox("🚗 Vehicle Class", list(vehicle_map.keys()), key="vehicle")
-        engine = st.slider("🔧 Engine Size (Liters)", 1, 7, 3, key="engine")
-        cyl = st.slider("⚙️ Number of Cylinders", 1, 16, 4, key="cylinders")
-
-    with col2:
-        trans_choice = st.selectbox("🔄 Transmission Type", list(trans_map.keys()), key="transmission")
-        co2 = st.slider("🌍 CO₂ Emission Rating (1-10)", 1, 10, 5, key="co2")
-        fuel_choice = st.selectbox("⛽ Fuel Type", list(fuel_map.keys()), key="fuel")
-
-    st.markdown("<div style='display: flex; justify-content: center; margin: 32px 0;'>", unsafe_allow_html=True)
-
-    if st.button("✨ Calculate Fuel Consumption", help="Get AI-powered fuel consumption prediction"):
+    # widget changes stay in the browser until the form is submitted; only the submit reruns this panel
+    with st.form("vehicle_form", border=False):
+        col1, col2 = st.columns(2, gap="large")
+
+        with col1:
+            veh_choice = st.selectbox("🚗 Vehicle Class", list(vehicle_map.keys()), key="vehicle")
+            engine = st.slider("🔧 Engine Size (Liters)", *ENGINE_RANGE, 3, key="engine")
+            cyl = st.slider("⚙️ Number of Cylinders", *CYLINDER_RANGE, 4, key="cylinders")
+
+        with col2:
+            trans_choice = st.selectbox("🔄 Transmission Type", list(trans_map.keys()), key="transmission")
+            co2 = st.slider("🌍 CO₂ Emission Rating (1-10)", *CO2_RANGE, 5, key="co2")
+            fuel_choice = st.selectbox("⛽ Fuel Type", list(fuel_map.keys()), key="fuel")
+
+        st.selectbox("🤖 Prediction Model", list(served_models), key="model_choice")
+        st.markdown(f"""
+            <p style='color: #aaa; font-size: 0.9rem; text-align: center; margin: 4px 0 0 0;'>
+                ⚡ {measured_latency(loaded_model) * 1e6:.1f} µs per vehicle through the {model_choice} kernel
+                · the form answers from a table precomputed with it
+            </p>
+            """,
+            unsafe_allow_html=True,
+        )
+
+        st.markdown("<div style='display: flex; justify-content: center; margin: 32px 0;'>", unsafe_allow_html=True)
+        submitted = st.form_submit_button("✨ Calculate Fuel Consumption", help="Get AI-powered fuel consumption prediction")
+
+    configuration = (model_path, veh_choice, engine, cyl, trans_choice, co2, fuel_choice)
+    if submitted:
 
         with st.spinner("🧠 AI is analyzing your vehicle configuration..."):
-            time.sleep(1.5)
+            with tracer.span("predict"):
+                prediction_table = load_or_build_table(model_path)
+                pred = lookup(
+                    prediction_table, vehicle_map[veh_choice], engine, cyl,
+                    trans_map[trans_choice], co2, fuel_map[fuel_choice]
+                )
+        st.session_state["last_prediction"] = (configuration, pred)
+
+    # stays on screen across reruns until the configuration or the model changes
+    last_prediction = st.session_state.get("last_prediction")
+    if last_prediction is not None and last_prediction[0] == configuration:
+        pred = last_prediction[1]
+        st.success(f"🎯 **Predicted Fuel Consumption:** {pred:.2f} L/100 km")
+
+        if pred < 5:
+            efficiency = "🌟 Exceptional Efficiency"
+            color = "#a8e6a3"
+            advice = "Your vehicle configuration shows outstanding fuel economy. Perfect for long-distance travel!"
+        elif pred < 7:
+            efficiency = "✅ Excellent Efficiency"
+            color = "#c5e8c1"
+            advice = "Great fuel economy! This configuration balances performance and efficiency well."
+        elif pred < 9:
+            efficiency = "👍 Good Efficiency"
+            color = "#e2e2e2"
+            advice = "Solid fuel consumption. Consider hybrid options for better efficiency."
+        elif pred < 12:
+            efficiency = "⚠️ Average Consumption"
+            color = "#f0d794"
+            advice = "Higher than average consumption. Consider smaller engine or hybrid alternatives."
+        else:
+            efficiency = "🔺 High Consumption"
+            color = "#f5b7b1"
+            advice = "Significantly high fuel consumption. Review your vehicle configuration for better efficiency."
+
+        st.markdown(
+            f"""
+            <div style='text-align: center; padding: 24px; 
+                        background: linear-gradient(135deg, rgba(255,255,255,0.03), rgba(255,255,255,0.01)); 
+                        border-radius: 16px; margin: 20px 0;
+                        border: 1px solid rgba(255,255,255,0.05);
+                        box-shadow: 0 4px 16px rgba(0,0,0,0.2);'>
+                <h4 style='color: {color}; margin: 0 0 8px 0; font-size: 1.3rem; font-weight: 600;'>{efficiency}</h4>
+                <p style='color: #bbb; font-size: 0.95rem; margin: 0; line-height: 1.4;'>{advice}</p>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
 
-            inp = [
-                vehicle_map[veh_choice], engine, cyl,
-                trans_map[trans_choice], co2, fuel_map[fuel_choice]
-            ]
+        # nearest real vehicles from the dataset's per-category KD-trees (see similar_vehicles.py)
+        with tracer.span("similar_vehicles"):
+            from similar_vehicles import similar_vehicles
 
-            vcl = list(vehicle_map.values())
-            t = list(trans_map.values())
-            f = list(fuel_map.values())
-
-            lst = [vcl.index(inp[0]), inp[1], inp[2], t.index(inp[3]), inp[4]]
-            oh = [0] * 4
-            oh[f.index(inp[5])] = 1
-            lst.extend(oh)
-            lst.extend([0, 0, 0])
-
-            arr = np.array(lst).reshape(1, -1)
-            pred = loaded_model.predict(scaled_data.transform(arr))[0]
-
-            st.success(f"🎯 **Predicted Fuel Consumption:** {pred:.2f} L/100 km")
-
-            if pred < 5:
-                efficiency = "🌟 Exceptional Efficiency"
-                color = "#a8e6a3"
-                advice = "Your vehicle configuration shows outstanding fuel economy. Perfect for long-distance travel!"
-            elif pred < 7:
-                efficiency = "✅ Excellent Efficiency"
-                color = "#c5e8c1"
-                advice = "Great fuel economy! This configuration balances performance and efficiency well."
-            elif pred < 9:
-                efficiency = "👍 Good Efficiency"
-                color = "#e2e2e2"
-                advice = "Solid fuel consumption. Consider hybrid options for better efficiency."
-            elif pred < 12:
-                efficiency = "⚠️ Average Consumption"
-                color = "#f0d794"
-                advice = "Higher than average consumption. Consider smaller engine or hybrid alternatives."
-            else:
-                efficiency = "🔺 High Consumption"
-                color = "#f5b7b1"
-                advice = "Significantly high fuel consumption. Review your vehicle configuration for better efficiency."
+            similar = similar_vehicles(
+                vehicle_map[veh_choice], engine, cyl, trans_map[trans_choice], fuel_map[fuel_choice]
+            )
+
+        if similar:
+            # one line per vehicle: a blank or indented line would end the HTML block in markdown
+            rows_html = "".join(
+                "<div style='display: flex; justify-content: space-between; padding: 8px 4px; border-bottom: 1px solid rgba(255,255,255,0.05);'>"
+                f"<span style='color: #fff; font-weight: 500;'>{html.escape(str(v['Brand Name']))} {html.escape(str(v['Model']))}</span>"
+                f"<span style='color: #aaa; font-size: 0.85rem;'>{v['Engine Capacity (Liters)']:.1f} L · {v['Number of Cylinders']} cyl · "
+                f"{html.escape(str(v['Transmission']))} · {html.escape(str(v['TYPE OF FUEL']))}</span>"
+                f"<span style='color: #e2e2e2; font-weight: 600;'>{v['Combined Fuel Efficiency (L/100 km)']:.1f} L/100 km</span>"
+                "</div>"
+                for v in similar
+            )
+            st.markdown(f"""
+            <div style='margin: 8px 0 20px 0;'>
+                <h5 style='color: #f0f0f0; font-size: 1.05rem; font-weight: 600; margin: 0 0 6px 0;'>🚘 Similar real vehicles</h5>
+                {rows_html}
+            </div>
+            """, unsafe_allow_html=True)
 
+        # the configuration's KMeans segment and how that segment performs (see clustering.py)
+        with tracer.span("segment"):
+            from clustering import segment_of
+
+            segment = segment_of(engine, cyl, co2, fuel_map[fuel_choice])
+
+        if segment is not None and segment[1] is not None:
+            name, profile = segment
             st.markdown(
-                f"""
-                <div style='text-align: center; padding: 24px; 
-                            background: linear-gradient(135deg, rgba(255,255,255,0.03), rgba(255,255,255,0.01)); 
-                            border-radius: 16px; margin: 20px 0;
-                            border: 1px solid rgba(255,255,255,0.05);
-                            box-shadow: 0 4px 16px rgba(0,0,0,0.2);'>
-                    <h4 style='color: {color}; margin: 0 0 8px 0; font-size: 1.3rem; font-weight: 600;'>{efficiency}</h4>
-                    <p style='color: #bbb; font-size: 0.95rem; margin: 0; line-height: 1.4;'>{advice}</p>
-                </div>
-                """,
+                f"<p style='color: #bbb; font-size: 0.92rem; margin: 0 0 20px 0;'>🧩 Fleet segment <b style='color: #fff;'>{html.escape(name)}</b>: "
+                f"{profile['Vehicles']:,} vehicles averaging {profile['Combined L/100 km']:.1f} L/100 km, "
+                f"mostly {html.escape(str(profile['Top category']))}</p>",
                 unsafe_allow_html=True,
             )
 
     st.markdown("</div>", unsafe_allow_html=True)
-    
+
+    st.markdown("""
+        <div style='text-align: center; margin: 24px 0 12px 0;'>
+            <h4 style='color: #f0f0f0; font-size: 1.2rem; font-weight: 600; margin-bottom: 6px;'>📂 Bulk Fleet Prediction</h4>
+            <p style='color: #aaa; font-size: 0.9rem;'>Upload a CSV with columns: """ + ", ".join(INPUT_COLUMNS) + """</p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    fleet_file = st.file_uploader("Fleet manifest (CSV)", type=["csv"], key="fleet_csv", label_visibility="collapsed")
+    if fleet_file is not None:
+        try:
+            # scored once per upload and model, not on every rerun of this panel
+            scored = st.session_state.get("fleet_predictions")
+            if scored is None or scored[0] != (fleet_file.file_id, model_path):
+                with tracer.span("fleet_scoring"):
+                    scored_csv = "".join(iter_predict_csv(fleet_file, loaded_model)).encode("utf-8")
+                scored = st.session_state["fleet_predictions"] = ((fleet_file.file_id, model_path), scored_csv)
+            st.download_button(
+                "⬇️ Download Predictions",
+                data=scored[1],
+                file_name=f"{os.path.splitext(fleet_file.name)[0]}_predictions.csv",
+                mime="text/csv",
+            )
+        except ValueError as e:
+            st.error(f"Could not score this file: {e}")
+
+
+# re-reads the ranked snapshot as often as the aggregator refreshes it (its ttl, in seconds;
+# a duration string would make Streamlit import pandas to parse it)
+@st.fragment(run_every=900)
+@tracer.fragment("news", st.session_state)
+def news_panel():
     st.markdown("""
     <div style='height: 1px; background: linear-gradient(90deg, transparent, rgba(255,255,255,0.1), transparent); 
                 margin: 32px 0;'></div>
@@ -674,142 +277,136 @@ with st.expander("🔧 VEHICLE CONFIGURATION & LATEST NEWS", expanded=False):
         unsafe_allow_html=True,
     )
 
-    try:
-        with st.spinner("🔄 Fetching latest automotive news..."):
-            feed = feedparser.parse("https://feeds.bbci.co.uk/news/topics/cpzpydkymr4t/rss.xml")
-            keywords = ['fuel', 'mileage', 'electric', 'efficiency', 'car', 'auto', 'vehicle', 'hybrid', 'gasoline', 'diesel']
-            arts = [e for e in feed.entries if any(k in e.title.lower() or k in e.summary.lower() for k in keywords)][:6]
-
-            if arts:
-                for i, entry in enumerate(arts):
-                    title = entry.title.strip()
-                    summary = re.sub(r'<[^>]+>', '', entry.summary).strip()[:120] + "..."
-                    pub_date = entry.get('published', 'Unknown date')
-                    link = entry.get('link', '#')
-                    
-                    st.markdown(f"""
-                    <div class='news-item'>
-                        <h5 style='color: #fff; font-size: 1.1rem; font-weight: 600; margin: 0 0 8px 0; line-height: 1.3;'>
-                            <a href='{link}' target='_blank' style='color: inherit; text-decoration: none;'>{title}</a>
-                        </h5>
-                        <p style='color: #bbb; font-size: 0.9rem; margin: 0 0 6px 0; line-height: 1.4;'>{summary}</p>
-                        <p style='color: #888; font-size: 0.8rem; margin: 0;'>{pub_date}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-            else:
-                st.markdown("""
-                <div style='text-align: center; padding: 20px; color: #999; font-style: italic;'>
-                    No automotive news found at the moment. Please try again later.
-                </div>
-                """, unsafe_allow_html=True)
-                
-    except Exception as e:
+    news_index = get_news_aggregator()
+    arts = news_index.top(6)
+
+    if arts:
+        for i, entry in enumerate(arts):
+            # feeds are operator-configurable (FUELSENSE_NEWS_FEEDS): every field is untrusted text
+            title = html.escape(html.unescape(entry.title))
+            summary = html.escape(html.unescape(entry.summary)[:120]) + "..."
+            pub_date = html.escape(entry.published)
+            link = html.escape(entry.link) if urlsplit(entry.link).scheme in ("http", "https") else "#"
+
+            st.markdown(f"""
+            <div class='news-item'>
+                <h5 style='color: #fff; font-size: 1.1rem; font-weight: 600; margin: 0 0 8px 0; line-height: 1.3;'>
+                    <a href='{link}' target='_blank' style='color: inherit; text-decoration: none;'>{title}</a>
+                </h5>
+                <p style='color: #bbb; font-size: 0.9rem; margin: 0 0 6px 0; line-height: 1.4;'>{summary}</p>
+                <p style='color: #888; font-size: 0.8rem; margin: 0;'>{pub_date}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+    elif news_index.last_error is not None:
         st.markdown("""
         <div style='text-align: center; padding: 20px; color: #999; font-style: italic;'>
             Unable to fetch news at the moment. Please check your internet connection.
         </div>
         """, unsafe_allow_html=True)
 
+    else:
+        st.markdown("""
+        <div style='text-align: center; padding: 20px; color: #999; font-style: italic;'>
+            No automotive news found at the moment. Please try again later.
+        </div>
+        """, unsafe_allow_html=True)
+
 # ----------------------------------
 # FUEL INSIGHTS & ANALYTICS DASHBOARD 
 # ----------------------------------
-with st.expander("📊 FUEL INSIGHTS & ANALYTICS DASHBOARD", expanded=False):
-    st.markdown("""
-        <div style='text-align: center; margin-bottom: 28px;'>
-            <h3 style='color: #ffffff; font-size: 1.7rem; font-weight: 700; margin-bottom: 8px; 
-                          text-shadow: 0 1px 2px rgba(0,0,0,0.3);'>Advanced Analytics Dashboard</h3>
-            <p style='color: #c0c0c0; font-size: 1.02rem; line-height: 1.5;'>
-                Comprehensive fuel consumption analysis and market insights
-            </p>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+@st.fragment
+@tracer.fragment("dashboard", st.session_state)
+def analytics_dashboard():
+    dashboard = st.expander("📊 FUEL INSIGHTS & ANALYTICS DASHBOARD", expanded=False, key="dashboard_open", on_change="rerun")
+    with dashboard:
+        # runs only while open: pandas, plotly and the dataset load on first use, not at cold start
+        if dashboard.open:
+            from analytics import DIMENSIONS, get_aggregates, kpis
+            from charts import bar_chart, engine_scatter, segment_chart
+
+            st.markdown("""
+                <div style='text-align: center; margin-bottom: 28px;'>
+                    <h3 style='color: #ffffff; font-size: 1.7rem; font-weight: 700; margin-bottom: 8px; 
+                                  text-shadow: 0 1px 2px rgba(0,0,0,0.3);'>Advanced Analytics Dashboard</h3>
+                    <p style='color: #c0c0c0; font-size: 1.02rem; line-height: 1.5;'>
+                        Comprehensive fuel consumption analysis and market insights
+                    </p>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
 
-    sample_data = pd.DataFrame({
-        'Month': ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun'],
-        'Fuel Consumption': [8.2, 7.8, 8.5, 7.9, 8.1, 7.6],
-        'Cost (USD)': [120, 115, 125, 118, 121, 112],
-        'Efficiency Rating': [85, 88, 82, 87, 84, 89]
-    })
+            with tracer.span("aggregates"):
+                aggregates = get_aggregates()
 
-    col1, col2 = st.columns(2, gap="large")
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        fig1 = px.line(sample_data, x='Month', y='Fuel Consumption', 
-                      title='Monthly Fuel Consumption Trend',
-                      color_discrete_sequence=['#ffffff'])
-        fig1.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font_color='#ffffff',
-            title_font_color='#ffffff',
-            title_font_size=16
-        )
-        st.plotly_chart(fig1, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        fig2 = px.bar(sample_data, x='Month', y='Efficiency Rating',
-                     title='Monthly Efficiency Ratings',
-                     color_discrete_sequence=['#666666'])
-        fig2.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font_color='#ffffff',
-            title_font_color='#ffffff',
-            title_font_size=16
-        )
-        st.plotly_chart(fig2, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+            col1, col2 = st.columns(2, gap="large")
+            with col1:
+                group_dim = st.selectbox("📊 Group By", list(DIMENSIONS.keys()), key="dash_group")
+            with col2:
+                fuel_filter = st.selectbox("⛽ Fuel Type Filter", aggregates["filters"], key="dash_fuel")
 
-    st.markdown("""
-    <div style='height: 1px; background: linear-gradient(90deg, transparent, rgba(255,255,255,0.1), transparent); 
-                margin: 24px 0;'></div>
-    """, unsafe_allow_html=True)
+            col1, col2 = st.columns(2, gap="large")
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown("""
-        <div style='text-align: center; padding: 16px; background: linear-gradient(135deg, rgba(255,255,255,0.03), rgba(255,255,255,0.01)); 
-                    border-radius: 12px; border: 1px solid rgba(255,255,255,0.05);'>
-            <h4 style='color: #a8e6a3; margin: 0; font-size: 1.8rem; font-weight: 700;'>7.85</h4>
-            <p style='color: #bbb; margin: 0; font-size: 0.9rem;'>Avg L/100km</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-    with col2:
-        st.markdown("""
-        <div style='text-align: center; padding: 16px; background: linear-gradient(135deg, rgba(255,255,255,0.03), rgba(255,255,255,0.01)); 
-                    border-radius: 12px; border: 1px solid rgba(255,255,255,0.05);'>
-            <h4 style='color: #c5e8c1; margin: 0; font-size: 1.8rem; font-weight: 700;'>85%</h4>
-            <p style='color: #bbb; margin: 0; font-size: 0.9rem;'>Efficiency</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-    with col3:
-        st.markdown("""
-        <div style='text-align: center; padding: 16px; background: linear-gradient(135deg, rgba(255,255,255,0.03), rgba(255,255,255,0.01)); 
-                    border-radius: 12px; border: 1px solid rgba(255,255,255,0.05);'>
-            <h4 style='color: #f0d794; margin: 0; font-size: 1.8rem; font-weight: 700;'>$118</h4>
-            <p style='color: #bbb; margin: 0; font-size: 0.9rem;'>Avg Cost</p>
-        </div>
-        """, unsafe_allow_html=True)
+            # figures are cached per dataset version and filter state (see charts.py)
+            with col1, tracer.span("figure_consumption"):
+                st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+                fig1 = bar_chart(group_dim, fuel_filter, 'Combined L/100 km', '#ffffff')
+                st.plotly_chart(fig1, use_container_width=True)
+                st.markdown('</div>', unsafe_allow_html=True)
         
-    with col4:
-        st.markdown("""
-        <div style='text-align: center; padding: 16px; background: linear-gradient(135deg, rgba(255,255,255,0.03), rgba(255,255,255,0.01)); 
-                    border-radius: 12px; border: 1px solid rgba(255,255,255,0.05);'>
-            <h4 style='color: #e2e2e2; margin: 0; font-size: 1.8rem; font-weight: 700;'>12%</h4>
-            <p style='color: #bbb; margin: 0; font-size: 0.9rem;'>Improvement</p>
-        </div>
-        """, unsafe_allow_html=True)
+            with col2, tracer.span("figure_vehicles"):
+                st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+                fig2 = bar_chart(group_dim, fuel_filter, 'Vehicles', '#666666')
+                st.plotly_chart(fig2, use_container_width=True)
+                st.markdown('</div>', unsafe_allow_html=True)
+
+            with tracer.span("figure_engine_scatter"):
+                st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+                st.plotly_chart(engine_scatter(fuel_filter), use_container_width=True)
+                st.markdown('</div>', unsafe_allow_html=True)
+
+            # KMeans segments: centroids fitted by clustering.py, profiles cached per dataset version
+            with tracer.span("figure_segments"):
+                fig_segments = segment_chart(fuel_filter)
+                if fig_segments is None:
+                    st.info("Vehicle segments are not built yet: run `python clustering.py`.")
+                else:
+                    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+                    st.plotly_chart(fig_segments, use_container_width=True)
+                    st.markdown('</div>', unsafe_allow_html=True)
+
+            st.markdown("""
+            <div style='height: 1px; background: linear-gradient(90deg, transparent, rgba(255,255,255,0.1), transparent); 
+                        margin: 24px 0;'></div>
+            """, unsafe_allow_html=True)
+
+            summary = kpis(aggregates, fuel_filter)
+            kpi_cards = [
+                (f"{summary['Combined L/100 km']:.2f}", "Avg L/100km", "#a8e6a3"),
+                (f"{summary['Combined mpg']:.1f}", "Avg MPG", "#c5e8c1"),
+                (f"{summary['CO2 g/km']:.0f}", "Avg CO₂ g/km", "#f0d794"),
+                (f"{summary['Vehicles']:,}", "Vehicles", "#e2e2e2"),
+            ]
 
+            for col, (value, label, color) in zip(st.columns(4), kpi_cards):
+                with col:
+                    st.markdown(f"""
+                    <div style='text-align: center; padding: 16px; background: linear-gradient(135deg, rgba(255,255,255,0.03), rgba(255,255,255,0.01)); 
+                                border-radius: 12px; border: 1px solid rgba(255,255,255,0.05);'>
+                        <h4 style='color: {color}; margin: 0; font-size: 1.8rem; font-weight: 700;'>{value}</h4>
+                        <p style='color: #bbb; margin: 0; font-size: 0.9rem;'>{label}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
 
+
+with st.expander("🔧 VEHICLE CONFIGURATION & LATEST NEWS", expanded=False):
+    configuration_panel()
+    news_panel()
+
+analytics_dashboard()
+
+tracer.section("footer")
 import streamlit.components.v1 as components  # safe to add here
 
 contact_html = """
@@ -924,4 +521,6 @@ st.markdown("""
         Powered by Machine Learning & Real-time Data Analytics
     </p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+tracer.end_rerun()
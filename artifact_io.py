@@ -0,0 +1,54 @@
+import os
+import hashlib
+
+# ----------------------------------
+# ARTIFACT FILES + SHA-256 MANIFESTS
+# ----------------------------------
+# Every model artifact is written atomically (write-then-rename) next to a
+# `<file>.sha256` manifest in sha256sum format, so `sha256sum -c fuel_model.npz.sha256`
+# works from a shell and the model registry refuses a file that does not match it.
+
+MANIFEST_SUFFIX = ".sha256"
+
+
+def manifest_path(path):
+    return path + MANIFEST_SUFFIX
+
+
+def _replace(path, raw):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(raw)
+    os.replace(tmp, path)
+
+
+def write_manifest(path, raw=None):
+    if raw is None:
+        with open(path, "rb") as f:
+            raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    _replace(manifest_path(path), f"{digest}  {os.path.basename(path)}\n".encode())
+    return digest
+
+
+def write_artifact(path, raw):
+    # the artifact lands first; a reader that races the manifest sees a mismatch and retries
+    _replace(path, raw)
+    return write_manifest(path, raw)
+
+
+def expected_sha256(path):
+    # None when the artifact predates manifests
+    try:
+        with open(manifest_path(path), encoding="utf-8") as f:
+            return f.read().split()[0].lower()
+    except (FileNotFoundError, IndexError):
+        return None
+
+
+if __name__ == "__main__":
+    import sys
+
+    # re-sign artifacts that were produced by hand: python artifact_io.py fuel_model.npz ...
+    for p in sys.argv[1:]:
+        print(f"{write_manifest(p)}  {p}")
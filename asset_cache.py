@@ -0,0 +1,167 @@
+import os
+import re
+import sys
+import json
+import base64
+import hashlib
+import functools
+
+# ----------------------------------
+# OFFLINE ASSET CACHE
+# ----------------------------------
+# Remote images and fonts are fetched once at build/deploy time (`python asset_cache.py`)
+# into a content-addressed directory. At runtime the app only reads from disk.
+# FUELSENSE_ASSET_CACHE points the app and the prefetch at another cache directory.
+
+BACKGROUND_TEXTURE_URL = "https://images.unsplash.com/photo-1617886903355-9354bb57751f?w=1920&h=1080&fit=crop&q=80"
+
+FONTS_CSS_URL = "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap"
+
+CACHE_DIR = os.environ.get("FUELSENSE_ASSET_CACHE") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "cache")
+INDEX_FILE = "index.json"
+
+# Google Fonts only serves woff2 to browsers it recognises
+BROWSER_UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+
+_CSS_URL_RE = re.compile(r"url\((https?://[^)'\"]+)\)")
+
+
+def _mime_from_content_type(ctype):
+    ctype = (ctype or "").lower()
+    if "png" in ctype:
+        return "image/png"
+    if "svg" in ctype:
+        return "image/svg+xml"
+    if "woff2" in ctype:
+        return "font/woff2"
+    if "woff" in ctype:
+        return "font/woff"
+    if "css" in ctype:
+        return "text/css"
+    return "image/jpeg"
+
+
+def _read_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, INDEX_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _object_path(cache_dir, sha):
+    return os.path.join(cache_dir, "objects", sha)
+
+
+# ----------------------------------
+# BUILD TIME: PREFETCH
+# ----------------------------------
+def _store(cache_dir, index, url, content, mime):
+    sha = hashlib.sha256(content).hexdigest()
+    path = _object_path(cache_dir, sha)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    index[url] = {"sha256": sha, "mime": mime, "bytes": len(content)}
+
+
+def _download(session, url, timeout):
+    response = session.get(url, timeout=timeout, headers={"User-Agent": BROWSER_UA})
+    response.raise_for_status()
+    return response.content, _mime_from_content_type(response.headers.get("Content-Type"))
+
+
+def prefetch(image_urls=None, font_css_urls=None, cache_dir=CACHE_DIR, timeout=30):
+    import requests
+
+    image_urls = [BACKGROUND_TEXTURE_URL] if image_urls is None else image_urls
+    font_css_urls = [FONTS_CSS_URL] if font_css_urls is None else font_css_urls
+
+    index = _read_index(cache_dir)
+    failed = []
+    with requests.Session() as session:
+        for url in image_urls:
+            try:
+                _store(cache_dir, index, url, *_download(session, url, timeout))
+            except Exception as e:
+                failed.append((url, e))
+
+        for css_url in font_css_urls:
+            try:
+                css, _ = _download(session, css_url, timeout)
+                for font_url in set(_CSS_URL_RE.findall(css.decode("utf-8"))):
+                    content, mime = _download(session, font_url, timeout)
+                    _store(cache_dir, index, font_url, content, mime if mime.startswith("font/") else "font/woff2")
+                _store(cache_dir, index, css_url, css, "text/css")
+            except Exception as e:
+                failed.append((css_url, e))
+
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    return failed
+
+
+# ----------------------------------
+# RUNTIME: DISK ONLY
+# ----------------------------------
+@functools.lru_cache(maxsize=None)
+def cached_bytes(url, cache_dir=CACHE_DIR):
+    entry = _read_index(cache_dir).get(url)
+    if not entry:
+        return None
+    try:
+        with open(_object_path(cache_dir, entry["sha256"]), "rb") as f:
+            content = f.read()
+    except OSError:
+        return None
+    if hashlib.sha256(content).hexdigest() != entry["sha256"]:
+        return None
+    return content, entry["mime"]
+
+
+def data_uri(content, mime):
+    return f"data:{mime};base64,{base64.b64encode(content).decode()}"
+
+
+@functools.lru_cache(maxsize=None)
+def cached_font_css(css_url=FONTS_CSS_URL, cache_dir=CACHE_DIR, url_for=data_uri):
+    # @font-face rules with the font files inlined (or wherever `url_for(content, mime)` puts
+    # them); rules whose file is missing are left out. Google serves one variable font file
+    # for every weight, so rules sharing a file are merged into a single weight range instead
+    # of referencing the same bytes five times.
+    hit = cached_bytes(css_url, cache_dir)
+    if hit is None:
+        return ""
+    css = hit[0].decode("utf-8")
+
+    by_file = {}
+    for rule in re.findall(r"@font-face\s*{[^}]*}", css):
+        match = _CSS_URL_RE.search(rule)
+        if match:
+            by_file.setdefault(match.group(1), []).append(rule)
+
+    rules = []
+    for font_url, group in by_file.items():
+        font = cached_bytes(font_url, cache_dir)
+        if font is None:
+            continue
+        content, mime = font
+        rule = group[0].replace(font_url, url_for(content, mime))
+        weights = sorted(int(w) for r in group for w in re.findall(r"font-weight:\s*(\d+)", r))
+        if len(weights) > 1:
+            rule = re.sub(r"font-weight:\s*\d+", f"font-weight: {weights[0]} {weights[-1]}", rule)
+        rules.append(rule)
+    return "\n".join(rules)
+
+
+if __name__ == "__main__":
+    failures = prefetch()
+    for url, err in failures:
+        print(f"failed: {url} ({err})", file=sys.stderr)
+    index = _read_index(CACHE_DIR)
+    print(f"{len(index)} assets cached in {CACHE_DIR}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,310 @@
+import os
+import sys
+import json
+import time
+import socket
+import platform
+import argparse
+import datetime
+import statistics
+import subprocess
+import warnings
+from contextlib import contextmanager
+
+# ----------------------------------
+# PERFORMANCE BENCHMARK SUITE
+# ----------------------------------
+# Times the app's hot paths in one process and writes the results to
+# .benchmarks/<commit>.json so runs can be diffed across commits. The Streamlit cases run
+# app.py headlessly through AppTest with every socket blocked and the news feed stubbed.
+#   python benchmark.py                                   # all cases
+#   python benchmark.py --only predict encode             # selected suites
+#   python benchmark.py --compare .benchmarks/abc1234.json  # exit 1 on a regression
+
+RESULTS_DIR = ".benchmarks"
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+BATCH_ROWS = 100_000
+REGRESSION_THRESHOLD = 1.25  # median slower than baseline by this factor fails --compare
+
+
+def _sample(fn, min_time=0.5, min_runs=5, max_runs=500):
+    fn()  # warm caches and lazy imports outside the measurement
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < min_runs or (time.perf_counter() - start < min_time and len(samples) < max_runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return {
+        "runs": len(samples),
+        "min_ms": samples[0] * 1000,
+        "median_ms": statistics.median(samples) * 1000,
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+    }
+
+
+@contextmanager
+def _no_network():
+    def refuse(*args, **kwargs):
+        raise OSError("network access is disabled while benchmarking")
+
+    original = socket.socket.connect, socket.create_connection
+    socket.socket.connect, socket.create_connection = refuse, refuse
+    try:
+        yield
+    finally:
+        socket.socket.connect, socket.create_connection = original
+
+
+class _StubFeed(dict):
+    # the two things NewsFeed reads from a feedparser result: .get() and .entries
+    entries = [
+        {"title": f"Fuel economy rules for electric vehicles, part {i}", "summary": "Emissions and mileage.",
+         "link": f"https://example.invalid/news/{i}", "published": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        for i in range(8)
+    ]
+
+
+def _stub_parse(url, etag=None, modified=None):
+    return _StubFeed(status=200)
+
+
+def best_of(fn, repeat):
+    # fastest of `repeat` calls, for the kernels' own --benchmark tables
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def rate(seconds, rows):
+    return f"{seconds * 1e6:9.1f} µs" if rows == 1 else f"{rows / seconds / 1e6:7.1f} Mrow/s"
+
+
+def sample_frame(rows, seed=0):
+    import numpy as np
+    import pandas as pd
+    from features import INPUT_COLUMNS
+    from predictor import VEHICLE_CLASSES, TRANSMISSIONS, FUEL_TYPES
+
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Vehicle Class": rng.choice(VEHICLE_CLASSES, rows),
+        "Engine Size": rng.integers(1, 8, rows),
+        "Cylinders": rng.integers(1, 17, rows),
+        "Transmission": rng.choice(TRANSMISSIONS, rows),
+        "CO2 Rating": rng.integers(1, 11, rows),
+        "Fuel Type": rng.choice(FUEL_TYPES, rows),
+    })[INPUT_COLUMNS]
+
+
+# ---- cases: each returns {case name: zero-argument callable} ----
+
+def encode_cases():
+    from model_registry import load_model
+
+    encoder = load_model().encoder
+    one, batch = sample_frame(1), sample_frame(BATCH_ROWS)
+    return {
+        "encode/single": lambda: encoder.transform(one),
+        f"encode/batch_{BATCH_ROWS}": lambda: encoder.transform(batch),
+    }
+
+
+def predict_cases():
+    from model_registry import load_model
+    from prediction_table import load_or_build_table, lookup
+    from tree_kernel import FOREST_KERNEL_PATH
+
+    kernel, pipeline = load_model(), load_model("fuel_model.sav")
+    forest = load_model(FOREST_KERNEL_PATH)
+    table = load_or_build_table()
+    one, batch = sample_frame(1), sample_frame(BATCH_ROWS)
+    row = one.iloc[0].tolist()
+    return {
+        "predict/single_table_lookup": lambda: lookup(table, *row),
+        "predict/single_kernel": lambda: kernel.predict_row(*row),
+        "predict/single_forest_kernel": lambda: forest.predict_row(*row),
+        "predict/single_sklearn_pipeline": lambda: pipeline.predict(one),
+        f"predict/batch_{BATCH_ROWS}_kernel": lambda: kernel.predict(batch),
+        f"predict/batch_{BATCH_ROWS}_forest_kernel": lambda: forest.predict(batch),
+        f"predict/batch_{BATCH_ROWS}_sklearn_pipeline": lambda: pipeline.predict(batch),
+    }
+
+
+def app_cases():
+    from streamlit import config
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+    from news import get_news_aggregator
+
+    # deprecation notices and bare-mode warnings would otherwise print on every rerun
+    config.set_option("logger.level", "error")
+    set_log_level("error")
+    get_news_aggregator(parse=_stub_parse)  # the app picks up this process-wide instance
+
+    def first_run():
+        at = AppTest.from_file(APP_PATH, default_timeout=60)
+        at.run()
+        return at
+
+    session = first_run()
+    dashboard = first_run()
+    values = iter(range(10**9))
+
+    def rerun():
+        session.slider(key="engine").set_value(1 + next(values) % 7).run()
+
+    def dashboard_rerun():
+        dashboard.session_state["dashboard_open"] = True
+        dashboard.run()
+
+    return {
+        "app/first_run": first_run,
+        "app/rerun_slider": rerun,
+        "app/rerun_dashboard_open": dashboard_rerun,
+    }
+
+
+def dataset_cases():
+    import pandas as pd
+    from vehicle_data import DATA_PATH
+    from dataset_store import STORE_DIR, ensure_store, load_store
+
+    ensure_store(DATA_PATH, STORE_DIR)
+    return {
+        "dataset/read_csv": lambda: pd.read_csv(DATA_PATH, encoding="utf-8-sig"),
+        "dataset/load_store": lambda: load_store(ensure_store(DATA_PATH, STORE_DIR)),
+    }
+
+
+def similar_cases():
+    from similar_vehicles import SimilarityIndex, get_similarity_index, similar_vehicles
+    from vehicle_data import load_vehicle_data
+
+    data = load_vehicle_data()
+    get_similarity_index()
+    return {
+        "similar/build_index": lambda: SimilarityIndex(data),
+        "similar/query_top5": lambda: similar_vehicles("SUV: Small", 2.0, 4, "AS", "X"),
+    }
+
+
+def cluster_cases():
+    from clustering import resampled_features, load_clusters, segment_of
+
+    model = load_clusters()
+    X = model.encode(*resampled_features(BATCH_ROWS))
+    segment_of(2.0, 4, 5, "X")
+    return {
+        "clusters/assign_100k": lambda: model.assign(X),
+        "clusters/segment_of": lambda: segment_of(2.0, 4, 5, "X"),
+    }
+
+
+def training_cases():
+    from training import train
+    from vehicle_data import load_vehicle_data
+
+    data = load_vehicle_data()
+    return {"training/end_to_end": lambda: train(data)}
+
+
+SUITES = {
+    "encode": encode_cases,
+    "predict": predict_cases,
+    "app": app_cases,
+    "dataset": dataset_cases,
+    "similar": similar_cases,
+    "clusters": cluster_cases,
+    "training": training_cases,
+}
+
+
+def _git_commit():
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip()
+        return f"{sha}-dirty" if dirty else sha
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _environment():
+    import numpy, pandas, sklearn, streamlit
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "sklearn": sklearn.__version__,
+        "streamlit": streamlit.__version__,
+    }
+
+
+def run(only=None, min_time=0.5):
+    results = {}
+    with _no_network(), warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for suite_name, suite in SUITES.items():
+            if only and suite_name not in only:
+                continue
+            for name, fn in suite().items():
+                results[name] = _sample(fn, min_time=min_time)
+                print(f"{name:<44} median {results[name]['median_ms']:10.3f} ms  ({results[name]['runs']} runs)")
+    return {
+        "commit": _git_commit(),
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "environment": _environment(),
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD):
+    regressions = []
+    print(f"\n{'case':<44} {baseline['commit']:>12} {current['commit']:>12}   ratio")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["median_ms"] / base["median_ms"]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"{name:<44} {base['median_ms']:10.3f}ms {result['median_ms']:10.3f}ms {ratio:6.2f}x{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark encode/predict, app reruns, dataset load and training.")
+    parser.add_argument("--only", nargs="*", choices=list(SUITES), help="suites to run (default: all)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to sample each case for")
+    parser.add_argument("--out", help=f"result file (default {RESULTS_DIR}/<commit>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    report = run(args.only, args.min_time)
+    out = args.out or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than {args.threshold:.2f}x baseline", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import os
+import sys
+import time
+import argparse
+import threading
+from collections import OrderedDict
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from analytics import ALL, FILTER_COLUMN, data_version, get_aggregates, group_table
+from clustering import CLUSTERS_PATH, segment_profiles
+from vehicle_data import DATA_PATH, load_vehicle_data
+
+# ----------------------------------
+# CACHED DASHBOARD FIGURES
+# ----------------------------------
+# Figures are built once per (dataset version, chart, filter state) and reused by every
+# rerun and session; Streamlit only re-serializes the cached object. Point clouds use
+# WebGL (Scattergl) traces, and above FUELSENSE_CHART_POINTS points they are binned
+# server-side onto a grid of at most that many cells, drawn at each cell's centroid and
+# sized by its count. The payload sent to the browser is then bounded by the budget,
+# not by the number of rows.
+#   python charts.py --rows 1000 100000 1000000   # build time / payload as data grows
+
+POINT_BUDGET = int(os.environ.get("FUELSENSE_CHART_POINTS", 5000))
+CACHE_SIZE = 64
+
+LAYOUT = dict(
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font_color='#ffffff',
+    title_font_color='#ffffff',
+    title_font_size=16,
+)
+
+ENGINE_COLUMN = "Engine Capacity (Liters)"
+CONSUMPTION_COLUMN = "Combined Fuel Efficiency (L/100 km)"
+
+_lock = threading.Lock()
+_figures = OrderedDict()
+
+
+def cached_figure(key, build):
+    # LRU over built figures; `key` must capture everything the figure depends on
+    with _lock:
+        fig = _figures.get(key)
+        if fig is not None:
+            _figures.move_to_end(key)
+            return fig
+    fig = build()
+    with _lock:
+        _figures[key] = fig
+        while len(_figures) > CACHE_SIZE:
+            _figures.popitem(last=False)
+    return fig
+
+
+def bin_points(x, y, budget=POINT_BUDGET):
+    # centroid and count of every occupied cell of a grid with at most `budget` cells
+    side = max(2, int(np.sqrt(budget)))
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    def cells(v):
+        lo, hi = v.min(), v.max()
+        return np.minimum(((v - lo) / ((hi - lo) or 1.0) * side).astype(np.int64), side - 1)
+
+    cell = cells(x) * side + cells(y)
+    counts = np.bincount(cell, minlength=side * side)
+    occupied = counts > 0
+    counts = counts[occupied]
+    cx = np.bincount(cell, weights=x, minlength=side * side)[occupied] / counts
+    cy = np.bincount(cell, weights=y, minlength=side * side)[occupied] / counts
+    return cx, cy, counts
+
+
+def scatter_figure(x, y, title, x_label, y_label, budget=POINT_BUDGET, color='#ffffff'):
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = np.isfinite(x) & np.isfinite(y)
+    x, y = x[keep], y[keep]
+
+    if len(x) <= budget:
+        trace = go.Scattergl(x=x, y=y, mode="markers", marker=dict(color=color, size=6, opacity=0.55),
+                             hovertemplate=f"{x_label}: %{{x}}<br>{y_label}: %{{y:.2f}}<extra></extra>")
+        subtitle = f"{len(x):,} vehicles"
+    else:
+        cx, cy, counts = bin_points(x, y, budget)
+        size = 4 + 10 * np.log1p(counts) / np.log1p(counts.max())
+        trace = go.Scattergl(x=cx, y=cy, mode="markers", customdata=counts,
+                             marker=dict(color=color, size=size, opacity=0.6),
+                             hovertemplate=f"{x_label}: %{{x:.2f}}<br>{y_label}: %{{y:.2f}}<br>"
+                                           "%{customdata:,} vehicles<extra></extra>")
+        subtitle = f"{len(x):,} vehicles in {len(counts):,} bins"
+
+    fig = go.Figure(trace)
+    fig.update_layout(title=f"{title} ({subtitle})", xaxis_title=x_label, yaxis_title=y_label, **LAYOUT)
+    return fig
+
+
+def bar_chart(dimension, fuel, metric, color, path=DATA_PATH):
+    def build():
+        table = group_table(get_aggregates(path), dimension, fuel).head(15).reset_index()
+        title = f"Average {metric} by {dimension}" if metric != "Vehicles" else f"Vehicles by {dimension}"
+        fig = px.bar(table, x=table.columns[0], y=metric, title=title, color_discrete_sequence=[color])
+        fig.update_layout(**LAYOUT)
+        return fig
+
+    return cached_figure(("bar", data_version(path), dimension, fuel, metric, color), build)
+
+
+def engine_scatter(fuel=ALL, budget=POINT_BUDGET, path=DATA_PATH):
+    def build():
+        df = load_vehicle_data(path)
+        if fuel != ALL:
+            df = df[df[FILTER_COLUMN].astype("string").fillna("Unknown") == fuel]
+        return scatter_figure(df[ENGINE_COLUMN], df[CONSUMPTION_COLUMN], "Engine Size vs Combined Consumption",
+                              "Engine size (L)", "Combined L/100 km", budget)
+
+    return cached_figure(("engine_scatter", data_version(path), fuel, budget), build)
+
+
+def segment_chart(fuel=ALL, path=DATA_PATH, model_path=CLUSTERS_PATH):
+    # None without a cluster artifact; the profiles behind it are cached per version too
+    profiles = segment_profiles(path, model_path)
+    if profiles is None:
+        return None
+
+    def build():
+        table = profiles["tables"].get(fuel, profiles["tables"][ALL])
+        fig = go.Figure(go.Bar(
+            x=table.index, y=table["Combined L/100 km"], marker_color="#c5e8c1",
+            customdata=list(zip(table["Vehicles"].tolist(), table["Top category"])),
+            hovertemplate="%{x}<br>%{y:.2f} L/100 km<br>%{customdata[0]:,} vehicles, mostly %{customdata[1]}<extra></extra>",
+        ))
+        fig.update_layout(title="Average Combined L/100 km by Segment", xaxis_title="Segment",
+                          yaxis_title="Combined L/100 km", **LAYOUT)
+        return fig
+
+    return cached_figure(("segments", data_version(path), data_version(model_path), fuel), build)
+
+
+def _payload_bytes(fig):
+    import plotly.io
+
+    return len(plotly.io.to_json(fig, validate=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scatter build time and browser payload as the row count grows.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--budget", type=int, default=POINT_BUDGET)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>12} {'points sent':>12} {'build':>10} {'payload':>10}")
+    for rows in args.rows:
+        engine = rng.uniform(1, 7, rows).round(1)
+        consumption = 4 + 1.6 * engine + rng.normal(0, 1.2, rows)
+        t0 = time.perf_counter()
+        fig = scatter_figure(engine, consumption, "synthetic", "engine", "L/100 km", args.budget)
+        build = time.perf_counter() - t0
+        points = len(fig.data[0].x)
+        print(f"{rows:>12,} {points:>12,} {build * 1000:>8.1f}ms {_payload_bytes(fig) / 1024:>8.0f}KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
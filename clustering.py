@@ -0,0 +1,309 @@
+import io
+import os
+import sys
+import time
+import argparse
+import functools
+import numpy as np
+import pandas as pd
+from analytics import ALL, FILTER_COLUMN, METRICS, data_version
+from preprocessing import fuel_code
+from training import SOURCE, TARGET, clean_source
+from vehicle_data import DATA_PATH, load_vehicle_data
+
+# ----------------------------------
+# VEHICLE SEGMENTS (KMEANS)
+# ----------------------------------
+# Vehicles are clustered on standardized engine size, cylinders and CO2 rating plus a
+# one-hot fuel type. The centroids are fitted at build time with MiniBatchKMeans.partial_fit
+# over chunks streamed from the sources (memory bounded by --chunksize, as in ingest.py)
+# and saved with their scaling to vehicle_clusters.npz. Serving is NumPy only: the nearest
+# centroid of a whole block of rows is argmax(x·c - ||c||²/2), one matrix product, and a
+# single configuration goes through the same path. The per-segment efficiency profiles the
+# dashboard shows are computed once per dataset version and centroid file.
+#   python clustering.py [--data data/vehicles_data_2022.csv ...] [--clusters 8]
+#   python clustering.py --benchmark --rows 1000 1000000   # fit time / assignment throughput
+
+CLUSTERS_PATH = "vehicle_clusters.npz"
+CLUSTERS_FORMAT = 1
+KIND = "kmeans"
+
+N_CLUSTERS = 8
+BATCH_SIZE = 1024
+EPOCHS = 2        # expected number of times each row is drawn into a mini-batch
+MIN_STEPS = 300   # small sources are revisited until the centroids have had this many updates
+CHUNKSIZE = 250_000
+ASSIGN_BLOCK = 65_536
+RANDOM_STATE = 51
+
+NUMERIC = ["Engine Size", "Cylinders", "CO2 Rating"]
+CATEGORY_COLUMN = "Vehicle Category"
+
+_USECOLS = [SOURCE[c] for c in NUMERIC + ["Fuel Type", TARGET]]
+
+
+def _fuel_codes(values):
+    # per-row fuel code with the alias rule run once per distinct value; missing -> "Unknown"
+    codes, uniques = pd.factorize(pd.Series(values, copy=False), use_na_sentinel=True)
+    return np.asarray([fuel_code(u) for u in uniques] + ["Unknown"], dtype=object)[codes]
+
+
+def source_features(chunk, fuel_fill=None):
+    # training cleaning on a source-column frame -> (cleaned frame, numeric (n, 3), fuel codes)
+    df = clean_source(chunk, fuel_fill)
+    numeric = np.column_stack([np.asarray(df[SOURCE[c]], dtype=np.float64) for c in NUMERIC])
+    keep = np.isfinite(numeric).all(axis=1)
+    df = df[keep]
+    return df, numeric[keep], _fuel_codes(df[SOURCE["Fuel Type"]])
+
+
+class ClusterModel:
+
+    def __init__(self, centroids, mean, scale, fuel_types, version=""):
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float64)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.fuel_types = list(fuel_types)
+        self.version = version
+        self._fuel_index = {f: i for i, f in enumerate(self.fuel_types)}
+        # ||c||² once; ||x||² is the same for every centroid and drops out of the argmin
+        self._half_norms = 0.5 * (self.centroids ** 2).sum(axis=1)
+
+    def __len__(self):
+        return len(self.centroids)
+
+    def encode(self, numeric, fuel):
+        numeric = np.atleast_2d(np.asarray(numeric, dtype=np.float64))
+        X = np.zeros((len(numeric), len(NUMERIC) + len(self.fuel_types)))
+        X[:, :len(NUMERIC)] = (numeric - self.mean) / self.scale
+        # an unseen fuel type gets no fuel column at all
+        labels, inverse = np.unique(np.asarray(fuel, dtype=object).astype(str), return_inverse=True)
+        positions = np.asarray([self._fuel_index.get(f, -1) for f in labels])[inverse.ravel()]
+        known = positions >= 0
+        X[np.flatnonzero(known), len(NUMERIC) + positions[known]] = 1.0
+        return X
+
+    def assign(self, X, block=ASSIGN_BLOCK):
+        # nearest centroid per row, in blocks so the (rows x clusters) product stays small
+        labels = np.empty(len(X), dtype=np.int32)
+        for start in range(0, len(X), block):
+            scores = X[start:start + block] @ self.centroids.T
+            labels[start:start + block] = np.argmax(scores - self._half_norms, axis=1)
+        return labels
+
+    def assign_config(self, engine, cylinders, co2, fuel):
+        return int(self.assign(self.encode([[engine, cylinders, co2]], [fuel_code(fuel)]))[0])
+
+    def centre(self, i):
+        # centroid i in the original units: (engine, cylinders, CO2 rating, dominant fuel)
+        engine, cylinders, co2 = self.centroids[i, :len(NUMERIC)] * self.scale + self.mean
+        fuel = self.fuel_types[int(np.argmax(self.centroids[i, len(NUMERIC):]))] if self.fuel_types else "?"
+        return engine, cylinders, co2, fuel
+
+    def names(self):
+        return [f"S{i + 1}: {e:.1f} L · {c:.0f} cyl · {f}" for i, (e, c, _, f) in enumerate(map(self.centre, range(len(self))))]
+
+    def to_bytes(self):
+        buf = io.BytesIO()
+        np.savez(
+            buf,
+            format=np.int64(CLUSTERS_FORMAT),
+            kind=np.asarray(KIND),
+            centroids=self.centroids,
+            mean=self.mean,
+            scale=self.scale,
+            fuel_types=np.asarray(self.fuel_types, dtype=str),
+            version=np.asarray(self.version),
+        )
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, raw):
+        with np.load(io.BytesIO(raw), allow_pickle=False) as z:
+            if int(z["format"]) != CLUSTERS_FORMAT or str(z["kind"]) != KIND:
+                raise ValueError(f"not a cluster artifact (format {int(z['format'])!r}, kind {str(z['kind'])!r})")
+            return cls(z["centroids"], z["mean"], z["scale"], z["fuel_types"].tolist(), str(z["version"]))
+
+
+def save_clusters(model, path=CLUSTERS_PATH):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(model.to_bytes())
+    os.replace(tmp, path)
+    return path
+
+
+def fit_stream(chunks, n_clusters=N_CLUSTERS, batch_size=BATCH_SIZE, epochs=EPOCHS, seed=RANDOM_STATE, version=""):
+    # chunks() -> fresh iterator of (numeric, fuel) blocks; it is consumed twice
+    from sklearn.cluster import MiniBatchKMeans
+    from ingest import RunningStats
+
+    # pass 1: scaling, fuel types and row count, merged chunk by chunk as in ingest.py
+    stats = RunningStats()
+    for numeric, fuel in chunks():
+        stats.update(pd.DataFrame(dict(zip(NUMERIC, numeric.T), **{"Fuel Type": fuel.astype(str)})))
+    columns = [stats.numeric.get(c, {"count": 0, "mean": 0.0, "m2": 0.0}) for c in NUMERIC]
+    rows = columns[0]["count"]
+    if rows < n_clusters:
+        raise ValueError(f"{rows} usable rows for {n_clusters} clusters")
+    mean = np.array([c["mean"] for c in columns])
+    # population variance, as StandardScaler
+    scale = np.sqrt(np.array([c["m2"] for c in columns]) / rows)
+    scale = np.where(scale > 0, scale, 1.0)
+    fuel_types = sorted(set(stats.frequencies["Fuel Type"]) - {"Unknown"})
+    encoder = ClusterModel(np.zeros((1, len(NUMERIC) + len(fuel_types))), mean, scale, fuel_types)
+
+    # pass 2: each chunk gets mini-batch updates in proportion to its share of the rows
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size, random_state=seed, n_init=3)
+    rng = np.random.default_rng(seed)
+    steps_per_row = max(epochs / batch_size, MIN_STEPS / rows)
+    for numeric, fuel in chunks():
+        X = encoder.encode(numeric, fuel)
+        for _ in range(max(1, round(len(X) * steps_per_row))):
+            batch = X[rng.integers(0, len(X), max(batch_size, 3 * n_clusters))]
+            kmeans.partial_fit(batch)
+
+    # segments numbered from the smallest engines up, so S1 is stable across refits
+    centroids = kmeans.cluster_centers_
+    order = np.lexsort((centroids[:, 1], centroids[:, 0]))
+    return ClusterModel(centroids[order], mean, scale, fuel_types, version)
+
+
+def fit_sources(sources, n_clusters=N_CLUSTERS, chunksize=CHUNKSIZE, **kwargs):
+    from ingest import fuel_type_mode, iter_source_chunks
+
+    fuel_fill = fuel_type_mode(sources, chunksize)
+
+    def chunks():
+        for source in sources:
+            for chunk in iter_source_chunks(source, chunksize, usecols=_USECOLS):
+                _, numeric, fuel = source_features(chunk, fuel_fill)
+                if len(numeric):
+                    yield numeric, fuel
+
+    version = ";".join(f"{os.path.basename(p)}@{os.stat(p).st_mtime_ns}" for p in sources)
+    return fit_stream(chunks, n_clusters, version=version, **kwargs)
+
+
+@functools.lru_cache(maxsize=2)
+def _model_for_version(path, mtime_ns, size):
+    with open(path, "rb") as f:
+        return ClusterModel.from_bytes(f.read())
+
+
+def load_clusters(path=CLUSTERS_PATH):
+    # None until `python clustering.py` has written the artifact
+    try:
+        return _model_for_version(*data_version(path))
+    except FileNotFoundError:
+        return None
+
+
+def build_profiles(df, model):
+    # per-segment efficiency for every dashboard fuel filter: {"filters", "tables": {filter: frame}}
+    clean, numeric, fuel = source_features(df)
+    segments = np.asarray(model.names(), dtype=object)[model.assign(model.encode(numeric, fuel))]
+    columns = {label: np.asarray(clean[col], dtype=np.float64) for label, col in METRICS.items()}
+    frame = pd.DataFrame(dict(columns, Segment=segments,
+                              **{"Engine (L)": numeric[:, 0], "Cylinders": numeric[:, 1],
+                                 CATEGORY_COLUMN: clean[CATEGORY_COLUMN].astype("string").fillna("Unknown").to_numpy(),
+                                 FILTER_COLUMN: df[FILTER_COLUMN].astype("string").fillna("Unknown")[clean.index].to_numpy()}))
+
+    filters = [ALL] + sorted(frame[FILTER_COLUMN].unique())
+    tables = {}
+    for value in filters:
+        subset = frame if value == ALL else frame[frame[FILTER_COLUMN] == value]
+        grouped = subset.groupby("Segment", sort=True)
+        table = grouped[list(METRICS) + ["Engine (L)", "Cylinders"]].mean().round(2)
+        table.insert(0, "Vehicles", grouped.size())
+        counts = subset.groupby(["Segment", CATEGORY_COLUMN]).size()
+        table["Top category"] = counts.groupby(level=0).idxmax().str[1] if len(counts) else []
+        tables[value] = table
+    return {"filters": filters, "tables": tables}
+
+
+@functools.lru_cache(maxsize=4)
+def _profiles_for_version(data_key, model_key):
+    return build_profiles(load_vehicle_data(data_key[0]), _model_for_version(*model_key))
+
+
+def segment_profiles(path=DATA_PATH, model_path=CLUSTERS_PATH):
+    # None without a cluster artifact
+    if load_clusters(model_path) is None:
+        return None
+    return _profiles_for_version(data_version(path), data_version(model_path))
+
+
+def segment_of(engine, cylinders, co2, fuel, path=DATA_PATH, model_path=CLUSTERS_PATH):
+    # (segment name, its profile over the whole dataset) for one configuration, or None
+    model, profiles = load_clusters(model_path), segment_profiles(path, model_path)
+    if model is None:
+        return None
+    name = model.names()[model.assign_config(engine, cylinders, co2, fuel)]
+    table = profiles["tables"][ALL]
+    return name, (table.loc[name] if name in table.index else None)
+
+
+def resampled_features(rows, seed=0):
+    # real rows resampled with jittered engine sizes, as (numeric, fuel)
+    rng = np.random.default_rng(seed)
+    _, numeric, fuel = source_features(load_vehicle_data())
+    picks = rng.integers(0, len(numeric), rows)
+    numeric = numeric[picks].copy()
+    numeric[:, 0] = np.round(numeric[:, 0] + rng.normal(0, 0.15, rows), 1).clip(0, None)
+    return numeric, fuel[picks]
+
+
+def _benchmark(row_counts, n_clusters, chunksize):
+    print(f"{'rows':>12} {'fit':>10} {'assign':>14} {'sklearn predict':>16} {'agree':>7}")
+    for rows in row_counts:
+        numeric, fuel = resampled_features(rows)
+
+        def chunks():
+            for start in range(0, rows, chunksize):
+                yield numeric[start:start + chunksize], fuel[start:start + chunksize]
+
+        t0 = time.perf_counter()
+        model = fit_stream(chunks, n_clusters)
+        fit = time.perf_counter() - t0
+
+        X = model.encode(numeric, fuel)
+        t0 = time.perf_counter()
+        labels = model.assign(X)
+        assign = time.perf_counter() - t0
+
+        from sklearn.metrics import pairwise_distances_argmin
+
+        t0 = time.perf_counter()
+        expected = pairwise_distances_argmin(X, model.centroids)
+        predict = time.perf_counter() - t0
+        print(f"{rows:>12,} {fit:>9.2f}s {rows / assign / 1e6:>9.1f} Mrow/s {rows / predict / 1e6:>11.1f} Mrow/s "
+              f"{(labels == expected).mean():>7.2%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit the vehicle segments (streamed MiniBatchKMeans) and save the centroids.")
+    parser.add_argument("--data", nargs="+", default=[DATA_PATH], help="CSV / XLSX sources")
+    parser.add_argument("--out", default=CLUSTERS_PATH)
+    parser.add_argument("--clusters", type=int, default=N_CLUSTERS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument("--benchmark", action="store_true", help="fit time and assignment throughput on resampled rows")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        _benchmark(args.rows, args.clusters, args.chunksize)
+        return 0
+
+    t0 = time.perf_counter()
+    model = fit_sources(args.data, args.clusters, args.chunksize, batch_size=args.batch_size)
+    save_clusters(model, args.out)
+    print(f"Saved {len(model)} segments to {args.out} in {time.perf_counter() - t0:.2f}s")
+    # what the dashboard will show for its dataset
+    print(build_profiles(load_vehicle_data(), model)["tables"][ALL].to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+# ----------------------------------
+# COLUMNAR VEHICLE DATASET STORE
+# ----------------------------------
+# The CSV / XLSX sources are converted once into one .npy file per column:
+# text columns are dictionary-encoded (small integer codes + a category list in the
+# manifest), numeric columns are downcast. Readers memory-map the files, so every
+# Streamlit worker process on a host shares the same page-cache copy.
+
+STORE_DIR = os.path.join("data", "store")
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+CATEGORICAL_COLUMNS = ["Brand Name", "Model", "Vehicle Category", "Transmission", "TYPE OF FUEL"]
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def read_source(path):
+    if path.lower().endswith((".xlsx", ".xls")):
+        try:
+            return pd.read_excel(path)
+        except ImportError as e:
+            raise ImportError("Reading .xlsx sources needs openpyxl: pip install openpyxl") from e
+    return pd.read_csv(path, encoding="utf-8-sig")
+
+
+def _codes_dtype(n_categories):
+    return np.int8 if n_categories < 127 else np.int16 if n_categories < 32767 else np.int32
+
+
+def _downcast(series):
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer").to_numpy()
+    return pd.to_numeric(series, downcast="float").to_numpy()
+
+
+@contextmanager
+def _rebuild_lock(store_dir):
+    # one rebuild per store at a time across worker processes; without fcntl (Windows) the
+    # swap in _build() tolerates losing the race instead
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(store_dir)), exist_ok=True)
+    with open(f"{store_dir}.lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def build_store(source, store_dir=STORE_DIR):
+    with _rebuild_lock(store_dir):
+        return _build(source, store_dir)
+
+
+def _build(source, store_dir):
+    df = read_source(source)
+    tmp_dir = f"{store_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        filename = f"col_{i:02d}.npy"
+        if name in CATEGORICAL_COLUMNS or not pd.api.types.is_numeric_dtype(df[name]):
+            cat = pd.Categorical(df[name])
+            categories = [str(c) for c in cat.categories]
+            np.save(os.path.join(tmp_dir, filename), cat.codes.astype(_codes_dtype(len(categories))))
+            columns.append({"name": name, "kind": "category", "file": filename, "categories": categories})
+        else:
+            values = _downcast(df[name])
+            np.save(os.path.join(tmp_dir, filename), values)
+            columns.append({"name": name, "kind": "numeric", "file": filename, "dtype": str(values.dtype)})
+
+    st = os.stat(source)
+    manifest = {
+        "format": FORMAT_VERSION,
+        "source": os.path.abspath(source),
+        "source_sha256": _sha256(source),
+        "source_stat": [st.st_mtime_ns, st.st_size],
+        "rows": len(df),
+        "columns": columns,
+    }
+    with open(os.path.join(tmp_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    # swap the finished directory in so readers never see a half-written store
+    old_dir = f"{store_dir}.{os.getpid()}.old"
+    try:
+        if os.path.exists(store_dir):
+            os.replace(store_dir, old_dir)
+        os.replace(tmp_dir, store_dir)
+    except OSError:
+        # another process swapped its own build in between (ENOTEMPTY / FileNotFoundError)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.exists(store_dir) and os.path.exists(old_dir):
+            os.replace(old_dir, store_dir)
+        if not is_current(source, store_dir):
+            raise
+        manifest = read_manifest(store_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return manifest
+
+
+def read_manifest(store_dir=STORE_DIR):
+    try:
+        with open(os.path.join(store_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(source, store_dir=STORE_DIR):
+    manifest = read_manifest(store_dir)
+    if manifest is None or manifest.get("format") != FORMAT_VERSION:
+        return False
+    if manifest.get("source") != os.path.abspath(source):
+        return False
+    st = os.stat(source)
+    if manifest["source_stat"] == [st.st_mtime_ns, st.st_size]:
+        return True
+    return manifest["source_sha256"] == _sha256(source)
+
+
+def ensure_store(source, store_dir=STORE_DIR):
+    if not is_current(source, store_dir):
+        with _rebuild_lock(store_dir):
+            # a worker that waited on the lock finds the store another one just built
+            if not is_current(source, store_dir):
+                _build(source, store_dir)
+    return store_dir
+
+
+def load_store(store_dir=STORE_DIR, columns=None):
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No dataset store in {store_dir}; run `python dataset_store.py` first")
+
+    data = {}
+    for col in manifest["columns"]:
+        if columns is not None and col["name"] not in columns:
+            continue
+        arr = np.load(os.path.join(store_dir, col["file"]), mmap_mode="r")
+        if col["kind"] == "category":
+            data[col["name"]] = pd.Categorical.from_codes(arr, categories=col["categories"])
+        else:
+            data[col["name"]] = arr
+    # copy=False keeps each column backed by its memory-mapped file
+    return pd.DataFrame(data, copy=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert the vehicle dataset into a memory-mappable columnar store.")
+    parser.add_argument("source", nargs="?", default=os.path.join("data", "vehicles_data_2022.csv"),
+                        help="CSV or XLSX source (default: data/vehicles_data_2022.csv)")
+    parser.add_argument("--out", default=STORE_DIR)
+    args = parser.parse_args(argv)
+
+    manifest = build_store(args.source, args.out)
+    sizes = sum(os.path.getsize(os.path.join(args.out, c["file"])) for c in manifest["columns"])
+    print(f"{manifest['rows']} rows, {len(manifest['columns'])} columns -> {args.out} ({sizes / 1024:.1f} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import numpy as np
+from preprocessing import normalize_transmission
+
+# ----------------------------------
+# MODEL FEATURE ENCODING
+# ----------------------------------
+# The exact encoding the notebook trains on, as a pipeline step, so the saved model
+# artifact carries its own feature order and the app can hand it raw inputs.
+# pandas is imported inside the methods: the app imports this module on every cold start
+# but only needs pandas once a whole frame is encoded.
+
+INPUT_COLUMNS = ["Vehicle Class", "Engine Size", "Cylinders", "Transmission", "CO2 Rating", "Fuel Type"]
+
+TRANSMISSION_ORDER = ['AV', 'AM', 'M', 'AS', 'A', 'Automatic', 'CVT', 'Manual']
+
+VEHICLE_CLASS_ORDER = [
+    'Two-seater', 'Minicompact', 'Compact', 'Subcompact', 'Mid-size',
+    'Full-size', 'SUV: Small', 'SUV: Standard', 'Minivan',
+    'Station wagon: Small', 'Station wagon: Mid-size',
+    'Pickup truck: Small', 'Special purpose vehicle',
+    'Pickup truck: Standard', 'Sedan', 'MPV', 'Hatchback',
+    'Auto Rickshaw', 'Motorcycle', 'Electric SUV',
+    'Electric Scooter', 'Crossover', 'Bike', 'SUV',
+    'Compact SUV', 'Mini Truck', 'Electric Auto',
+    'Electric Vehicle', 'Sports Car', 'Truck', 'Scooter',
+    'Pickup'
+]
+
+
+# value -> ordinal position, for the NumPy kernels that encode single rows without pandas
+TRANSMISSION_POS = {v: float(i) for i, v in enumerate(TRANSMISSION_ORDER)}
+VEHICLE_CLASS_POS = {v: float(i) for i, v in enumerate(VEHICLE_CLASS_ORDER)}
+
+
+def category_positions(values, categories):
+    # index of each value in `categories`; -1 for anything else, missing values included
+    import pandas as pd
+
+    return pd.Index(categories).get_indexer(values)
+
+
+def _ordinal(values, order):
+    # OrdinalEncoder(categories=[order], handle_unknown='use_encoded_value', unknown_value=-1)
+    return category_positions(values, order).astype(np.float64)
+
+
+class FeatureEncoder:
+    # raw inputs -> [Engine Size, Cylinders, CO2 Rating, Transmission_X, Vehicle Class_X, <fuel dummies>]
+    # Plain class with the estimator protocol so unpickling a model never needs sklearn.base.
+
+    def get_params(self, deep=True):
+        return {}
+
+    def set_params(self, **params):
+        return self
+
+    def fit(self, X, y=None):
+        import pandas as pd
+
+        fuel = pd.Series(X["Fuel Type"]).dropna().astype(str)
+        self.fuel_types_ = sorted(fuel.unique())
+        self.feature_names_ = (
+            ["Engine Size", "Cylinders", "CO2 Rating", "Transmission_X", "Vehicle Class_X"] + list(self.fuel_types_)
+        )
+        return self
+
+    def transform(self, X):
+        import pandas as pd
+
+        missing = [c for c in INPUT_COLUMNS if c not in X.columns]
+        if missing:
+            raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+        n = len(X)
+        out = np.zeros((n, len(self.feature_names_)), dtype=np.float64)
+        out[:, 0] = pd.to_numeric(X["Engine Size"], errors="raise")
+        out[:, 1] = pd.to_numeric(X["Cylinders"], errors="raise")
+        out[:, 2] = pd.to_numeric(X["CO2 Rating"], errors="raise")
+        out[:, 3] = _ordinal(normalize_transmission(X["Transmission"]), TRANSMISSION_ORDER)
+        out[:, 4] = _ordinal(X["Vehicle Class"], VEHICLE_CLASS_ORDER)
+
+        # str.get_dummies over the fuel types seen at fit time; unseen types stay all-zero
+        fuel = category_positions(X["Fuel Type"], self.fuel_types_)
+        known = fuel >= 0
+        out[np.flatnonzero(known), 5 + fuel[known]] = 1
+        return out
+
+    def fit_transform(self, X, y=None):
+        return self.fit(X, y).transform(X)
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray(self.feature_names_, dtype=object)
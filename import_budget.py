@@ -0,0 +1,102 @@
+import os
+import re
+import ast
+import sys
+import json
+import argparse
+import subprocess
+
+# ----------------------------------
+# COLD-START IMPORT BUDGET
+# ----------------------------------
+# Replays exactly the module-level imports of app.py in a fresh interpreter under
+# `python -X importtime`, reports where the time goes, and fails (exit 1) when the total
+# is over budget or when a module that must stay lazy is pulled in at start-up.
+#   python import_budget.py [--budget-ms 1000] [--top 15]
+
+APP_PATH = "app.py"
+DEFAULT_BUDGET_MS = float(os.environ.get("FUELSENSE_IMPORT_BUDGET_MS", 1000))
+
+# only imported by the sections/paths that need them; never on a cold start
+LAZY_MODULES = ["pandas", "plotly.express", "sklearn", "requests", "feedparser", "streamlit_lottie"]
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def startup_imports(app_path=APP_PATH):
+    # top-level import statements only: anything inside a function or section body is lazy
+    with open(app_path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), app_path)
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def parse_importtime(stderr):
+    rows = []
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            self_us, cumulative_us, indent, name = m.groups()
+            rows.append({"module": name, "self_us": int(self_us), "cumulative_us": int(cumulative_us),
+                         "depth": (len(indent) - 1) // 2})
+    return rows
+
+
+def measure(statements, cwd=None):
+    code = "\n".join(statements + [
+        "import sys, json",
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))",
+    ])
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=cwd, check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing app.py's start-up modules failed:\n{proc.stderr[-2000:]}")
+    rows = parse_importtime(proc.stderr)
+    total_us = sum(r["cumulative_us"] for r in rows if r["depth"] == 0)
+    return {"total_ms": total_us / 1000, "rows": rows, "eager_lazy_modules": json.loads(proc.stdout.strip().splitlines()[-1])}
+
+
+def report(result, top=15):
+    by_root = {}
+    for r in result["rows"]:
+        root = r["module"].split(".")[0]
+        by_root[root] = by_root.get(root, 0) + r["self_us"]
+    lines = [f"cold-start imports: {result['total_ms']:.0f} ms"]
+    for root, us in sorted(by_root.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        lines.append(f"  {us / 1000:8.1f} ms  {root}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report app.py's cold-start import time and enforce a budget.")
+    parser.add_argument("--app", default=APP_PATH)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters to run; the fastest counts")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", action="store_true", help="print the fastest run as JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    statements = startup_imports(args.app)
+    cwd = os.path.dirname(os.path.abspath(args.app))
+    result = min((measure(statements, cwd) for _ in range(args.repeat)), key=lambda r: r["total_ms"])
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(report(result, args.top))
+
+    failures = []
+    if result["total_ms"] > args.budget_ms:
+        failures.append(f"{result['total_ms']:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+    if result["eager_lazy_modules"]:
+        failures.append(f"imported at start-up but should be lazy: {', '.join(result['eager_lazy_modules'])}")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if not failures:
+        print(f"OK: within the {args.budget_ms:.0f} ms budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
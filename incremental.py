@@ -0,0 +1,207 @@
+import os
+import sys
+import time
+import bisect
+import hashlib
+import argparse
+import pickle as pk
+import numpy as np
+from features import INPUT_COLUMNS, FeatureEncoder
+from training import MODEL_PATH, TARGET, prepare_frame, split, make_artifact, save_artifact, frame_fingerprint
+from linear_kernel import KERNEL_PATH, export_kernel
+
+# ----------------------------------
+# INCREMENTAL LINEAR MODEL UPDATES
+# ----------------------------------
+# Keeps the sufficient statistics of encode -> scale -> regress (row count, feature/target
+# means and the centred co-moment matrix of [features, target]) and folds new batches in
+# with the pairwise update. Solving the scaled normal equations from them gives the same
+# StandardScaler + LinearRegression a full refit would, so publishing is a small solve
+# plus a pickle instead of a pass over every row ever seen.
+#   python incremental.py rebuild               # state from the training split
+#   python incremental.py update new_batch.csv  # fold in a batch and publish fuel_model.sav
+#   python incremental.py verify                # compare against a from-scratch fit
+
+STATE_PATH = "fuel_model.stats.pkl"
+NUMERIC_FEATURES = 5  # Engine Size, Cylinders, CO2 Rating, Transmission_X, Vehicle Class_X
+RCOND = 1e-10  # the fuel dummies sum to one, so the centred system is rank deficient
+
+
+class SufficientStats:
+
+    def __init__(self):
+        self.n = 0
+        self.fingerprint = ""  # chained sha256 of every batch folded in
+        self.fuel_types = []
+        self.mean = np.zeros(NUMERIC_FEATURES + 1)  # features..., target
+        self.comoment = np.zeros((NUMERIC_FEATURES + 1, NUMERIC_FEATURES + 1))
+
+    @property
+    def n_features(self):
+        return NUMERIC_FEATURES + len(self.fuel_types)
+
+    def _add_fuel_type(self, fuel):
+        # a dummy column that was zero for every earlier row: its mean and co-moments are 0
+        pos = NUMERIC_FEATURES + bisect.bisect(self.fuel_types, fuel)
+        self.fuel_types.insert(pos - NUMERIC_FEATURES, fuel)
+        self.mean = np.insert(self.mean, pos, 0.0)
+        self.comoment = np.insert(np.insert(self.comoment, pos, 0.0, axis=0), pos, 0.0, axis=1)
+
+    def _encoder(self):
+        encoder = FeatureEncoder()
+        encoder.fuel_types_ = list(self.fuel_types)
+        encoder.feature_names_ = (
+            ["Engine Size", "Cylinders", "CO2 Rating", "Transmission_X", "Vehicle Class_X"] + list(self.fuel_types)
+        )
+        return encoder
+
+    def update(self, X, y):
+        for fuel in sorted(set(X["Fuel Type"].dropna().astype(str)) - set(self.fuel_types)):
+            self._add_fuel_type(fuel)
+
+        Z = np.column_stack([self._encoder().transform(X), np.asarray(y, dtype=np.float64)])
+        n_b = len(Z)
+        if n_b == 0:
+            return self
+        mean_b = Z.mean(axis=0)
+        centred = Z - mean_b
+        comoment_b = centred.T @ centred
+
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.comoment += comoment_b + np.outer(delta, delta) * (self.n * n_b / n)
+        self.mean += delta * (n_b / n)
+        self.n = n
+        return self
+
+    def solve(self):
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.linear_model import LinearRegression
+
+        if self.n < 2:
+            raise ValueError("Need at least two rows to fit the model")
+        d = self.n_features
+        m_xx, m_xy, m_yy = self.comoment[:d, :d], self.comoment[:d, d], self.comoment[d, d]
+
+        var = np.diag(m_xx) / self.n
+        scale = np.sqrt(var)
+        scale[scale < 10 * np.finfo(np.float64).eps] = 1.0  # StandardScaler's zero-variance rule
+
+        # normal equations of the standardised problem; lstsq gives the minimum-norm
+        # solution, which is what LinearRegression returns for rank-deficient designs
+        m_zz = m_xx / np.outer(scale, scale)
+        m_zy = m_xy / scale
+        coef, _, rank, _ = np.linalg.lstsq(m_zz, m_zy, rcond=RCOND)
+
+        scaler = StandardScaler()
+        scaler.mean_, scaler.var_, scaler.scale_ = self.mean[:d].copy(), var, scale
+        scaler.n_samples_seen_, scaler.n_features_in_ = self.n, d
+
+        model = LinearRegression()
+        model.coef_, model.intercept_ = coef, float(self.mean[d])
+        model.rank_, model.n_features_in_ = int(rank), d
+
+        pipeline = Pipeline([("encode", self._encoder()), ("scale", scaler), ("model", model)])
+        sse = m_yy - coef @ m_zy
+        metrics = {"train_r2": float(1 - sse / m_yy) if m_yy > 0 else 0.0, "train_rows": int(self.n)}
+        return pipeline, metrics
+
+
+def load_state(path=STATE_PATH):
+    # a missing state must not read as "no rows yet": publishing would replace the model
+    # with one fitted on the new batch alone
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found: run `python incremental.py rebuild` first")
+    state = SufficientStats()
+    # stored as a plain dict so the file never depends on where the class lives
+    with open(path, "rb") as f:
+        vars(state).update(pk.load(f))
+    return state
+
+
+def save_state(state, path=STATE_PATH):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pk.dump(vars(state), f, protocol=pk.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def publish(state, data_sha256, path=MODEL_PATH, kernel_path=KERNEL_PATH):
+    t0 = time.perf_counter()
+    pipeline, metrics = state.solve()
+    metrics["fit_seconds"] = round(time.perf_counter() - t0, 6)
+    metrics["incremental"] = True
+    artifact = make_artifact(pipeline, metrics, data_sha256)
+    save_artifact(artifact, path)
+    export_kernel(artifact, kernel_path)
+    return artifact
+
+
+def verify(data, batches=5, atol=1e-8):
+    # fold the training split in batch by batch and compare with one Pipeline.fit on all of it
+    from training import build_pipeline
+
+    xtrain, xtest, ytrain, ytest = split(prepare_frame(data))
+    state = SufficientStats()
+    for idx in np.array_split(np.arange(len(xtrain)), batches):
+        state.update(xtrain.iloc[idx], ytrain.iloc[idx])
+    incremental, _ = state.solve()
+    scratch = build_pipeline().fit(xtrain, ytrain)
+
+    diff = float(np.max(np.abs(incremental.predict(xtest) - scratch.predict(xtest))))
+    return {
+        "max_prediction_diff": diff,
+        "max_coef_diff": float(np.max(np.abs(incremental[-1].coef_ - scratch[-1].coef_))),
+        "ok": diff <= atol,
+    }
+
+
+def main(argv=None):
+    from vehicle_data import DATA_PATH, load_vehicle_data
+    from ingest import iter_source_chunks
+    import sklearn.linear_model  # noqa: F401  imported up front so the publish timing is solve + write only
+
+    parser = argparse.ArgumentParser(description="Fold new vehicle batches into the linear model without a full retrain.")
+    parser.add_argument("command", choices=["rebuild", "update", "verify"])
+    parser.add_argument("batches", nargs="*", help="CSV/XLSX batches for `update` (source column names)")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--state", default=STATE_PATH)
+    parser.add_argument("--out", default=MODEL_PATH)
+    parser.add_argument("--kernel-out", default=KERNEL_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "verify":
+        result = verify(load_vehicle_data(args.data))
+        print(f"max |prediction diff| {result['max_prediction_diff']:.2e}   "
+              f"max |coef diff| {result['max_coef_diff']:.2e}   {'OK' if result['ok'] else 'MISMATCH'}")
+        return 0 if result["ok"] else 1
+
+    if args.command == "rebuild":
+        df = prepare_frame(load_vehicle_data(args.data))
+        xtrain, _, ytrain, _ = split(df)
+        state = SufficientStats().update(xtrain, ytrain)
+        state.fingerprint = frame_fingerprint(df)
+    else:
+        if not args.batches:
+            parser.error("update needs at least one batch file")
+        if not os.path.exists(args.state):
+            parser.error(f"{args.state} not found: run `python incremental.py rebuild` first")
+        state = load_state(args.state)
+        for source in args.batches:
+            for chunk in iter_source_chunks(source):
+                df = prepare_frame(chunk)
+                state.update(df[INPUT_COLUMNS], df[TARGET])
+                state.fingerprint = hashlib.sha256((state.fingerprint + frame_fingerprint(df)).encode()).hexdigest()
+
+    t0 = time.perf_counter()
+    artifact = publish(state, state.fingerprint, args.out, args.kernel_out)
+    save_state(state, args.state)
+    elapsed = (time.perf_counter() - t0) * 1000
+    print(f"Published {args.out} (version {artifact['version']}) from {state.n:,} rows in {elapsed:.1f} ms")
+    print(f"  train R² = {artifact['metrics']['train_r2']:.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+import os
+import re
+import sys
+import json
+import shutil
+import argparse
+import numpy as np
+import pandas as pd
+from training import SOURCE, clean_source
+
+# ----------------------------------
+# OUT-OF-CORE DATASET INGESTION
+# ----------------------------------
+# Streams CSV / XLSX sources chunk by chunk through the notebook cleaning, keeps running
+# statistics (count / mean / variance / min / max per numeric column, frequencies per
+# text column) and writes one part per chunk and partition (CSV, or Parquet with pyarrow,
+# which writes several times faster). Memory is bounded by the chunk size plus the number
+# of distinct category values, never by the number of rows.
+#   python ingest.py data/*.csv --out data/ingested [--chunksize 250000] [--format parquet]
+
+INGEST_DIR = os.path.join("data", "ingested")
+MANIFEST = "manifest.json"
+CHUNKSIZE = 250_000
+PARTITION_COLUMN = "Year of Manufacture"
+FORMATS = ("csv", "parquet")
+
+
+def _read_xlsx_chunks(path, chunksize):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ImportError("Reading .xlsx sources needs openpyxl: pip install openpyxl") from e
+
+    # read_only mode streams rows from the sheet XML instead of loading the workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(c) for c in next(rows)]
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunksize:
+                yield pd.DataFrame.from_records(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=header)
+    finally:
+        wb.close()
+
+
+def iter_source_chunks(path, chunksize=CHUNKSIZE, usecols=None):
+    if path.lower().endswith(".xlsx"):  # openpyxl reads .xlsx only, not legacy .xls
+        for chunk in _read_xlsx_chunks(path, chunksize):
+            yield chunk if usecols is None else chunk[usecols]
+    else:
+        yield from pd.read_csv(path, encoding="utf-8-sig", chunksize=chunksize, usecols=usecols)
+
+
+def fuel_type_mode(sources, chunksize=CHUNKSIZE):
+    # first pass over one column: the notebook fills missing fuel types with the global mode
+    counts = pd.Series(dtype="int64")
+    for source in sources:
+        for chunk in iter_source_chunks(source, chunksize, usecols=[SOURCE["Fuel Type"]]):
+            counts = counts.add(chunk.iloc[:, 0].value_counts(), fill_value=0)
+    return counts.idxmax() if len(counts) else None
+
+
+class RunningStats:
+    # Chan et al. pairwise merge of (count, mean, M2): exact variances in one pass
+
+    def __init__(self):
+        self.numeric = {}
+        self.frequencies = {}
+
+    def update(self, df):
+        for name in df.columns:
+            col = df[name]
+            if pd.api.types.is_numeric_dtype(col):
+                x = col.to_numpy(dtype=np.float64, na_value=np.nan)
+                x = x[~np.isnan(x)]
+                if len(x):
+                    self._merge(name, len(x), x.mean(), ((x - x.mean()) ** 2).sum(), x.min(), x.max())
+            else:
+                freq = self.frequencies.setdefault(name, {})
+                for value, n in col.value_counts(dropna=False).items():
+                    key = "<missing>" if pd.isna(value) else str(value)
+                    freq[key] = freq.get(key, 0) + int(n)
+
+    def _merge(self, name, n_b, mean_b, m2_b, lo, hi):
+        s = self.numeric.get(name)
+        if s is None:
+            self.numeric[name] = {"count": n_b, "mean": mean_b, "m2": m2_b, "min": lo, "max": hi}
+            return
+        n_a = s["count"]
+        n = n_a + n_b
+        delta = mean_b - s["mean"]
+        s["mean"] += delta * n_b / n
+        s["m2"] += m2_b + delta * delta * n_a * n_b / n
+        s["count"] = n
+        s["min"], s["max"] = min(s["min"], lo), max(s["max"], hi)
+
+    def summary(self):
+        numeric = {
+            name: {
+                "count": int(s["count"]),
+                "mean": float(s["mean"]),
+                "variance": float(s["m2"] / (s["count"] - 1)) if s["count"] > 1 else 0.0,
+                "min": float(s["min"]),
+                "max": float(s["max"]),
+            }
+            for name, s in self.numeric.items()
+        }
+        frequencies = {
+            name: dict(sorted(freq.items(), key=lambda kv: kv[1], reverse=True))
+            for name, freq in self.frequencies.items()
+        }
+        return {"numeric": numeric, "frequencies": frequencies}
+
+
+def _partition_dir(value):
+    label = "unknown" if pd.isna(value) else re.sub(r"[^\w.-]+", "_", str(value))
+    return f"{PARTITION_COLUMN.split()[0].lower()}={label}"
+
+
+def _write_part(frame, path, fmt):
+    if fmt == "parquet":
+        try:
+            frame.to_parquet(path, index=False)
+        except ImportError as e:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from e
+    else:
+        frame.to_csv(path, index=False)
+
+
+def ingest(sources, out_dir=INGEST_DIR, chunksize=CHUNKSIZE, fuel_fill=None, fmt="csv"):
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported output format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    if fuel_fill is None:
+        fuel_fill = fuel_type_mode(sources, chunksize)
+
+    tmp_dir = f"{out_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    stats = RunningStats()
+    partitions = {}
+    rows_in = rows_out = 0
+    part = 0
+    for source in sources:
+        for chunk in iter_source_chunks(source, chunksize):
+            rows_in += len(chunk)
+            cleaned = clean_source(chunk, fuel_fill)
+            rows_out += len(cleaned)
+            stats.update(cleaned)
+
+            key = cleaned[PARTITION_COLUMN] if PARTITION_COLUMN in cleaned else pd.Series(np.nan, index=cleaned.index)
+            for value, group in cleaned.groupby(key, dropna=False, sort=False):
+                name = _partition_dir(value)
+                os.makedirs(os.path.join(tmp_dir, name), exist_ok=True)
+                filename = os.path.join(name, f"part-{part:05d}.{fmt}")
+                _write_part(group, os.path.join(tmp_dir, filename), fmt)
+                entry = partitions.setdefault(name, {"rows": 0, "files": []})
+                entry["rows"] += len(group)
+                entry["files"].append(filename)
+            part += 1
+
+    manifest = {
+        "sources": [os.path.abspath(s) for s in sources],
+        "partition_column": PARTITION_COLUMN,
+        "chunksize": chunksize,
+        "format": fmt,
+        "fuel_fill": fuel_fill,
+        "rows_in": rows_in,
+        "rows_out": rows_out,
+        "partitions": partitions,
+        "stats": stats.summary(),
+    }
+    with open(os.path.join(tmp_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    # same directory swap as the columnar store: readers never see a partial ingest
+    old_dir = f"{out_dir}.{os.getpid()}.old"
+    if os.path.exists(out_dir):
+        os.replace(out_dir, old_dir)
+    os.replace(tmp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return manifest
+
+
+def iter_ingested(out_dir=INGEST_DIR, partitions=None, columns=None):
+    # cleaned parts one at a time, e.g. for incremental training
+    with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    for name, entry in manifest["partitions"].items():
+        if partitions is not None and name not in partitions:
+            continue
+        for filename in entry["files"]:
+            path = os.path.join(out_dir, filename)
+            if filename.endswith(".parquet"):
+                yield pd.read_parquet(path, columns=columns)
+            else:
+                yield pd.read_csv(path, usecols=columns)
+
+
+def main(argv=None):
+    import time
+    import resource
+
+    parser = argparse.ArgumentParser(description="Stream vehicle CSV/XLSX sources into cleaned, partitioned parts.")
+    parser.add_argument("sources", nargs="*", default=[os.path.join("data", "vehicles_data_2022.csv")])
+    parser.add_argument("--out", default=INGEST_DIR)
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--fuel-fill", default=None, help="skip the fuel-type mode pass and fill with this value")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    manifest = ingest(args.sources, args.out, args.chunksize, args.fuel_fill, args.format)
+    elapsed = time.perf_counter() - t0
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"{manifest['rows_in']:,} rows in, {manifest['rows_out']:,} rows out, "
+          f"{len(manifest['partitions'])} partition(s) -> {args.out}")
+    print(f"  {elapsed:.2f}s ({manifest['rows_in'] / max(elapsed, 1e-9):,.0f} rows/s), peak RSS {peak_mib:.0f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
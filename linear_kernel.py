@@ -0,0 +1,166 @@
+import io
+import os
+import sys
+import argparse
+import numpy as np
+from features import INPUT_COLUMNS, FeatureEncoder, TRANSMISSION_POS, VEHICLE_CLASS_POS
+from preprocessing import normalize_transmission_code
+from artifact_io import write_artifact
+
+# ----------------------------------
+# SKLEARN-FREE LINEAR INFERENCE
+# ----------------------------------
+# encode -> StandardScaler -> LinearRegression is one affine map once the scaler is folded
+# into the coefficients:  y = ((x - mean) / scale) . coef + b  =  x . (coef / scale) + b'.
+# The exported .npz holds only those weights and the fuel vocabulary (no pickles), so
+# serving needs NumPy + pandas for the encoder and never imports scikit-learn.
+#   python linear_kernel.py                # export fuel_model.sav -> fuel_model.npz
+#   python linear_kernel.py --benchmark    # latency / throughput against the sklearn pipeline
+
+KERNEL_PATH = "fuel_model.npz"
+KERNEL_FORMAT = 1
+
+class LinearKernel:
+
+    def __init__(self, weights, bias, fuel_types, version=""):
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.fuel_types = [str(f) for f in fuel_types]
+        self.version = version
+        self._encoder = None
+        self._fuel_weight = {f: self.weights[5 + i] for i, f in enumerate(sorted(self.fuel_types))}
+
+    @property
+    def encoder(self):
+        # built on first frame prediction, so predict_row() never imports pandas
+        if self._encoder is None:
+            import pandas as pd
+
+            # FeatureEncoder only learns the sorted fuel vocabulary at fit time
+            self._encoder = FeatureEncoder().fit(pd.DataFrame({"Fuel Type": self.fuel_types}))
+        return self._encoder
+
+    def predict_encoded(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.weights + self.bias
+
+    def predict(self, frame):
+        return self.predict_encoded(self.encoder.transform(frame))
+
+    def predict_row(self, vehicle_class, engine, cylinders, transmission, co2, fuel_type):
+        # same encoding as FeatureEncoder with dict lookups instead of pandas, for single rows
+        w = self.weights
+        trans = normalize_transmission_code(transmission)
+        return (
+            self.bias
+            + w[0] * float(engine) + w[1] * float(cylinders) + w[2] * float(co2)
+            + w[3] * TRANSMISSION_POS.get(trans, -1.0)
+            + w[4] * VEHICLE_CLASS_POS.get(vehicle_class, -1.0)
+            + self._fuel_weight.get(fuel_type, 0.0)
+        )
+
+    def predict_rows(self, rows):
+        # predict_row()'s encoding over a list of INPUT_COLUMNS-ordered rows, one matmul for the batch
+        X = np.array([
+            (float(engine), float(cylinders), float(co2),
+             TRANSMISSION_POS.get(normalize_transmission_code(transmission), -1.0),
+             VEHICLE_CLASS_POS.get(vehicle_class, -1.0))
+            for vehicle_class, engine, cylinders, transmission, co2, _ in rows
+        ], dtype=np.float64).reshape(-1, 5)
+        fuel = np.array([self._fuel_weight.get(row[5], 0.0) for row in rows], dtype=np.float64)
+        return X @ self.weights[:5] + fuel + self.bias
+
+    def to_bytes(self):
+        buf = io.BytesIO()
+        np.savez(
+            buf,
+            format=np.int64(KERNEL_FORMAT),
+            weights=self.weights,
+            bias=np.float64(self.bias),
+            fuel_types=np.asarray(self.fuel_types, dtype=str),
+            version=np.asarray(self.version),
+        )
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, raw):
+        with np.load(io.BytesIO(raw), allow_pickle=False) as z:
+            if int(z["format"]) != KERNEL_FORMAT:
+                raise ValueError(f"unsupported kernel format {int(z['format'])!r}")
+            return cls(z["weights"], float(z["bias"]), z["fuel_types"].tolist(), str(z["version"]))
+
+
+def fold_pipeline(pipeline, version=""):
+    encoder, scaler, model = (pipeline.named_steps[k] for k in ("encode", "scale", "model"))
+    weights = model.coef_ / scaler.scale_
+    bias = model.intercept_ - weights @ scaler.mean_
+    return LinearKernel(weights, bias, encoder.fuel_types_, version)
+
+
+def export_kernel(artifact, path=KERNEL_PATH):
+    kernel = fold_pipeline(artifact["pipeline"], artifact.get("version", ""))
+    write_artifact(path, kernel.to_bytes())
+    return kernel
+
+
+def benchmark(artifact, rows=1_000_000, repeat=20):
+    import pandas as pd
+    from benchmark import best_of, rate
+    from predictor import VEHICLE_CLASSES, TRANSMISSIONS, FUEL_TYPES
+
+    pipeline = artifact["pipeline"]
+    scaler, model = pipeline.named_steps["scale"], pipeline.named_steps["model"]
+    kernel = fold_pipeline(pipeline)
+
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "Vehicle Class": rng.choice(VEHICLE_CLASSES, rows),
+        "Engine Size": rng.integers(1, 8, rows),
+        "Cylinders": rng.integers(1, 17, rows),
+        "Transmission": rng.choice(TRANSMISSIONS, rows),
+        "CO2 Rating": rng.integers(1, 11, rows),
+        "Fuel Type": rng.choice(FUEL_TYPES, rows),
+    })[INPUT_COLUMNS]
+    encoded = kernel.encoder.transform(frame)
+    one = encoded[:1]
+    row = frame.iloc[0].tolist()
+
+    drift = np.max(np.abs(kernel.predict_encoded(encoded) - model.predict(scaler.transform(encoded))))
+    results = [
+        ("single row (encoded)", best_of(lambda: model.predict(scaler.transform(one)), repeat * 50),
+         best_of(lambda: kernel.predict_encoded(one), repeat * 50), 1),
+        (f"{rows:,} rows (encoded)", best_of(lambda: model.predict(scaler.transform(encoded)), repeat),
+         best_of(lambda: kernel.predict_encoded(encoded), repeat), rows),
+        ("single row (raw frame)", best_of(lambda: pipeline.predict(frame.iloc[:1]), repeat * 5),
+         best_of(lambda: kernel.predict_row(*row), repeat * 50), 1),
+        (f"{rows:,} rows (raw frame)", best_of(lambda: pipeline.predict(frame), 3),
+         best_of(lambda: kernel.predict(frame), 3), rows),
+    ]
+    return results, float(drift)
+
+
+def main(argv=None):
+    from benchmark import rate
+    from training import MODEL_PATH
+    from model_registry import load_artifact
+
+    parser = argparse.ArgumentParser(description="Fold the trained pipeline into a NumPy-only linear kernel.")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--out", default=KERNEL_PATH)
+    parser.add_argument("--benchmark", action="store_true")
+    args = parser.parse_args(argv)
+
+    artifact = load_artifact(args.model)
+    kernel = export_kernel(artifact, args.out)
+    print(f"Exported {args.out} ({os.path.getsize(args.out)} bytes, {len(kernel.weights)} weights)")
+
+    if args.benchmark:
+        results, drift = benchmark(artifact)
+        print(f"max |kernel - sklearn| = {drift:.2e}")
+        print(f"{'case':<26} {'sklearn':>12} {'kernel':>12} {'speed-up':>9}")
+        for name, base, fast, rows in results:
+            print(f"{name:<26} {rate(base, rows):>12} {rate(fast, rows):>12} {base / fast:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
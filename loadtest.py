@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import statistics
+import subprocess
+from urllib.parse import urlsplit
+from predictor import VEHICLE_CLASSES, TRANSMISSIONS, FUEL_TYPES, ENGINE_RANGE, CYLINDER_RANGE, CO2_RANGE
+
+# ----------------------------------
+# PREDICTION SERVICE LOAD TEST
+# ----------------------------------
+# Keeps --concurrency keep-alive connections busy with single-vehicle POST /predict requests
+# for --duration seconds and reports throughput and p50/p90/p99 latency. Without --url it
+# starts `service.py` on a free local port first (with --max-batch/--max-wait-ms).
+#   python loadtest.py                                  # local service, default settings
+#   python loadtest.py --url http://10.0.0.5:8000 --concurrency 128 --duration 30
+#   python loadtest.py --bulk 1000                      # POST /predict/bulk with 1000 vehicles
+
+SERVICE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "service.py")
+
+
+def random_vehicle(rng):
+    return {
+        "Vehicle Class": rng.choice(VEHICLE_CLASSES),
+        "Engine Size": rng.randint(*ENGINE_RANGE),
+        "Cylinders": rng.randint(*CYLINDER_RANGE),
+        "Transmission": rng.choice(TRANSMISSIONS),
+        "CO2 Rating": rng.randint(*CO2_RANGE),
+        "Fuel Type": rng.choice(FUEL_TYPES),
+    }
+
+
+def _request(host, path, payload):
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    )
+    return head.encode("ascii") + body
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("server closed the connection")
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def _worker(url, path, payloads, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    try:
+        i = 0
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            writer.write(payloads[i % len(payloads)])
+            i += 1
+            status = await _read_response(reader)
+            if status == 200:
+                latencies.append(time.perf_counter() - t0)
+            else:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(base_url, concurrency=64, duration=10.0, bulk=0, seed=0):
+    url = urlsplit(base_url)
+    rng = random.Random(seed)
+    if bulk:
+        path = "/predict/bulk"
+        payloads = [_request(url.netloc, path, {"vehicles": [random_vehicle(rng) for _ in range(bulk)]}) for _ in range(8)]
+    else:
+        path = "/predict"
+        payloads = [_request(url.netloc, path, random_vehicle(rng)) for _ in range(1024)]
+
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(_worker(url, path, payloads, deadline, latencies, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return summarize(latencies, errors, elapsed, max(bulk, 1))
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def summarize(latencies, errors, elapsed, rows_per_request=1):
+    latencies = sorted(latencies)
+    if not latencies:
+        return {"requests": 0, "errors": len(errors)}
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "vehicles_per_s": round(len(latencies) * rows_per_request / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p90_ms": round(_percentile(latencies, 0.90) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_local_service(max_batch=None, max_wait_ms=None, timeout=30.0):
+    port = _free_port()
+    cmd = [sys.executable, SERVICE_PATH, "--port", str(port)]
+    if max_batch is not None:
+        cmd += ["--max-batch", str(max_batch)]
+    if max_wait_ms is not None:
+        cmd += ["--max-wait-ms", str(max_wait_ms)]
+    proc = subprocess.Popen(cmd, cwd=os.path.dirname(SERVICE_PATH))
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"service.py exited with status {proc.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError(f"service.py did not start listening within {timeout:.0f}s")
+
+
+def _health(base_url):
+    from urllib.request import urlopen
+
+    with urlopen(f"{base_url}/healthz", timeout=5) as r:
+        return json.load(r)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the HTTP prediction service.")
+    parser.add_argument("--url", help="running service to test (default: start service.py locally)")
+    parser.add_argument("--concurrency", type=int, default=64, help="concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run for")
+    parser.add_argument("--bulk", type=int, default=0, help="vehicles per POST /predict/bulk (0: single /predict)")
+    parser.add_argument("--max-batch", type=int, help="passed to the local service")
+    parser.add_argument("--max-wait-ms", type=float, help="passed to the local service")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    proc = None
+    base_url = args.url
+    if base_url is None:
+        proc, base_url = start_local_service(args.max_batch, args.max_wait_ms)
+    try:
+        result = asyncio.run(run_load(base_url, args.concurrency, args.duration, args.bulk))
+        health = _health(base_url)
+        result["mean_batch"] = health.get("mean_batch")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    elif not result["requests"]:
+        print(f"No successful requests ({result['errors']} errors)")
+    else:
+        print(f"{result['requests']} requests in {result['seconds']}s with {args.concurrency} connections, "
+              f"{result['errors']} errors")
+        print(f"  throughput  {result['requests_per_s']:>10,.0f} req/s  {result['vehicles_per_s']:>12,.0f} vehicles/s")
+        print(f"  latency     p50 {result['p50_ms']:.2f} ms  p90 {result['p90_ms']:.2f} ms  "
+              f"p99 {result['p99_ms']:.2f} ms  max {result['max_ms']:.2f} ms")
+        if not args.bulk:
+            print(f"  server      {result['mean_batch']} requests per micro-batch on average")
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
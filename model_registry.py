@@ -0,0 +1,182 @@
+import os
+import sys
+import time
+import hashlib
+import threading
+import pickle as pk
+from dataclasses import dataclass, field
+from training import MODEL_PATH, ARTIFACT_FORMAT
+from artifact_io import expected_sha256
+from linear_kernel import KERNEL_PATH, LinearKernel
+from tree_kernel import TREE_KERNEL_PATH, FOREST_KERNEL_PATH, KIND as TREE_KIND, TreeKernel
+
+# ----------------------------------
+# PROCESS-WIDE MODEL REGISTRY
+# ----------------------------------
+# Streamlit re-executes app.py on every interaction but keeps imported modules,
+# so artifacts held here are unpickled once per process and shared by all sessions.
+# A cheap stat() on each access picks up a retrained artifact without a restart.
+# Each file is checked against the `<file>.sha256` manifest written next to it at save
+# time (artifact_io); hashes registered with expect() take precedence over the manifest.
+
+
+class ArtifactHashMismatch(Exception):
+    pass
+
+
+@dataclass
+class Artifact:
+    path: str
+    obj: object = field(repr=False)
+    sha256: str
+    stat_key: tuple
+    load_seconds: float
+    memory_bytes: int
+    file_bytes: int
+    loaded_at: float
+    loads: int = 1
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _deep_size(obj, seen=None):
+    # approximate resident size of an unpickled estimator (ndarray.__sizeof__ already counts owned buffers)
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _deep_size(vars(obj), seen)
+    return size
+
+
+def _kernel_from_bytes(raw):
+    # tree kernels carry a `kind`; linear kernels predate it
+    import io
+    import numpy as np
+
+    with np.load(io.BytesIO(raw), allow_pickle=False) as z:
+        kind = str(z["kind"]) if "kind" in z.files else None
+    return TreeKernel.from_bytes(raw) if kind == TREE_KIND else LinearKernel.from_bytes(raw)
+
+
+class ModelRegistry:
+    def __init__(self, expected_hashes=None):
+        self._lock = threading.RLock()
+        self._artifacts = {}
+        self._expected = dict(expected_hashes or {})
+
+    def expect(self, path, sha256):
+        with self._lock:
+            self._expected[path] = sha256
+
+    def _read_verified(self, path, attempts=3):
+        # a retrain replaces the artifact a moment before its manifest; re-read before failing
+        for attempt in range(attempts):
+            key = _stat_key(path)
+            with open(path, "rb") as f:
+                raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()
+            expected = self._expected.get(path) or expected_sha256(path)
+            if not expected or digest == expected:
+                return key, raw, digest
+            if attempt + 1 < attempts:
+                time.sleep(0.05)
+        raise ArtifactHashMismatch(f"{path}: sha256 {digest[:12]}… does not match expected {expected[:12]}…")
+
+    def _load(self, path, previous=None, force=False):
+        t0 = time.perf_counter()
+        key, raw, digest = self._read_verified(path)
+
+        if previous is not None and previous.sha256 == digest and not force:
+            # touched but unchanged: keep the live object
+            previous.stat_key = key
+            return previous
+
+        # .npz kernels are plain arrays; anything else is a pickled artifact
+        obj = _kernel_from_bytes(raw) if path.endswith(".npz") else pk.loads(raw)
+        return Artifact(
+            path=path,
+            obj=obj,
+            sha256=digest,
+            stat_key=key,
+            load_seconds=time.perf_counter() - t0,
+            memory_bytes=_deep_size(obj),
+            file_bytes=len(raw),
+            loaded_at=time.time(),
+            loads=(previous.loads + 1) if previous else 1,
+        )
+
+    def artifact(self, path):
+        current = self._artifacts.get(path)
+        if current is not None and current.stat_key == _stat_key(path):
+            return current
+        with self._lock:
+            current = self._artifacts.get(path)
+            if current is None or current.stat_key != _stat_key(path):
+                current = self._load(path, current)
+                self._artifacts[path] = current
+            return current
+
+    def get(self, path):
+        return self.artifact(path).obj
+
+    def reload(self, path=None):
+        with self._lock:
+            paths = [path] if path else list(self._artifacts)
+            for p in paths:
+                self._artifacts[p] = self._load(p, self._artifacts.get(p), force=True)
+
+    def report(self):
+        with self._lock:
+            return [
+                {
+                    "artifact": a.path,
+                    "sha256": a.sha256,
+                    "load_ms": round(a.load_seconds * 1000, 2),
+                    "memory_kb": round(a.memory_bytes / 1024, 1),
+                    "file_kb": round(a.file_bytes / 1024, 1),
+                    "loads": a.loads,
+                    "loaded_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(a.loaded_at)),
+                }
+                for a in self._artifacts.values()
+            ]
+
+
+registry = ModelRegistry()
+
+# what the app's model picker offers, all served as NumPy-only kernels
+SERVED_MODELS = {
+    "Linear Regression": KERNEL_PATH,
+    "Decision Tree": TREE_KERNEL_PATH,
+    "Random Forest": FOREST_KERNEL_PATH,
+}
+
+
+def load_artifact(path=MODEL_PATH):
+    artifact = registry.get(path)
+    if not isinstance(artifact, dict) or artifact.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} is not a fuel model artifact; rebuild it with `python training.py`")
+    return artifact
+
+
+def load_model(path=KERNEL_PATH):
+    # the exported kernel serves without sklearn; a .sav path returns the full pipeline
+    if path.endswith(".npz"):
+        return registry.get(path)
+    return load_artifact(path)["pipeline"]
+
+
+if __name__ == "__main__":
+    for p in sys.argv[1:] or [*SERVED_MODELS.values(), MODEL_PATH]:
+        registry.get(p)
+    for row in registry.report():
+        print(f"{row['artifact']:<24} {row['load_ms']:>8} ms {row['memory_kb']:>8} KiB  sha256={row['sha256'][:16]}")
@@ -0,0 +1,248 @@
+import os
+import re
+import time
+import heapq
+import hashlib
+import calendar
+import threading
+from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+NEWS_FEED_URL = "https://feeds.bbci.co.uk/news/topics/cpzpydkymr4t/rss.xml"
+NEWS_KEYWORDS = ['fuel', 'mileage', 'electric', 'efficiency', 'car', 'auto', 'vehicle', 'hybrid', 'gasoline', 'diesel']
+
+# extra feeds can be followed without a code change: FUELSENSE_NEWS_FEEDS="url1,url2"
+NEWS_FEEDS = [NEWS_FEED_URL] + [u.strip() for u in os.environ.get("FUELSENSE_NEWS_FEEDS", "").split(",") if u.strip()]
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_TRACKING_PARAMS = {"at_medium", "at_campaign", "at_link_id", "at_ptr_name", "ocid", "cmp", "ref", "fbclid", "gclid"}
+
+
+# ----------------------------------
+# MATCHING & DEDUPLICATION
+# ----------------------------------
+class KeywordMatcher:
+    # one compiled alternation, case-insensitive, same substring semantics as the old `k in text` check
+    def __init__(self, keywords=NEWS_KEYWORDS):
+        self.keywords = tuple(keywords)
+        alternation = "|".join(re.escape(k) for k in sorted(set(self.keywords), key=len, reverse=True))
+        self._re = re.compile(alternation, re.IGNORECASE) if alternation else None
+
+    def hits(self, text):
+        if self._re is None:
+            return 0
+        return len({m.lower() for m in self._re.findall(text)})
+
+
+def normalize_url(url):
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def _digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+
+def title_key(title):
+    return _digest(" ".join(_WORD_RE.findall(title.lower())))
+
+
+@dataclass(frozen=True)
+class NewsItem:
+    title: str
+    summary: str
+    link: str
+    published: str
+    source: str
+    timestamp: float
+    hits: int
+
+    @property
+    def rank(self):
+        return (self.timestamp, self.hits)
+
+
+def _to_item(entry, source, matcher):
+    title = (entry.get("title") or "").strip()
+    summary = _TAG_RE.sub("", entry.get("summary") or "").strip()
+    hits = matcher.hits(f"{title}\n{summary}")
+    if not title or not hits:
+        return None
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    return NewsItem(
+        title=title,
+        summary=summary,
+        link=entry.get("link") or "#",
+        published=entry.get("published") or entry.get("updated") or "Unknown date",
+        source=source,
+        timestamp=float(calendar.timegm(parsed)) if parsed else 0.0,
+        hits=hits,
+    )
+
+
+# ----------------------------------
+# SINGLE FEED (conditional GET state)
+# ----------------------------------
+class NewsFeed:
+    def __init__(self, url=NEWS_FEED_URL, parse=None):
+        self.url = url
+        self._parse = parse
+        self._etag = None
+        self._modified = None
+        self.entries = []
+        self.fetched_at = None
+        self.last_status = None
+        self.last_error = None
+
+    def _parser(self):
+        if self._parse is None:
+            import feedparser
+            self._parse = feedparser.parse
+        return self._parse
+
+    def refresh(self):
+        # True when new entries were downloaded; False on a 304 or a failure (previous entries kept)
+        try:
+            parsed = self._parser()(self.url, etag=self._etag, modified=self._modified)
+        except Exception as e:
+            self.last_error = e
+            return False
+
+        self.last_status = parsed.get("status")
+        if self.last_status == 304:
+            self.last_error = None
+            return False
+        if parsed.get("bozo") and not parsed.entries:
+            self.last_error = parsed.get("bozo_exception") or ValueError("feed could not be parsed")
+            return False
+
+        self.last_error = None
+        self.entries = parsed.entries
+        self._etag = parsed.get("etag")
+        self._modified = parsed.get("modified")
+        self.fetched_at = time.time()
+        return True
+
+
+# ----------------------------------
+# BACKGROUND AGGREGATOR
+# ----------------------------------
+# Follows every feed from one refresher thread (fetches fan out over a small pool),
+# keeps stories matching the keyword set, drops cross-feed duplicates by normalized
+# URL or title hash, and holds the best `capacity` stories in rank order.
+# The page only ever slices the ranked snapshot.
+
+class NewsAggregator:
+    def __init__(self, urls=NEWS_FEEDS, keywords=NEWS_KEYWORDS, ttl=900, retry_after=60, capacity=500, max_workers=8, parse=None):
+        self.feeds = [NewsFeed(u, parse=parse) for u in dict.fromkeys(urls)]
+        self.matcher = KeywordMatcher(keywords)
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.capacity = capacity
+        self.max_workers = max_workers
+        self._items = {}
+        # dedup keys outlive evicted stories so a re-served old story is not re-added
+        self._seen = OrderedDict()
+        self._seen_capacity = capacity * 10
+        self._ranked = ()
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def last_error(self):
+        # only reported when every feed failed; a partial outage still has stories to show
+        errors = [f.last_error for f in self.feeds if f.last_error is not None]
+        return errors[0] if errors and len(errors) == len(self.feeds) else None
+
+    def top(self, n=None):
+        ranked = self._ranked
+        return list(ranked if n is None else ranked[:n])
+
+    def __len__(self):
+        return len(self._ranked)
+
+    def is_fresh(self):
+        if self._checked_at is None:
+            return False
+        return time.monotonic() - self._checked_at < (self.retry_after if self.last_error else self.ttl)
+
+    def ingest(self, entries, source):
+        added = 0
+        with self._lock:
+            for entry in entries:
+                item = _to_item(entry, source, self.matcher)
+                if item is None:
+                    continue
+                keys = (title_key(item.title), normalize_url(item.link) if item.link != "#" else None)
+                if any(k is not None and k in self._seen for k in keys):
+                    continue
+                ident = keys[0]
+                self._items[ident] = item
+                for k in keys:
+                    if k is not None:
+                        self._seen[k] = ident
+                added += 1
+
+            while len(self._seen) > self._seen_capacity:
+                self._seen.popitem(last=False)
+
+            if len(self._items) > self.capacity:
+                keep = heapq.nlargest(self.capacity, self._items.items(), key=lambda kv: kv[1].rank)
+                self._items = dict(keep)
+            self._ranked = tuple(sorted(self._items.values(), key=lambda i: i.rank, reverse=True))
+        return added
+
+    def refresh(self, force=False):
+        with self._refresh_lock:
+            if not force and self.is_fresh():
+                return 0
+            workers = max(1, min(self.max_workers, len(self.feeds)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="news-fetch") as pool:
+                changed = list(pool.map(lambda f: f.refresh(), self.feeds))
+            added = sum(self.ingest(f.entries, f.url) for f, c in zip(self.feeds, changed) if c)
+            self._checked_at = time.monotonic()
+            return added
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.retry_after if self.last_error else self.ttl)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="news-aggregator", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+_aggregator = None
+_aggregator_lock = threading.Lock()
+
+
+def get_news_aggregator(**kwargs):
+    global _aggregator
+    with _aggregator_lock:
+        if _aggregator is None:
+            _aggregator = NewsAggregator(**kwargs)
+    return _aggregator.start()
@@ -0,0 +1,172 @@
+import os
+import sys
+import json
+import random
+import shutil
+import hashlib
+import argparse
+import tempfile
+import statistics
+import warnings
+
+# ----------------------------------
+# PER-RERUN PAYLOAD BUDGET
+# ----------------------------------
+# Runs app.py headlessly through AppTest and counts the bytes of every ForwardMsg the
+# script sends: on the first run of a session and on each later rerun (a slider change).
+# "wire" bytes follow Streamlit's message cache: an identical element of at least
+# global.minCachedMessageSize that the session has already received is sent as a
+# reference. "raw" bytes count every message in full, which is also the serialization
+# and hashing work the server does per rerun. Exits 1 when a rerun is over budget.
+# --assets synthetic runs against a throwaway asset cache holding a background image
+# and a font the size of the real ones, so the theme is measured with assets present.
+#   python payload_budget.py [--budget-kb 16] [--assets synthetic] [--json]
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+DEFAULT_BUDGET_KB = float(os.environ.get("FUELSENSE_RERUN_BUDGET_KB", 16))
+
+SYNTHETIC_BACKGROUND_BYTES = 180_000
+SYNTHETIC_FONT_BYTES = 48_000
+
+
+def synthetic_asset_cache(cache_dir):
+    # same index/object layout as `python asset_cache.py` writes, with random payloads
+    from asset_cache import BACKGROUND_TEXTURE_URL, FONTS_CSS_URL, INDEX_FILE
+
+    rng = random.Random(0)
+    font_url = "https://fonts.gstatic.com/s/inter/v13/synthetic.woff2"
+    css = (
+        "@font-face { font-family: 'Inter'; font-style: normal; font-weight: 400; font-display: swap;"
+        f" src: url({font_url}) format('woff2'); }}"
+    ).encode("utf-8")
+    entries = {
+        BACKGROUND_TEXTURE_URL: (rng.randbytes(SYNTHETIC_BACKGROUND_BYTES), "image/jpeg"),
+        font_url: (rng.randbytes(SYNTHETIC_FONT_BYTES), "font/woff2"),
+        FONTS_CSS_URL: (css, "text/css"),
+    }
+    index = {}
+    os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+    for url, (content, mime) in entries.items():
+        sha = hashlib.sha256(content).hexdigest()
+        with open(os.path.join(cache_dir, "objects", sha), "wb") as f:
+            f.write(content)
+        index[url] = {"sha256": sha, "mime": mime, "bytes": len(content)}
+    with open(os.path.join(cache_dir, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(index, f)
+
+
+class _Recorder:
+    # wraps ForwardMsgQueue.enqueue for the duration of one measurement
+    def __init__(self):
+        from streamlit import config
+
+        self.min_cached = int(config.get_option("global.minCachedMessageSize"))
+        self.seen = set()
+        self.raw = self.wire = 0
+
+    def __enter__(self):
+        from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+        from streamlit.runtime.forward_msg_cache import create_reference_msg
+
+        self._original = original = ForwardMsgQueue.enqueue
+        recorder = self
+
+        def enqueue(queue, msg):
+            size = msg.ByteSize()
+            recorder.raw += size
+            if msg.metadata.cacheable and msg.hash in recorder.seen:
+                recorder.wire += create_reference_msg(msg).ByteSize()
+            else:
+                recorder.wire += size
+                if msg.metadata.cacheable:
+                    recorder.seen.add(msg.hash)
+            return original(queue, msg)
+
+        ForwardMsgQueue.enqueue = enqueue
+        return self
+
+    def __exit__(self, *exc):
+        from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+
+        ForwardMsgQueue.enqueue = self._original
+        return False
+
+    def take(self):
+        raw, wire = self.raw, self.wire
+        self.raw = self.wire = 0
+        return raw, wire
+
+
+def measure(reruns=5, app_path=APP_PATH):
+    from streamlit import config
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+
+    config.set_option("logger.level", "error")
+    set_log_level("error")
+
+    with _Recorder() as recorder, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        at = AppTest.from_file(app_path, default_timeout=120)
+        at.run()
+        first_raw, first_wire = recorder.take()
+        raw, wire = [], []
+        for i in range(reruns):
+            at.slider(key="engine").set_value(1 + i % 7).run()
+            r, w = recorder.take()
+            raw.append(r)
+            wire.append(w)
+        if at.exception:
+            raise RuntimeError(f"app.py raised: {at.exception[0].value}")
+
+    return {
+        "first_run_raw_bytes": first_raw,
+        "first_run_wire_bytes": first_wire,
+        "rerun_raw_bytes": int(statistics.median(raw)),
+        "rerun_wire_bytes": int(statistics.median(wire)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the bytes app.py sends per rerun and enforce a budget.")
+    parser.add_argument("--budget-kb", type=float, default=DEFAULT_BUDGET_KB, help="limit for raw bytes per rerun")
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--assets", choices=["installed", "synthetic"], default="installed",
+                        help="measure with the installed asset cache or a synthetic one")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    tmp = None
+    if args.assets == "synthetic":
+        # must be set before app.py's modules are imported
+        tmp = tempfile.mkdtemp(prefix="fuelsense-assets-")
+        os.environ["FUELSENSE_ASSET_CACHE"] = tmp
+        synthetic_asset_cache(tmp)
+    from theme import STATIC_DIR
+
+    published = set(os.listdir(STATIC_DIR)) if os.path.isdir(STATIC_DIR) else set()
+    try:
+        result = measure(args.reruns)
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+            # the theme published the synthetic assets next to the real ones
+            for name in set(os.listdir(STATIC_DIR)) - published if os.path.isdir(STATIC_DIR) else ():
+                os.remove(os.path.join(STATIC_DIR, name))
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"first run   {result['first_run_raw_bytes'] / 1024:9.1f} KiB raw  {result['first_run_wire_bytes'] / 1024:9.1f} KiB on the wire")
+        print(f"per rerun   {result['rerun_raw_bytes'] / 1024:9.1f} KiB raw  {result['rerun_wire_bytes'] / 1024:9.1f} KiB on the wire")
+
+    if result["rerun_raw_bytes"] > args.budget_kb * 1024:
+        print(f"FAIL: {result['rerun_raw_bytes'] / 1024:.1f} KiB per rerun is over the {args.budget_kb:.0f} KiB budget",
+              file=sys.stderr)
+        return 1
+    print(f"OK: within the {args.budget_kb:.0f} KiB per-rerun budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import os
+import threading
+import numpy as np
+from predictor import (
+    VEHICLE_CLASSES, TRANSMISSIONS, FUEL_TYPES, INPUT_COLUMNS,
+    ENGINE_RANGE, CYLINDER_RANGE, CO2_RANGE, predict_frame,
+)
+from linear_kernel import KERNEL_PATH
+from model_registry import registry
+
+# ----------------------------------
+# DENSE PREDICTION TABLE
+# ----------------------------------
+# Every predictor input is discrete, so the whole input space
+# (6 classes x 7 engines x 16 cylinders x 5 transmissions x 10 ratings x 4 fuels)
+# is scored once per model artifact and each interactive prediction is an array index.
+
+CACHE_DIR = ".cache"
+
+AXES = [
+    VEHICLE_CLASSES,
+    list(range(ENGINE_RANGE[0], ENGINE_RANGE[1] + 1)),
+    list(range(CYLINDER_RANGE[0], CYLINDER_RANGE[1] + 1)),
+    TRANSMISSIONS,
+    list(range(CO2_RANGE[0], CO2_RANGE[1] + 1)),
+    FUEL_TYPES,
+]
+SHAPE = tuple(len(a) for a in AXES)
+_POSITIONS = [{v: i for i, v in enumerate(a)} for a in AXES]
+
+_lock = threading.Lock()
+_tables = {}
+
+
+def input_grid():
+    import pandas as pd
+
+    grids = np.meshgrid(*[np.asarray(a, dtype=object) for a in AXES], indexing="ij")
+    return pd.DataFrame({c: g.ravel() for c, g in zip(INPUT_COLUMNS, grids)})
+
+
+def build_table(model):
+    preds = predict_frame(input_grid(), model)
+    return preds.astype(np.float32).reshape(SHAPE)
+
+
+def load_or_build_table(model_path=KERNEL_PATH, cache_dir=CACHE_DIR):
+    # the model comes from the same registry snapshot as its sha256, so the table is always
+    # keyed by the artifact it was built from; a retrained export gets a new table on the next call
+    artifact = registry.artifact(model_path)
+    key = (model_path, artifact.sha256)
+    table = _tables.get(key)
+    if table is not None:
+        return table
+
+    with _lock:
+        table = _tables.get(key)
+        if table is not None:
+            return table
+
+        path = os.path.join(cache_dir, f"prediction_table_{artifact.sha256[:16]}.npy")
+        if os.path.exists(path):
+            table = np.load(path, mmap_mode="r")
+        if table is None or table.shape != SHAPE:
+            table = build_table(artifact.obj)
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, table)
+            os.replace(tmp, path)
+
+        # one live table per artifact path: a retrained model replaces only its own entry
+        for stale in [k for k in _tables if k[0] == model_path]:
+            del _tables[stale]
+        _tables[key] = table
+        return table
+
+
+def lookup(table, vehicle_class, engine, cylinders, transmission, co2, fuel_type):
+    values = (vehicle_class, int(engine), int(cylinders), transmission, int(co2), fuel_type)
+    try:
+        idx = tuple(pos[v] for pos, v in zip(_POSITIONS, values))
+    except KeyError as e:
+        raise ValueError(f"{e.args[0]!r} is outside the precomputed input space") from None
+    return float(table[idx])
@@ -0,0 +1,170 @@
+import io
+import sys
+import time
+import weakref
+import argparse
+import numpy as np
+from features import INPUT_COLUMNS, TRANSMISSION_ORDER, VEHICLE_CLASS_ORDER, category_positions
+from preprocessing import normalize_transmission, normalize_transmission_code
+
+# ----------------------------------
+# INPUT VOCABULARIES (shared with the app's selectboxes)
+# ----------------------------------
+vehicle_map = {
+    '🏎️ Two-Seater': 'Two-seater',
+    '🚙 Compact': 'Compact',
+    '🚗 Subcompact': 'Subcompact',
+    '🚐 Minivan': 'Minivan',
+    '🚙 SUV Small': 'SUV: Small',
+    '🚚 Pickup Standard': 'Pickup truck: Standard'
+}
+
+trans_map = {
+    '🔄 Automatic': 'A',
+    '⚙️ Manual': 'M',
+    '🔄 CVT': 'AV',
+    '🔀 Auto-Manual': 'AM',
+    '⚙️ Auto-Shift': 'AS'
+}
+
+fuel_map = {
+    '⛽ Diesel': 'D',
+    '🌱 Ethanol': 'E',
+    '⛽ Gasoline': 'X',
+    '⚡ Electric': 'Z'
+}
+
+VEHICLE_CLASSES = list(vehicle_map.values())
+TRANSMISSIONS = list(trans_map.values())
+FUEL_TYPES = list(fuel_map.values())
+
+# slider bounds of the predictor form (inclusive)
+ENGINE_RANGE = (1, 7)
+CYLINDER_RANGE = (1, 16)
+CO2_RANGE = (1, 10)
+
+PREDICTION_COLUMN = "Predicted Fuel Consumption (L/100 km)"
+
+
+def known_categories(model):
+    # what the model's encoder can represent; anything else would encode as -1 / no fuel dummy
+    fuel_types = model.fuel_types if hasattr(model, "fuel_types") else model.named_steps["encode"].fuel_types_
+    return {
+        "Vehicle Class": list(VEHICLE_CLASS_ORDER),
+        "Transmission": list(TRANSMISSION_ORDER),
+        "Fuel Type": sorted(fuel_types),
+    }
+
+
+def check_value(column, value, known):
+    # single-row form of check_categories(); transmissions are compared after normalization
+    if column == "Transmission":
+        value = normalize_transmission_code(value)
+    if value not in known[column]:
+        raise ValueError(f"Unknown {column} value {value!r}. Expected one of {known[column]}")
+
+
+def check_categories(frame, model):
+    # the encoder stays permissive; bulk inputs with typos are rejected here instead
+    import pandas as pd
+
+    known = known_categories(model)
+    for column, categories in known.items():
+        values = frame[column]
+        if column == "Transmission":
+            values = normalize_transmission(values)
+        unknown = category_positions(values, categories) < 0
+        if unknown.any():
+            bad = sorted(set(pd.Series(values)[unknown].astype(str)))
+            raise ValueError(f"Unknown {column} value(s): {', '.join(bad[:5])}. Expected one of {categories}")
+
+
+def predict_frame(frame, model):
+    # `model` is the linear kernel from fuel_model.npz (or the full pipeline from fuel_model.sav):
+    # either encodes and predicts raw inputs in one call
+    if len(frame) == 0:
+        return np.empty(0)
+    missing = [c for c in INPUT_COLUMNS if c not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    check_categories(frame, model)
+    return model.predict(frame[INPUT_COLUMNS])
+
+
+def predict_one(vehicle_class, engine, cylinders, transmission, co2, fuel_type, model):
+    if hasattr(model, "predict_row"):
+        # the linear kernel scores a single row without building a DataFrame
+        return float(model.predict_row(vehicle_class, engine, cylinders, transmission, co2, fuel_type))
+    import pandas as pd
+
+    row = pd.DataFrame([[vehicle_class, engine, cylinders, transmission, co2, fuel_type]], columns=INPUT_COLUMNS)
+    return float(predict_frame(row, model)[0])
+
+
+_latencies = weakref.WeakKeyDictionary()
+
+
+def measured_latency(model, repeat=200):
+    # best-of timing of one predict_one() call, measured once per loaded model object
+    seconds = _latencies.get(model)
+    if seconds is None:
+        row = (VEHICLE_CLASSES[0], ENGINE_RANGE[0], CYLINDER_RANGE[0], TRANSMISSIONS[0], CO2_RANGE[0], FUEL_TYPES[0])
+        seconds = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            predict_one(*row, model)
+            seconds = min(seconds, time.perf_counter() - t0)
+        _latencies[model] = seconds
+    return seconds
+
+
+def iter_scored_chunks(source, model, chunksize=100_000):
+    import pandas as pd
+
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        chunk[PREDICTION_COLUMN] = np.round(predict_frame(chunk, model), 2)
+        yield chunk
+
+
+def iter_csv_text(chunks):
+    # scored frames -> CSV text, header on the first chunk only
+    header = True
+    for chunk in chunks:
+        buf = io.StringIO()
+        chunk.to_csv(buf, index=False, header=header)
+        header = False
+        yield buf.getvalue()
+
+
+def iter_predict_csv(source, model, chunksize=100_000):
+    # yields CSV text chunk by chunk so large manifests never sit in memory twice
+    yield from iter_csv_text(iter_scored_chunks(source, model, chunksize))
+
+
+def predict_csv(source, destination, model, chunksize=100_000):
+    rows = 0
+    with open(destination, "w", newline="", encoding="utf-8") as out:
+        for i, chunk in enumerate(iter_scored_chunks(source, model, chunksize)):
+            chunk.to_csv(out, index=False, header=(i == 0))
+            rows += len(chunk)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk fuel consumption prediction for a CSV of vehicle configurations.")
+    parser.add_argument("input", help=f"CSV with columns: {', '.join(INPUT_COLUMNS)}")
+    parser.add_argument("output", help="where to write the scored CSV")
+    parser.add_argument("--model", default="fuel_model.npz", help="fuel_model.npz (NumPy only) or fuel_model.sav")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    from model_registry import load_model
+    model = load_model(args.model)
+
+    rows = predict_csv(args.input, args.output, model, args.chunksize)
+    print(f"Scored {rows} vehicles -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
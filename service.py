@@ -0,0 +1,316 @@
+import io
+import os
+import json
+import math
+import sys
+import asyncio
+import argparse
+from contextlib import asynccontextmanager
+import numpy as np
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from features import INPUT_COLUMNS
+from predictor import PREDICTION_COLUMN, check_categories, check_value, iter_csv_text, known_categories, predict_frame
+from model_registry import load_model
+from linear_kernel import KERNEL_PATH
+
+# ----------------------------------
+# HTTP PREDICTION SERVICE
+# ----------------------------------
+# A small ASGI app over the same encoder and model artifacts as the Streamlit UI.
+# Concurrent POST /predict requests are coalesced into one predict() call per micro-batch:
+# the first request opens a window of FUELSENSE_BATCH_WAIT_MS, and the batch is scored when
+# the window closes or FUELSENSE_MAX_BATCH requests are waiting, whichever comes first.
+#   python service.py --port 8000                 # or: uvicorn service:app
+#   FUELSENSE_MODEL=fuel_model_forest.npz python service.py   # serve the Random Forest instead
+#   curl -d '{"Vehicle Class": "Compact", "Engine Size": 2, "Cylinders": 4,
+#             "Transmission": "A", "CO2 Rating": 6, "Fuel Type": "X"}' localhost:8000/predict
+#   python loadtest.py --url http://localhost:8000   # p50/p99 latency and throughput
+
+MODEL_PATH = os.environ.get("FUELSENSE_MODEL", KERNEL_PATH)
+MAX_BATCH = int(os.environ.get("FUELSENSE_MAX_BATCH", 512))
+MAX_WAIT_MS = float(os.environ.get("FUELSENSE_BATCH_WAIT_MS", 2.0))
+MAX_BULK_ROWS = 100_000
+MAX_BULK_BYTES = int(os.environ.get("FUELSENSE_MAX_BULK_BYTES", 16 * 1024 * 1024))  # bulk JSON / CSV bodies
+MAX_VEHICLE_BYTES = 64 * 1024  # one vehicle on /predict
+BULK_CHUNK_ROWS = 10_000
+
+NUMERIC_COLUMNS = ["Engine Size", "Cylinders", "CO2 Rating"]
+
+
+class InvalidVehicle(ValueError):
+    status = 422
+
+
+class PayloadTooLarge(InvalidVehicle):
+    status = 413
+
+
+def parse_vehicle(obj, known):
+    # `known`: predictor.known_categories() of the served model
+    if not isinstance(obj, dict):
+        raise InvalidVehicle("expected a JSON object with the vehicle's fields")
+    missing = [c for c in INPUT_COLUMNS if c not in obj]
+    if missing:
+        raise InvalidVehicle(f"Missing field(s): {', '.join(missing)}")
+    row = []
+    for c in INPUT_COLUMNS:
+        value = obj[c]
+        if c in NUMERIC_COLUMNS:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise InvalidVehicle(f"{c!r} must be a number")
+            # json.loads accepts NaN / Infinity and turns 1e400 into inf
+            if not math.isfinite(value):
+                raise InvalidVehicle(f"{c!r} must be a finite number")
+        elif not isinstance(value, str):
+            raise InvalidVehicle(f"{c!r} must be a string")
+        else:
+            try:
+                check_value(c, value, known)
+            except ValueError as e:
+                raise InvalidVehicle(str(e)) from None
+        row.append(value)
+    return row
+
+
+def check_csv_frame(frame, model):
+    # the whole manifest is validated before the first scored chunk is streamed back
+    import pandas as pd
+
+    missing = [c for c in INPUT_COLUMNS if c not in frame.columns]
+    if missing:
+        raise InvalidVehicle(f"Missing column(s): {', '.join(missing)}")
+    if frame.empty:
+        raise InvalidVehicle("no vehicles in this file")
+    if len(frame) > MAX_BULK_ROWS:
+        raise InvalidVehicle(f"at most {MAX_BULK_ROWS} vehicles per request")
+    for c in NUMERIC_COLUMNS:
+        try:
+            values = pd.to_numeric(frame[c], errors="raise").to_numpy(dtype=np.float64)
+        except (TypeError, ValueError):
+            raise InvalidVehicle(f"{c!r} must be numeric") from None
+        if not np.isfinite(values).all():
+            raise InvalidVehicle(f"{c!r} must be finite in every row")
+    try:
+        check_categories(frame, model)
+    except ValueError as e:
+        raise InvalidVehicle(str(e)) from None
+
+
+def predict_rows(rows, model_path=MODEL_PATH):
+    # load_model() re-stats the artifact, so a retrained export is served from the next batch on
+    model = load_model(model_path)
+    if hasattr(model, "predict_rows"):
+        # the NumPy kernels encode plain rows themselves; a batch never becomes a DataFrame
+        return model.predict_rows(rows)
+    import pandas as pd
+
+    return predict_frame(pd.DataFrame(rows, columns=INPUT_COLUMNS), model)
+
+
+class MicroBatcher:
+
+    def __init__(self, predict_batch, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.predict_batch = predict_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.rows = 0
+        self._pending = []
+        self._wakeup = None
+        self._full = None
+        self._task = None
+
+    async def start(self):
+        self._wakeup, self._full = asyncio.Event(), asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for _, future in self._pending:
+            if not future.done():
+                future.set_exception(RuntimeError("prediction service is shutting down"))
+        self._pending = []
+
+    async def submit(self, row):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((row, future))
+        if len(self._pending) == 1:
+            self._wakeup.set()
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            if len(self._pending) < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            if not self._pending:
+                self._wakeup.clear()
+            if len(self._pending) < self.max_batch:
+                self._full.clear()
+
+            # scored off the event loop, so requests keep queueing for the next batch meanwhile
+            try:
+                preds = await loop.run_in_executor(None, self.predict_batch, [row for row, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.rows += len(batch)
+            for (_, future), pred in zip(batch, preds):
+                if not future.done():
+                    future.set_result(float(pred))
+
+
+batcher = MicroBatcher(predict_rows)
+
+
+def _error(message, status=422):
+    return JSONResponse({"error": message}, status_code=status)
+
+
+async def _read_body(request, limit):
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > limit:
+        raise PayloadTooLarge(f"body over {limit} bytes")
+    parts, size = [], 0
+    async for part in request.stream():
+        size += len(part)
+        if size > limit:
+            raise PayloadTooLarge(f"body over {limit} bytes")
+        parts.append(part)
+    return b"".join(parts)
+
+
+async def _json_body(request, limit):
+    body = await _read_body(request, limit)
+    try:
+        return json.loads(body)
+    except ValueError:
+        raise InvalidVehicle("request body is not valid JSON") from None
+
+
+async def predict(request):
+    try:
+        row = parse_vehicle(await _json_body(request, MAX_VEHICLE_BYTES), known_categories(load_model(MODEL_PATH)))
+    except InvalidVehicle as e:
+        return _error(str(e), e.status)
+    pred = await batcher.submit(row)
+    return JSONResponse({"prediction": round(pred, 4), "unit": "L/100 km"})
+
+
+async def predict_bulk(request):
+    # JSON {"vehicles": [...]} -> {"predictions": [...]}, or a CSV manifest -> the scored CSV
+    loop = asyncio.get_running_loop()
+    model = load_model(MODEL_PATH)
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        import pandas as pd
+
+        try:
+            body = await _read_body(request, MAX_BULK_BYTES)
+            try:
+                frame = await loop.run_in_executor(
+                    None, lambda: pd.read_csv(io.StringIO(body.decode("utf-8-sig"))))
+            except (UnicodeDecodeError, ValueError) as e:
+                raise InvalidVehicle(f"Could not read this file: {e}") from None
+            await loop.run_in_executor(None, check_csv_frame, frame, model)
+        except InvalidVehicle as e:
+            return _error(str(e), e.status)
+
+        def scored():
+            # run by Starlette in a worker thread, one chunk at a time as the client reads
+            for start in range(0, len(frame), BULK_CHUNK_ROWS):
+                chunk = frame.iloc[start:start + BULK_CHUNK_ROWS].copy()
+                chunk[PREDICTION_COLUMN] = np.round(predict_frame(chunk, model), 2)
+                yield chunk
+
+        return StreamingResponse(iter_csv_text(scored()), media_type="text/csv")
+
+    known = known_categories(model)
+    try:
+        body = await _json_body(request, MAX_BULK_BYTES)
+        vehicles = body.get("vehicles") if isinstance(body, dict) else None
+        if not isinstance(vehicles, list):
+            raise InvalidVehicle('expected {"vehicles": [...]}')
+        if len(vehicles) > MAX_BULK_ROWS:
+            raise InvalidVehicle(f"at most {MAX_BULK_ROWS} vehicles per request")
+        rows = []
+        for i, v in enumerate(vehicles):
+            try:
+                rows.append(parse_vehicle(v, known))
+            except InvalidVehicle as e:
+                raise type(e)(f"vehicles[{i}]: {e}") from None
+    except InvalidVehicle as e:
+        return _error(str(e), e.status)
+    preds = await loop.run_in_executor(None, predict_rows, rows) if rows else np.empty(0)
+    return JSONResponse({"predictions": np.round(preds, 4).tolist(), "unit": "L/100 km"})
+
+
+async def health(request):
+    model = load_model(MODEL_PATH)
+    return JSONResponse({
+        "status": "ok",
+        "model": MODEL_PATH,
+        "version": getattr(model, "version", ""),
+        "batches": batcher.batches,
+        "rows": batcher.rows,
+        "mean_batch": round(batcher.rows / batcher.batches, 2) if batcher.batches else 0.0,
+        "max_batch": batcher.max_batch,
+        "max_wait_ms": batcher.max_wait * 1000,
+    })
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # load and warm the encoder before the first request instead of during it
+    predict_rows([["Compact", 2, 4, "A", 6, "X"]])
+    await batcher.start()
+    try:
+        yield
+    finally:
+        await batcher.stop()
+
+
+app = Starlette(
+    routes=[
+        Route("/predict", predict, methods=["POST"]),
+        Route("/predict/bulk", predict_bulk, methods=["POST"]),
+        Route("/healthz", health, methods=["GET"]),
+    ],
+    lifespan=lifespan,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=f"HTTP fuel consumption predictions ({PREDICTION_COLUMN}).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS, help="micro-batch window")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    batcher.max_batch, batcher.max_wait = args.max_batch, args.max_wait_ms / 1000
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+import sys
+import time
+import argparse
+import functools
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+from analytics import data_version
+from preprocessing import fuel_code, normalize_transmission_code
+from vehicle_data import DATA_PATH, load_vehicle_data
+
+# ----------------------------------
+# SIMILAR REAL VEHICLES
+# ----------------------------------
+# The dataset is partitioned by (vehicle category, transmission family, fuel type), and
+# each partition gets a KD-tree over standardized engine size and cylinder count. The
+# index is built once per dataset version. A configuration is compared with
+#   distance = ||standardized (engine, cylinders) difference|| + MISMATCH_PENALTY x (number of
+#              differing transmission family / fuel type)
+# Partitions of the configuration's category are searched in order of their penalty,
+# stopping once no remaining partition can beat the current k-th distance; usually only
+# the exact-match tree is visited. A query never touches the other partitions' rows, so
+# its cost grows with log(partition size), not with the dataset.
+#   python similar_vehicles.py --rows 1000 100000 1000000   # build time / query latency as data grows
+
+TOP_K = 5
+MISMATCH_PENALTY = 1.0  # in standard deviations of engine size / cylinders
+
+CATEGORY_COLUMN = "Vehicle Category"
+ENGINE_COLUMN = "Engine Capacity (Liters)"
+CYLINDERS_COLUMN = "Number of Cylinders"
+TRANSMISSION_COLUMN = "Transmission"
+FUEL_COLUMN = "TYPE OF FUEL"
+CONSUMPTION_COLUMN = "Combined Fuel Efficiency (L/100 km)"
+
+SHOWN_COLUMNS = ["Brand Name", "Model", CATEGORY_COLUMN, ENGINE_COLUMN, CYLINDERS_COLUMN,
+                 TRANSMISSION_COLUMN, FUEL_COLUMN, CONSUMPTION_COLUMN]
+
+# the dataset mixes the app's codes with words; both sides are compared as codes
+TRANSMISSION_ALIASES = {"Automatic": "A", "Manual": "M", "CVT": "AV"}
+
+
+def transmission_family(value):
+    code = normalize_transmission_code(value)
+    return TRANSMISSION_ALIASES.get(code, code)
+
+
+def _codes(values, normalize=str):
+    # (labels, per-row index into labels) with the text rule run once per distinct value;
+    # missing values become "Unknown"
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    labels, inverse = np.unique(np.asarray([normalize(u) for u in uniques] + ["Unknown"], dtype=object),
+                                return_inverse=True)
+    return labels, inverse[codes]
+
+
+class SimilarityIndex:
+
+    def __init__(self, df):
+        engine = np.asarray(df[ENGINE_COLUMN], dtype=np.float64)
+        cylinders = np.asarray(df[CYLINDERS_COLUMN], dtype=np.float64)
+        keep = np.isfinite(engine) & np.isfinite(cylinders) & np.isfinite(np.asarray(df[CONSUMPTION_COLUMN], dtype=np.float64))
+        self.rows = np.flatnonzero(keep)
+
+        X = np.column_stack([engine[keep], cylinders[keep]])
+        self.mean = X.mean(axis=0) if len(X) else np.zeros(2)
+        scale = X.std(axis=0) if len(X) else np.ones(2)
+        self.scale = np.where(scale > 0, scale, 1.0)
+        points = (X - self.mean) / self.scale
+
+        columns = [_codes(df[CATEGORY_COLUMN]), _codes(df[TRANSMISSION_COLUMN], transmission_family),
+                   _codes(df[FUEL_COLUMN], fuel_code)]
+        key = np.zeros(len(self.rows), dtype=np.int64)
+        for labels, codes in columns:
+            key = key * len(labels) + codes[keep]
+
+        # one stable sort groups the rows of every partition together
+        order = np.argsort(key, kind="stable")
+        bounds = np.flatnonzero(np.diff(key[order])) + 1
+        self.partitions = {}
+        self._by_category = {}
+        for positions in np.split(order, bounds) if len(order) else []:
+            code, labels = int(key[positions[0]]), []
+            for column_labels, _ in reversed(columns):
+                code, i = divmod(code, len(column_labels))
+                labels.append(str(column_labels[i]))
+            partition = tuple(reversed(labels))
+            # positions index the kept rows; the tree's own indices index `positions`
+            self.partitions[partition] = (cKDTree(points[positions], balanced_tree=False, compact_nodes=False), positions)
+            self._by_category.setdefault(partition[0], []).append(partition)
+
+        # the shown columns as plain arrays (text as labels + codes): a result is k array reads
+        self._shown = {}
+        for column in SHOWN_COLUMNS:
+            values = df[column]
+            if pd.api.types.is_numeric_dtype(values.dtype):
+                self._shown[column] = (None, np.asarray(values))
+            else:
+                codes, uniques = pd.factorize(values, use_na_sentinel=True)
+                self._shown[column] = (np.asarray(list(uniques) + [""], dtype=object), codes)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def query(self, category, engine, cylinders, transmission, fuel, k=TOP_K):
+        # [(dataset row, distance)] for the k closest vehicles, closest first
+        x = (np.asarray([engine, cylinders], dtype=np.float64) - self.mean) / self.scale
+        transmission, fuel = transmission_family(transmission), fuel_code(fuel)
+        # an unknown category is matched against every partition instead
+        keys = self._by_category.get(category) or list(self.partitions)
+        candidates = sorted((MISMATCH_PENALTY * ((t != transmission) + (f != fuel)), (c, t, f)) for c, t, f in keys)
+
+        best = []
+        for penalty, key in candidates:
+            if len(best) == k and penalty >= best[-1][0]:
+                break
+            tree, positions = self.partitions[key]
+            distances, found = tree.query(x, k=min(k, len(positions)))
+            best.extend(zip(np.atleast_1d(distances) + penalty, positions[np.atleast_1d(found)]))
+            best.sort(key=lambda pair: pair[0])
+            del best[k:]
+        return [(int(self.rows[p]), float(d)) for d, p in best]
+
+    def vehicles(self, matches):
+        rows = np.asarray([row for row, _ in matches], dtype=np.int64)
+        columns = {c: (labels[codes[rows]] if labels is not None else codes[rows]).tolist()
+                   for c, (labels, codes) in self._shown.items()}
+        return [dict({c: columns[c][i] for c in columns}, Distance=round(d, 3)) for i, (_, d) in enumerate(matches)]
+
+
+@functools.lru_cache(maxsize=2)
+def _index_for_version(path, mtime_ns, size):
+    return SimilarityIndex(load_vehicle_data(path))
+
+
+def get_similarity_index(path=DATA_PATH):
+    return _index_for_version(*data_version(path))
+
+
+def similar_vehicles(category, engine, cylinders, transmission, fuel, k=TOP_K, path=DATA_PATH):
+    # the k closest real vehicles with their measured consumption: one dict per vehicle, closest first
+    index = get_similarity_index(path)
+    return index.vehicles(index.query(category, engine, cylinders, transmission, fuel, k))
+
+
+def _synthetic_frame(rows, seed=0):
+    # resampled real rows with jittered engine sizes: the real category / code mix at any size
+    rng = np.random.default_rng(seed)
+    df = load_vehicle_data()
+    df = df.iloc[rng.integers(0, len(df), rows)].reset_index(drop=True)
+    df[ENGINE_COLUMN] = np.round(df[ENGINE_COLUMN] + rng.normal(0, 0.15, rows), 1).clip(0, None)
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Similar-vehicle index build time and query latency as the data grows.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("-k", type=int, default=TOP_K)
+    args = parser.parse_args(argv)
+
+    configurations = [("SUV: Small", 2.0, 4, "AS", "X"), ("Compact", 1.5, 4, "M", "X"), ("Two-seater", 5.2, 10, "AM", "Z"),
+                      ("Pickup truck: Standard", 3.0, 6, "A", "D"), ("Minivan", 3.6, 6, "A", "E")]
+    print(f"{'rows':>12} {'partitions':>11} {'build':>10} {'p50 query':>10} {'p99 query':>10}")
+    for rows in args.rows:
+        df = _synthetic_frame(rows)
+        t0 = time.perf_counter()
+        index = SimilarityIndex(df)
+        build = time.perf_counter() - t0
+
+        timings = []
+        for i in range(args.queries):
+            config = configurations[i % len(configurations)]
+            t0 = time.perf_counter()
+            index.query(*config, k=args.k)
+            timings.append(time.perf_counter() - t0)
+        p50, p99 = np.percentile(timings, [50, 99]) * 1e6
+        print(f"{rows:>12,} {len(index.partitions):>11,} {build * 1000:>8.0f}ms {p50:>8.0f}µs {p99:>8.0f}µs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+import os
+import sys
+import pytest
+
+# the modules live at the repository root and resolve data/ and the model files relative to it
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def _repo_root(monkeypatch):
+    monkeypatch.chdir(ROOT)
+
+
+@pytest.fixture
+def offline_news():
+    # the process-wide aggregator app.py picks up, fed by an empty stand-in instead of the network
+    from news import get_news_aggregator
+
+    class _Feed(dict):
+        entries = []
+
+    return get_news_aggregator(parse=lambda url, etag=None, modified=None: _Feed(status=200))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from sklearn.metrics import pairwise_distances_argmin
+from clustering import NUMERIC, ClusterModel, fit_stream
+
+
+@pytest.fixture(scope="module")
+def model():
+    rng = np.random.default_rng(0)
+    return ClusterModel(rng.normal(size=(8, len(NUMERIC) + 3)), [2.5, 5.0, 5.0], [1.5, 2.0, 1.7],
+                        ["D", "X", "Z"], version="test")
+
+
+def test_assign_matches_sklearn_argmin(model):
+    X = np.random.default_rng(1).normal(size=(5_000, model.centroids.shape[1]))
+    # small blocks so the block boundaries are crossed too
+    np.testing.assert_array_equal(model.assign(X, block=777), pairwise_distances_argmin(X, model.centroids))
+
+
+def test_bytes_round_trip(model):
+    loaded = ClusterModel.from_bytes(model.to_bytes())
+    np.testing.assert_array_equal(loaded.centroids, model.centroids)
+    np.testing.assert_array_equal(loaded.mean, model.mean)
+    np.testing.assert_array_equal(loaded.scale, model.scale)
+    assert (loaded.fuel_types, loaded.version) == (model.fuel_types, model.version)
+    X = model.encode([[2.0, 4, 6], [5.0, 8, 9]], ["X", "E"])
+    np.testing.assert_array_equal(loaded.assign(X), model.assign(X))
+
+
+def test_fit_stream_scales_like_the_whole_data():
+    rng = np.random.default_rng(2)
+    numeric = rng.normal([2.5, 5.0, 5.0], [1.5, 2.0, 1.7], size=(3_000, 3))
+    fuel = rng.choice(["X", "Z", "D", "Unknown"], len(numeric)).astype(object)
+
+    def chunks():
+        for start in range(0, len(numeric), 700):
+            yield numeric[start:start + 700], fuel[start:start + 700]
+
+    fitted = fit_stream(chunks, n_clusters=4, epochs=1)
+    np.testing.assert_allclose(fitted.mean, numeric.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(fitted.scale, numeric.std(axis=0), rtol=1e-12)
+    assert fitted.fuel_types == ["D", "X", "Z"]
@@ -0,0 +1,11 @@
+import sys
+import subprocess
+from import_budget import DEFAULT_BUDGET_MS
+
+
+def test_cold_start_imports_within_budget():
+    # the script replays app.py's imports in fresh interpreters and exits 1 over budget or
+    # when pandas / plotly / sklearn / requests / feedparser load at start-up
+    run = subprocess.run([sys.executable, "import_budget.py", "--budget-ms", str(DEFAULT_BUDGET_MS)],
+                         capture_output=True, text=True, timeout=300)
+    assert run.returncode == 0, run.stdout + run.stderr
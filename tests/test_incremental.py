@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from incremental import SufficientStats, load_state, save_state, verify
+from training import build_pipeline, prepare_frame, split
+from vehicle_data import load_vehicle_data
+
+
+def test_verify_matches_full_fit():
+    result = verify(load_vehicle_data())
+    assert result["ok"], result
+
+
+def test_update_on_saved_state_matches_full_fit(tmp_path):
+    xtrain, xtest, ytrain, _ = split(prepare_frame(load_vehicle_data()))
+    half = len(xtrain) // 2
+    path = str(tmp_path / "stats.pkl")
+    save_state(SufficientStats().update(xtrain.iloc[:half], ytrain.iloc[:half]), path)
+
+    state = load_state(path).update(xtrain.iloc[half:], ytrain.iloc[half:])
+    incremental, metrics = state.solve()
+    # the two batches together are the whole training split
+    scratch = build_pipeline().fit(xtrain, ytrain)
+
+    assert metrics["train_rows"] == len(xtrain)
+    np.testing.assert_allclose(incremental.predict(xtest), scratch.predict(xtest), atol=1e-8)
+
+
+def test_load_state_refuses_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError, match="rebuild"):
+        load_state(str(tmp_path / "missing.pkl"))
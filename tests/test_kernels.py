@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmark import sample_frame
+from features import INPUT_COLUMNS
+from model_registry import load_model
+from training import MODELS, prepare_frame, split
+from vehicle_data import load_vehicle_data
+
+
+@pytest.fixture(scope="module")
+def frame():
+    # real rows (raw transmission codes, fractional engine sizes) plus the app's whole input range
+    _, xtest, _, _ = split(prepare_frame(load_vehicle_data()))
+    return pd.concat([xtest[INPUT_COLUMNS], sample_frame(2_000)], ignore_index=True)
+
+
+@pytest.mark.parametrize("name", MODELS)
+def test_kernel_matches_sklearn_pipeline(frame, name):
+    sav_path, kernel_path, _ = MODELS[name]
+    expected = load_model(sav_path).predict(frame)
+    kernel = load_model(kernel_path)
+    rows = frame.values.tolist()
+
+    np.testing.assert_allclose(kernel.predict(frame), expected, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(kernel.predict_rows(rows), expected, rtol=0, atol=1e-9)
+    np.testing.assert_allclose([kernel.predict_row(*row) for row in rows[:300]], expected[:300], rtol=0, atol=1e-9)
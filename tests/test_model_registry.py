@@ -0,0 +1,27 @@
+import shutil
+import pytest
+from artifact_io import expected_sha256, manifest_path
+from linear_kernel import KERNEL_PATH, export_kernel
+from model_registry import ArtifactHashMismatch, ModelRegistry, load_artifact
+
+
+def test_committed_artifacts_match_their_manifests():
+    registry = ModelRegistry()
+    registry.get(KERNEL_PATH)
+    assert registry.report()[0]["sha256"] == expected_sha256(KERNEL_PATH)
+
+
+def test_export_writes_manifest(tmp_path):
+    path = str(tmp_path / "kernel.npz")
+    export_kernel(load_artifact(), path)
+    assert ModelRegistry().artifact(path).sha256 == expected_sha256(path)
+
+
+def test_tampered_artifact_is_refused(tmp_path):
+    path = str(tmp_path / "kernel.npz")
+    shutil.copy(KERNEL_PATH, path)
+    shutil.copy(manifest_path(KERNEL_PATH), manifest_path(path))
+    with open(path, "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(ArtifactHashMismatch):
+        ModelRegistry().get(path)
@@ -0,0 +1,97 @@
+import time
+from news import NewsAggregator
+
+
+class FakeFeed(dict):
+    def __init__(self, entries=(), **fields):
+        super().__init__(**fields)
+        self.entries = list(entries)
+
+
+class FakeParse:
+    # stands in for feedparser.parse: each url serves whatever the test queued for it
+    def __init__(self):
+        self.responses = {}
+        self.calls = []
+
+    def __call__(self, url, etag=None, modified=None):
+        self.calls.append((url, etag, modified))
+        response = self.responses[url]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def entry(title, link, day=1, summary="fuel prices"):
+    return {
+        "title": title,
+        "summary": summary,
+        "link": link,
+        "published_parsed": time.gmtime(day * 86400),
+    }
+
+
+def test_not_modified_keeps_previous_entries():
+    parse = FakeParse()
+    parse.responses["a"] = FakeFeed([entry("Fuel duty frozen", "https://a.example/1")], status=200, etag="v1")
+    news = NewsAggregator(urls=["a"], parse=parse)
+    assert news.refresh(force=True) == 1
+
+    parse.responses["a"] = FakeFeed(status=304)
+    assert news.refresh(force=True) == 0
+    assert [i.title for i in news.top()] == ["Fuel duty frozen"]
+    assert news.feeds[0].entries and news.last_error is None
+    # the second request was conditional on the first response
+    assert parse.calls[-1] == ("a", "v1", None)
+
+
+def test_parse_failure_sets_last_error_and_keeps_entries():
+    parse = FakeParse()
+    parse.responses["a"] = FakeFeed([entry("Fuel duty frozen", "https://a.example/1")], status=200)
+    news = NewsAggregator(urls=["a"], parse=parse)
+    news.refresh(force=True)
+
+    parse.responses["a"] = OSError("connection reset")
+    assert news.refresh(force=True) == 0
+    assert isinstance(news.last_error, OSError)
+    assert [i.title for i in news.top()] == ["Fuel duty frozen"]
+
+    parse.responses["a"] = FakeFeed(status=200, bozo=1, bozo_exception=ValueError("not xml"))
+    news.refresh(force=True)
+    assert isinstance(news.last_error, ValueError)
+    assert len(news) == 1
+
+
+def test_duplicates_across_feeds_are_dropped():
+    parse = FakeParse()
+    parse.responses["a"] = FakeFeed([
+        entry("Electric cars outsell diesel", "https://www.a.example/story/?utm_source=rss&id=7"),
+        entry("Hybrid sales climb", "https://a.example/hybrid"),
+    ], status=200)
+    parse.responses["b"] = FakeFeed([
+        # same story, different tracking parameters and host spelling
+        entry("Electric cars overtake diesel", "https://a.example/story?id=7&at_medium=RSS"),
+        # same title, different link
+        entry("Hybrid Sales Climb!", "https://b.example/hybrid-sales"),
+        entry("Fuel efficiency rules tighten", "https://b.example/rules"),
+    ], status=200)
+    news = NewsAggregator(urls=["a", "b"], parse=parse, max_workers=1)
+
+    assert news.refresh(force=True) == 3
+    assert sorted(i.title for i in news.top()) == [
+        "Electric cars outsell diesel", "Fuel efficiency rules tighten", "Hybrid sales climb",
+    ]
+
+
+def test_eviction_keeps_highest_ranked_items():
+    parse = FakeParse()
+    parse.responses["a"] = FakeFeed(
+        [entry(f"Fuel story {day}", f"https://a.example/{day}", day=day) for day in (3, 9, 1, 7, 5)],
+        status=200,
+    )
+    news = NewsAggregator(urls=["a"], parse=parse, capacity=3)
+
+    news.refresh(force=True)
+    assert [i.title for i in news.top()] == ["Fuel story 9", "Fuel story 7", "Fuel story 5"]
+    # an evicted story served again is still recognised as seen
+    assert news.ingest([entry("Fuel story 1", "https://a.example/1", day=1)], "a") == 0
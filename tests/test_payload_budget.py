@@ -0,0 +1,6 @@
+from payload_budget import DEFAULT_BUDGET_KB, measure
+
+
+def test_rerun_payload_within_budget(offline_news):
+    result = measure(reruns=3)
+    assert result["rerun_raw_bytes"] <= DEFAULT_BUDGET_KB * 1024, result
@@ -0,0 +1,33 @@
+import shutil
+import numpy as np
+import pytest
+from artifact_io import manifest_path
+from model_registry import SERVED_MODELS, load_model
+from prediction_table import AXES, load_or_build_table, lookup
+from predictor import predict_one
+
+
+def _grid_points(n=50, seed=0):
+    rng = np.random.default_rng(seed)
+    return [tuple(axis[rng.integers(len(axis))] for axis in AXES) for _ in range(n)]
+
+
+@pytest.mark.parametrize("model_path", SERVED_MODELS.values())
+def test_lookup_matches_predict_one(tmp_path, model_path):
+    table = load_or_build_table(model_path, cache_dir=str(tmp_path))
+    model = load_model(model_path)
+    for point in _grid_points():
+        # the table stores float32
+        assert lookup(table, *point) == pytest.approx(predict_one(*point, model), rel=1e-6)
+
+
+def test_replaced_artifact_gets_its_own_table(tmp_path):
+    path = str(tmp_path / "model.npz")
+    cache_dir = str(tmp_path / "cache")
+    linear, forest = SERVED_MODELS["Linear Regression"], SERVED_MODELS["Random Forest"]
+    for source in (linear, forest):
+        shutil.copy(source, path)
+        shutil.copy(manifest_path(source), manifest_path(path))
+        table = load_or_build_table(path, cache_dir=cache_dir)
+        point = _grid_points(1)[0]
+        assert lookup(table, *point) == pytest.approx(predict_one(*point, load_model(source)), rel=1e-6)
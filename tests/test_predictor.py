@@ -0,0 +1,19 @@
+import io
+import pandas as pd
+import pytest
+from features import INPUT_COLUMNS
+from model_registry import load_model
+from predictor import iter_predict_csv, predict_frame
+
+
+@pytest.mark.parametrize("path", ["fuel_model.npz", "fuel_model_forest.npz", "fuel_model.sav"])
+def test_unknown_categories_are_rejected(path):
+    model = load_model(path)
+    frame = pd.DataFrame([["Mid-size", 2, 4, "AS10", 6, "X"], ["Compact", 2, 4, "Automatic", 6, "D"]],
+                         columns=INPUT_COLUMNS)
+    assert len(predict_frame(frame, model)) == 2
+
+    for column, typo in [("Vehicle Class", "Bogus"), ("Transmission", "ZZ"), ("Fuel Type", "Q")]:
+        bad = frame.assign(**{column: typo})
+        with pytest.raises(ValueError, match=f"Unknown {column}"):
+            list(iter_predict_csv(io.StringIO(bad.to_csv(index=False)), model))
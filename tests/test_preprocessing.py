@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+from preprocessing import co2_band, impute_co2_rating, normalize_transmission
+
+
+def notebook_band(fuel):
+    # the notebook's "CO2 Rating" cell, verbatim
+    if 20 <= fuel:
+        return 1
+    elif 16.0 <= fuel < 20.0:
+        return 2
+    elif 14.0 <= fuel < 16.0:
+        return 3
+    elif 12.0 <= fuel < 14.0:
+        return 4
+    elif 10.0 <= fuel < 12.0:
+        return 5
+    elif 8.0 <= fuel < 10.0:
+        return 6
+    elif 7.0 <= fuel < 8.0:
+        return 7
+    elif 6.0 <= fuel < 7.0:
+        return 8
+    elif 5.0 <= fuel < 6.0:
+        return 9
+    elif fuel < 5.0:
+        return 10
+
+
+def test_co2_band_matches_notebook_ladder():
+    edges = [5.0, 6.0, 7.0, 8.0, 10.0, 12.0, 14.0, 16.0, 20.0]
+    fuel = np.concatenate([
+        edges, np.nextafter(edges, -np.inf), np.nextafter(edges, np.inf),
+        np.random.default_rng(0).uniform(0, 30, 1_000), [0.0, -1.0, 1e6],
+    ])
+    np.testing.assert_array_equal(co2_band(fuel), [notebook_band(f) for f in fuel])
+
+
+def test_impute_co2_rating_only_fills_missing():
+    fuel = np.array([4.0, 9.0, 25.0, np.nan])
+    co2 = np.array([np.nan, 0.0, 3.0, np.nan])
+    # the ladder has no branch for a missing consumption; it falls through to the best band
+    np.testing.assert_array_equal(impute_co2_rating(fuel, co2), [10, 6, 3, 10])
+
+
+@pytest.mark.parametrize("raw, code", [("AS8", "AS"), ("AV", "AV"), ("am7", "AM"), ("M6", "M"), ("A10", "A")])
+def test_normalize_transmission(raw, code):
+    normalized, missing = normalize_transmission([raw, None])
+    assert normalized == code
+    assert pd.isna(missing)
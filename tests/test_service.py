@@ -0,0 +1,111 @@
+import asyncio
+import io
+import pandas as pd
+import pytest
+from model_registry import load_model
+from predictor import known_categories
+from service import (MAX_BULK_ROWS, InvalidVehicle, MicroBatcher, PayloadTooLarge, _json_body,
+                     check_csv_frame, parse_vehicle)
+
+VEHICLE = {"Vehicle Class": "Compact", "Engine Size": 2.0, "Cylinders": 4,
+           "Transmission": "A", "CO2 Rating": 6, "Fuel Type": "X"}
+CSV = "Vehicle Class,Engine Size,Cylinders,Transmission,CO2 Rating,Fuel Type\n"
+
+
+@pytest.fixture(scope="module")
+def model():
+    return load_model()
+
+
+def test_parse_vehicle_accepts_a_valid_row(model):
+    assert parse_vehicle(VEHICLE, known_categories(model)) == ["Compact", 2.0, 4, "A", 6, "X"]
+
+
+@pytest.mark.parametrize("field, value, message", [
+    ("Engine Size", float("nan"), "finite"),
+    ("CO2 Rating", float("inf"), "finite"),
+    ("Cylinders", True, "number"),
+    ("Engine Size", "2.0", "number"),
+    ("Fuel Type", "Q", "Unknown Fuel Type"),
+    ("Vehicle Class", "Hovercraft", "Unknown Vehicle Class"),
+    ("Transmission", 5, "string"),
+])
+def test_parse_vehicle_rejects_bad_fields(model, field, value, message):
+    with pytest.raises(InvalidVehicle, match=message):
+        parse_vehicle({**VEHICLE, field: value}, known_categories(model))
+
+
+@pytest.mark.parametrize("body", [["Compact"], "Compact", None])
+def test_parse_vehicle_rejects_non_objects(model, body):
+    with pytest.raises(InvalidVehicle, match="JSON object"):
+        parse_vehicle(body, known_categories(model))
+
+
+def test_check_csv_frame(model):
+    check_csv_frame(pd.read_csv(io.StringIO(CSV + "Compact,2,4,A,6,X\n")), model)
+
+    cases = {
+        "Missing column": pd.read_csv(io.StringIO("Vehicle Class,Engine Size\nCompact,2\n")),
+        "no vehicles": pd.read_csv(io.StringIO(CSV)),
+        "must be numeric": pd.read_csv(io.StringIO(CSV + "Compact,two,4,A,6,X\n")),
+        "finite": pd.read_csv(io.StringIO(CSV + "Compact,inf,4,A,6,X\n")),
+        "Unknown Fuel Type": pd.read_csv(io.StringIO(CSV + "Compact,2,4,A,6,Q\n")),
+        "at most": pd.DataFrame([VEHICLE] * (MAX_BULK_ROWS + 1)),
+    }
+    for message, frame in cases.items():
+        with pytest.raises(InvalidVehicle, match=message):
+            check_csv_frame(frame, model)
+
+
+class FakeRequest:
+    def __init__(self, body, declared=True):
+        self.headers = {"content-length": str(len(body))} if declared else {}
+        self._body = body
+
+    async def stream(self):
+        for start in range(0, len(self._body), 4):
+            yield self._body[start:start + 4]
+
+
+@pytest.mark.parametrize("declared", [True, False])
+def test_oversized_json_body_is_413(declared):
+    body = b'{"vehicles": []}'
+    assert asyncio.run(_json_body(FakeRequest(body, declared), len(body))) == {"vehicles": []}
+    with pytest.raises(PayloadTooLarge) as info:
+        asyncio.run(_json_body(FakeRequest(body, declared), len(body) - 1))
+    assert info.value.status == 413
+
+
+def _run_batcher(predict_batch, rows, **kwargs):
+    async def go():
+        batcher = MicroBatcher(predict_batch, **kwargs)
+        await batcher.start()
+        try:
+            return batcher, await asyncio.gather(*(batcher.submit(r) for r in rows), return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    return asyncio.run(go())
+
+
+def test_micro_batcher_coalesces_concurrent_submits():
+    sizes = []
+
+    def predict_batch(rows):
+        sizes.append(len(rows))
+        return [r * 2 for r in rows]
+
+    batcher, results = _run_batcher(predict_batch, range(10), max_batch=4, max_wait_ms=50)
+    assert results == [r * 2.0 for r in range(10)]
+    assert sizes == [4, 4, 2]
+    assert (batcher.batches, batcher.rows) == (3, 10)
+
+
+def test_micro_batcher_error_reaches_every_waiter():
+    def predict_batch(rows):
+        raise RuntimeError("model exploded")
+
+    batcher, results = _run_batcher(predict_batch, range(5), max_batch=8, max_wait_ms=20)
+    assert len(results) == 5
+    assert all(isinstance(r, RuntimeError) and str(r) == "model exploded" for r in results)
+    assert batcher.batches == 0
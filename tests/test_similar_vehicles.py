@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from preprocessing import fuel_code
+from similar_vehicles import (CATEGORY_COLUMN, CONSUMPTION_COLUMN, CYLINDERS_COLUMN, ENGINE_COLUMN, FUEL_COLUMN,
+                              MISMATCH_PENALTY, TRANSMISSION_COLUMN, SimilarityIndex, _codes, transmission_family)
+
+
+def _brute_force(df, category, engine, cylinders, transmission, fuel, index, k):
+    # the same metric evaluated against every row
+    x = (np.asarray([engine, cylinders], dtype=np.float64) - index.mean) / index.scale
+    rows = index.rows
+    points = (np.column_stack([np.asarray(df[ENGINE_COLUMN], dtype=np.float64)[rows],
+                               np.asarray(df[CYLINDERS_COLUMN], dtype=np.float64)[rows]]) - index.mean) / index.scale
+    category_labels, category_codes = _codes(df[CATEGORY_COLUMN])
+    transmission_labels, transmission_codes = _codes(df[TRANSMISSION_COLUMN], transmission_family)
+    fuel_labels, fuel_codes = _codes(df[FUEL_COLUMN], fuel_code)
+    penalty = MISMATCH_PENALTY * (
+        (transmission_labels[transmission_codes[rows]] != transmission_family(transmission)).astype(float)
+        + (fuel_labels[fuel_codes[rows]] != fuel_code(fuel))
+    )
+    distance = np.sqrt(((points - x) ** 2).sum(axis=1)) + penalty
+    # an unknown category is compared with every row
+    if category in set(category_labels):
+        distance[category_labels[category_codes[rows]] != category] = np.inf
+    return np.sort(distance)[:k]
+
+
+@pytest.fixture(scope="module")
+def frame():
+    # two categories, the dataset's mix of codes and words, and one row without an engine size
+    rng = np.random.default_rng(0)
+    rows = 60
+    df = pd.DataFrame({
+        "Brand Name": [f"Brand {i % 7}" for i in range(rows)],
+        "Model": [f"Model {i}" for i in range(rows)],
+        CATEGORY_COLUMN: rng.choice(["Compact", "SUV: Small"], rows),
+        ENGINE_COLUMN: np.round(rng.uniform(1.0, 5.0, rows), 1),
+        CYLINDERS_COLUMN: rng.choice([3, 4, 6, 8], rows),
+        TRANSMISSION_COLUMN: rng.choice(["AS8", "Automatic", "M6", "Manual", "AV"], rows),
+        FUEL_COLUMN: rng.choice(["X", "Petrol", "Z", "D", "Diesel"], rows),
+        CONSUMPTION_COLUMN: np.round(rng.uniform(5, 15, rows), 1),
+    })
+    df.loc[5, ENGINE_COLUMN] = np.nan
+    return df
+
+
+@pytest.fixture(scope="module")
+def index(frame):
+    return SimilarityIndex(frame)
+
+
+@pytest.mark.parametrize("config, k", [
+    # an exact partition: automatic, regular petrol
+    (("Compact", 2.0, 4, "A", "X"), 3),
+    # nothing runs on ethanol (E), so every candidate pays at least one mismatch penalty
+    (("SUV: Small", 3.0, 6, "AM", "E"), 5),
+    # a category the data does not have is matched against every partition
+    (("Minivan", 2.5, 4, "M", "D"), 5),
+    # k larger than any single partition spills over into the mismatched ones
+    (("Compact", 4.0, 8, "AS", "Z"), 25),
+])
+def test_query_matches_brute_force(frame, index, config, k):
+    matches = index.query(*config, k=k)
+    np.testing.assert_allclose([d for _, d in matches], _brute_force(frame, *config, index, k), atol=1e-12)
+    assert len({row for row, _ in matches}) == len(matches) == k
+    assert 5 not in {row for row, _ in matches}
+
+
+def test_k_larger_than_a_partition_is_exercised(index):
+    assert max(len(positions) for _, positions in index.partitions.values()) < 25
+
+
+def test_mismatch_costs_the_penalty(frame, index):
+    row = frame.iloc[0]
+    config = [row[c] for c in (CATEGORY_COLUMN, ENGINE_COLUMN, CYLINDERS_COLUMN, TRANSMISSION_COLUMN, FUEL_COLUMN)]
+    assert index.query(*config, k=1)[0][1] == 0.0
+    # the same vehicle on a fuel nothing in the data uses is one penalty away
+    assert index.query(*config[:4], "E", k=1)[0][1] == pytest.approx(MISMATCH_PENALTY)
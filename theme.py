@@ -0,0 +1,96 @@
+import os
+import sys
+import hashlib
+import argparse
+import functools
+from asset_cache import BACKGROUND_TEXTURE_URL, CACHE_DIR, cached_bytes, cached_font_css, data_uri
+
+# ----------------------------------
+# THEME STYLESHEET
+# ----------------------------------
+# assets/theme.css is rendered once per process into static/theme/theme.<hash>.css, next to
+# the background image and font files it now references by URL. Every file is named by its
+# content hash, so the browser can keep it for good: a changed theme or asset gets a new
+# name. Streamlit serves static/ at app/static/ (server.enableStaticServing in
+# .streamlit/config.toml), and a rerun only re-emits a one-line @import of the stylesheet.
+# With static serving off the rendered CSS is inlined instead, background image included once.
+#   python theme.py    # publish the stylesheet and print its URL and size
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_PATH = os.path.join(BASE_DIR, "assets", "theme.css")
+STATIC_DIR = os.path.join(BASE_DIR, "static", "theme")
+STATIC_URL = "app/static/theme"
+
+BACKGROUND_IMAGE_CSS = """background-image: url('{url}'), linear-gradient(180deg, rgba(0,0,0,0.88) 0%, rgba(8,8,10,0.92) 100%) !important;
+    background-size: cover, cover !important;
+    background-position: center, center !important;
+    background-repeat: no-repeat, no-repeat !important;
+    background-attachment: fixed, fixed !important;
+    background-blend-mode: overlay !important;"""
+
+BACKGROUND_FALLBACK_CSS = "background: linear-gradient(180deg, #000000 0%, #0a0a0a 50%, #050505 100%), radial-gradient(circle at 20% 30%, rgba(255,255,255,0.015), transparent 25%), radial-gradient(circle at 80% 70%, rgba(255,255,255,0.01), transparent 20%) !important;"
+
+_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/svg+xml": "svg",
+    "font/woff2": "woff2",
+    "font/woff": "woff",
+    "text/css": "css",
+}
+
+
+def _publish(name, content):
+    path = os.path.join(STATIC_DIR, name)
+    if not os.path.exists(path):
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    return name
+
+
+def static_file(content, mime):
+    # relative to the stylesheet, which sits in the same directory
+    return _publish(f"{hashlib.sha256(content).hexdigest()[:16]}.{_EXTENSIONS.get(mime, 'bin')}", content)
+
+
+def render(url_for=data_uri, cache_dir=CACHE_DIR):
+    with open(TEMPLATE_PATH, encoding="utf-8") as f:
+        css = f.read()
+    background = cached_bytes(BACKGROUND_TEXTURE_URL, cache_dir)
+    background_css = BACKGROUND_IMAGE_CSS.format(url=url_for(*background)) if background else BACKGROUND_FALLBACK_CSS
+    return (css.replace("/*{font_face}*/", cached_font_css(cache_dir=cache_dir, url_for=url_for))
+               .replace("/*{background}*/", background_css))
+
+
+@functools.lru_cache(maxsize=None)
+def publish_stylesheet(cache_dir=CACHE_DIR):
+    css = render(static_file, cache_dir).encode("utf-8")
+    name = _publish(f"theme.{hashlib.sha256(css).hexdigest()[:12]}.css", css)
+    return f"{STATIC_URL}/{name}", len(css)
+
+
+@functools.lru_cache(maxsize=None)
+def theme_markup(static_serving=True, cache_dir=CACHE_DIR):
+    # what app.py emits on every rerun
+    if static_serving:
+        try:
+            url, _ = publish_stylesheet(cache_dir)
+            return f'<style>@import url("{url}");</style>'
+        except OSError:
+            pass  # read-only checkout: inline it instead
+    return f"<style>\n{render(data_uri, cache_dir)}\n</style>"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish the content-hashed theme stylesheet under static/.")
+    parser.parse_args(argv)
+    url, size = publish_stylesheet()
+    print(f"{url} ({size} bytes); app.py emits {len(theme_markup().encode('utf-8'))} bytes per rerun")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
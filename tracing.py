@@ -0,0 +1,276 @@
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+import argparse
+import functools
+import threading
+
+# ----------------------------------
+# PER-SECTION TIMING SPANS
+# ----------------------------------
+# app.py marks where each page section starts (`tracer.section(...)`) and wraps the few
+# expensive calls inside them (`tracer.span(...)`). Each rerun's spans are folded into
+# per-session totals (kept in the session's state) and process-wide histograms, which are
+# written as OpenMetrics text for a node-exporter textfile collector and logged as one JSON
+# line per rerun. A page section that is a Streamlit fragment is wrapped in
+# `tracer.fragment(...)`: when only that fragment reruns it is traced as a rerun of its own
+# and lands in the `rerun/<fragment>` histogram instead of `rerun`.
+# Off unless FUELSENSE_TRACING=1; disabled calls return immediately.
+#   FUELSENSE_TRACING=1 streamlit run app.py      # then: cat .cache/metrics.prom
+#   python tracing.py --overhead                  # cost of a disabled / enabled span
+
+TRACING_ENABLED = os.environ.get("FUELSENSE_TRACING", "").lower() in ("1", "true", "yes", "on")
+METRICS_PATH = os.environ.get("FUELSENSE_METRICS_FILE", os.path.join(".cache", "metrics.prom"))
+SESSION_KEY = "_trace"
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger("fuelsense.trace")
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("rerun", "name", "t0")
+
+    def __init__(self, rerun, name):
+        self.rerun, self.name = rerun, name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.rerun.add(self.name, time.perf_counter() - self.t0)
+        return False
+
+
+class _Rerun:
+    def __init__(self, session, fragment=None):
+        self.session = session
+        self.fragment = fragment
+        self.started = time.perf_counter()
+        self.spans = {}
+        self.section = None
+        self.section_t0 = None
+
+    def add(self, name, seconds):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count, self.sum, self.max = 0, 0.0, 0.0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+
+class Tracer:
+    def __init__(self, enabled=TRACING_ENABLED, metrics_path=METRICS_PATH):
+        self.enabled = enabled
+        self.metrics_path = metrics_path
+        self._local = threading.local()  # Streamlit runs each session's script on its own thread
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._reruns = 0
+        self._sessions = set()
+
+    # ---- recording (called from the script) ----
+
+    def begin_rerun(self, session):
+        if not self.enabled:
+            return
+        # a rerun cut short by st.stop()/a new interaction never reached end_rerun: drop it
+        self._local.rerun = _Rerun(session)
+
+    def fragment(self, name, session):
+        # decorator for a fragment's function: a section of the full run, a rerun when run alone
+        def decorate(fn):
+            @functools.wraps(fn)
+            def run(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                if getattr(self._local, "rerun", None) is not None:
+                    self.section(name)
+                    return fn(*args, **kwargs)
+                self._local.rerun = _Rerun(session, fragment=name)
+                try:
+                    self.section(name)
+                    result = fn(*args, **kwargs)
+                    self.end_rerun()
+                    return result
+                finally:
+                    # an exception or a Streamlit rerun/stop must not leave this thread "inside a full run"
+                    self._local.rerun = None
+
+            return run
+
+        return decorate
+
+    def section(self, name):
+        # ends the current page section and starts `name`; sections tile the script top to bottom
+        rerun = getattr(self._local, "rerun", None) if self.enabled else None
+        if rerun is None:
+            return
+        now = time.perf_counter()
+        if rerun.section is not None:
+            rerun.add(rerun.section, now - rerun.section_t0)
+        rerun.section, rerun.section_t0 = name, now
+
+    def span(self, name):
+        rerun = getattr(self._local, "rerun", None) if self.enabled else None
+        if rerun is None:
+            return _NO_SPAN
+        return _Span(rerun, f"{rerun.section}/{name}" if rerun.section else name)
+
+    def end_rerun(self):
+        rerun = getattr(self._local, "rerun", None) if self.enabled else None
+        if rerun is None:
+            return None
+        self.section(None)
+        self._local.rerun = None
+        total = time.perf_counter() - rerun.started
+
+        session = rerun.session
+        trace = session.get(SESSION_KEY) or {"id": uuid.uuid4().hex[:12], "reruns": 0, "spans": {}}
+        trace["reruns"] += 1
+        for name, seconds in rerun.spans.items():
+            count, total_s, max_s = trace["spans"].get(name, (0, 0.0, 0.0))
+            trace["spans"][name] = (count + 1, total_s + seconds, max(max_s, seconds))
+        session[SESSION_KEY] = trace
+
+        with self._lock:
+            self._reruns += 1
+            self._sessions.add(trace["id"])
+            self._histograms.setdefault(f"rerun/{rerun.fragment}" if rerun.fragment else "rerun", _Histogram()).observe(total)
+            for name, seconds in rerun.spans.items():
+                self._histograms.setdefault(name, _Histogram()).observe(seconds)
+            text = self.openmetrics()
+
+        record = {
+            "event": "fragment_rerun" if rerun.fragment else "rerun",
+            "fragment": rerun.fragment,
+            "session": trace["id"],
+            "rerun": trace["reruns"],
+            "total_ms": round(total * 1000, 3),
+            "spans_ms": {k: round(v * 1000, 3) for k, v in rerun.spans.items()},
+            "session_ms": {k: round(v[1] * 1000, 3) for k, v in trace["spans"].items()},
+        }
+        logger.info(json.dumps(record))
+        self._write_metrics(text)
+        return record
+
+    # ---- exposition ----
+
+    def openmetrics(self):
+        lines = [
+            "# TYPE fuelsense_reruns counter",
+            "# HELP fuelsense_reruns Completed script and fragment reruns.",
+            f"fuelsense_reruns_total {self._reruns}",
+            "# TYPE fuelsense_sessions gauge",
+            "# HELP fuelsense_sessions Sessions seen by this process.",
+            f"fuelsense_sessions {len(self._sessions)}",
+            "# TYPE fuelsense_span_seconds histogram",
+            "# HELP fuelsense_span_seconds Time spent per page section or span in one rerun.",
+        ]
+        for name in sorted(self._histograms):
+            h = self._histograms[name]
+            cumulative = 0
+            for bound, n in zip(BUCKETS, h.counts):
+                cumulative += n
+                lines.append(f'fuelsense_span_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'fuelsense_span_seconds_bucket{{span="{name}",le="+Inf"}} {h.count}')
+            lines.append(f'fuelsense_span_seconds_count{{span="{name}"}} {h.count}')
+            lines.append(f'fuelsense_span_seconds_sum{{span="{name}"}} {h.sum:.6f}')
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "reruns": self._reruns,
+                "sessions": len(self._sessions),
+                "spans": {
+                    name: {"count": h.count, "sum_ms": round(h.sum * 1000, 3), "max_ms": round(h.max * 1000, 3)}
+                    for name, h in sorted(self._histograms.items())
+                },
+            }
+
+    def _write_metrics(self, text):
+        if not self.metrics_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.metrics_path) or ".", exist_ok=True)
+            tmp = f"{self.metrics_path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, self.metrics_path)
+        except OSError as e:
+            logger.warning("could not write %s: %s", self.metrics_path, e)
+
+
+tracer = Tracer()
+if tracer.enabled and not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _overhead(n=200_000):
+    results = {}
+    for label, enabled in (("disabled", False), ("enabled", True)):
+        t = Tracer(enabled=enabled, metrics_path=None)
+        t.begin_rerun({})
+        t0 = time.perf_counter()
+        for _ in range(n):
+            with t.span("x"):
+                pass
+        results[label] = (time.perf_counter() - t0) / n * 1e9
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-section timing spans for app.py.")
+    parser.add_argument("--overhead", action="store_true", help="measure the cost of one span")
+    args = parser.parse_args(argv)
+
+    if args.overhead:
+        for label, ns in _overhead().items():
+            print(f"span {label:<9} {ns:7.0f} ns")
+        return 0
+    if os.path.exists(METRICS_PATH):
+        with open(METRICS_PATH, encoding="utf-8") as f:
+            sys.stdout.write(f.read())
+        return 0
+    print(f"No metrics yet at {METRICS_PATH}; run the app with FUELSENSE_TRACING=1", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+import hashlib
+import argparse
+import datetime
+import pickle as pk
+from features import INPUT_COLUMNS, FeatureEncoder
+from preprocessing import impute_co2_rating
+from artifact_io import write_artifact
+from linear_kernel import KERNEL_PATH, export_kernel
+from tree_kernel import TREE_KERNEL_PATH, FOREST_KERNEL_PATH, export_tree_kernel
+
+# ----------------------------------
+# END-TO-END TRAINING PIPELINE
+# ----------------------------------
+# Reproduces the notebook's cleaning and models as one sklearn Pipeline
+# (encode -> scale -> regress) and saves it as a single versioned artifact.
+#   python training.py [--data data/vehicles_data_2022.csv] [--out fuel_model.sav]
+#   python training.py --model forest    # fuel_model_forest.sav + fuel_model_forest.npz
+
+MODEL_PATH = "fuel_model.sav"
+ARTIFACT_FORMAT = 1
+TARGET = "Fuel Consumption"
+TEST_SIZE = 0.25
+RANDOM_STATE = 51
+
+RENAME = {
+    'Vehicle Category': 'Vehicle Class',
+    'Engine Capacity (Liters)': 'Engine Size',
+    'Number of Cylinders': 'Cylinders',
+    'Transmission': 'Transmission',
+    'TYPE OF FUEL': 'Fuel Type',
+    'Combined Fuel Efficiency (L/100 km)': 'Fuel Consumption',
+    'Carbon Dioxide Rating': 'CO2 Rating',
+}
+
+SOURCE = {model: source for source, model in RENAME.items()}
+
+# the notebook's three regressors: artifact path, served kernel path and exporter
+MODELS = {
+    "linear": (MODEL_PATH, KERNEL_PATH, export_kernel),
+    "tree": ("fuel_model_tree.sav", TREE_KERNEL_PATH, export_tree_kernel),
+    "forest": ("fuel_model_forest.sav", FOREST_KERNEL_PATH, export_tree_kernel),
+}
+
+# notebook settings; the forest uses rf_best_params.json instead once tuning.py has written it
+TREE_PARAMS = {"max_depth": 4}
+FOREST_PARAMS = {"n_estimators": 60, "min_samples_split": 4, "max_features": "sqrt", "max_depth": 10,
+                 "criterion": "squared_error"}
+
+
+def clean_source(data, fuel_fill=None):
+    # notebook cleaning on the source column names; streaming callers pass the global
+    # fuel-type mode as fuel_fill since a single chunk's mode is not the dataset's
+    fuel, co2, target = SOURCE["Fuel Type"], SOURCE["CO2 Rating"], SOURCE[TARGET]
+    df = data.astype({fuel: object})
+    if fuel_fill is None:
+        fuel_fill = df[fuel].mode()[0]
+    df[fuel] = df[fuel].fillna(fuel_fill)
+    df[co2] = impute_co2_rating(df[target], df[co2])
+    return df.dropna(subset=[target])
+
+
+def prepare_frame(data):
+    df = clean_source(data).rename(columns=RENAME)[INPUT_COLUMNS + [TARGET]]
+    return df.astype({"Vehicle Class": object, "Transmission": object, "Fuel Type": object})
+
+
+def build_regressor(model="linear"):
+    if model == "linear":
+        from sklearn.linear_model import LinearRegression
+
+        return LinearRegression()
+    if model == "tree":
+        from sklearn.tree import DecisionTreeRegressor
+
+        return DecisionTreeRegressor(random_state=RANDOM_STATE, **TREE_PARAMS)
+    if model == "forest":
+        from sklearn.ensemble import RandomForestRegressor
+        from tuning import BEST_PARAMS_PATH, load_best_params
+
+        params = load_best_params() if os.path.exists(BEST_PARAMS_PATH) else FOREST_PARAMS
+        return RandomForestRegressor(random_state=RANDOM_STATE, **params)
+    raise ValueError(f"unknown model {model!r}; expected one of {', '.join(MODELS)}")
+
+
+def build_pipeline(model="linear"):
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    return Pipeline([
+        ("encode", FeatureEncoder()),
+        ("scale", StandardScaler()),
+        ("model", build_regressor(model)),
+    ])
+
+
+def split(df):
+    from sklearn.model_selection import train_test_split
+
+    return train_test_split(df[INPUT_COLUMNS], df[TARGET], test_size=TEST_SIZE, random_state=RANDOM_STATE)
+
+
+def frame_fingerprint(df):
+    import pandas as pd
+
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).values.tobytes()).hexdigest()
+
+
+def train(data, pipeline=None):
+    df = prepare_frame(data)
+    xtrain, xtest, ytrain, ytest = split(df)
+
+    pipeline = pipeline or build_pipeline()
+    t0 = time.perf_counter()
+    pipeline.fit(xtrain, ytrain)
+    fit_seconds = time.perf_counter() - t0
+
+    metrics = {
+        "train_r2": float(pipeline.score(xtrain, ytrain)),
+        "test_r2": float(pipeline.score(xtest, ytest)),
+        "train_rows": len(xtrain),
+        "test_rows": len(xtest),
+        "fit_seconds": round(fit_seconds, 4),
+    }
+    return pipeline, metrics, frame_fingerprint(df)
+
+
+def make_artifact(pipeline, metrics, data_sha256):
+    import sklearn
+
+    created = datetime.datetime.now(datetime.timezone.utc)
+    return {
+        "format": ARTIFACT_FORMAT,
+        "version": f"{created:%Y%m%d%H%M%S}-{data_sha256[:8]}",
+        "created": created.isoformat(timespec="seconds"),
+        "pipeline": pipeline,
+        "input_columns": list(INPUT_COLUMNS),
+        "feature_names": list(pipeline.named_steps["encode"].get_feature_names_out()),
+        "metrics": metrics,
+        "data_sha256": data_sha256,
+        "sklearn_version": sklearn.__version__,
+    }
+
+
+def save_artifact(artifact, path=MODEL_PATH):
+    # write-then-rename so the app's registry never reads a half-written file
+    write_artifact(path, pk.dumps(artifact, protocol=pk.HIGHEST_PROTOCOL))
+    return path
+
+
+def main(argv=None):
+    from vehicle_data import DATA_PATH, load_vehicle_data
+
+    parser = argparse.ArgumentParser(description="Train the fuel consumption pipeline and save it as one artifact.")
+    parser.add_argument("--data", default=DATA_PATH, help="vehicle CSV/XLSX source")
+    parser.add_argument("--model", choices=list(MODELS), default="linear")
+    parser.add_argument("--out", help="default: fuel_model.sav, or fuel_model_<model>.sav")
+    parser.add_argument("--kernel-out", help="NumPy-only copy the app serves from (default: the model's .npz)")
+    args = parser.parse_args(argv)
+    default_out, default_kernel, export = MODELS[args.model]
+    out, kernel_out = args.out or default_out, args.kernel_out or default_kernel
+
+    t0 = time.perf_counter()
+    pipeline, metrics, data_sha = train(load_vehicle_data(args.data), build_pipeline(args.model))
+    artifact = make_artifact(pipeline, metrics, data_sha)
+    save_artifact(artifact, out)
+    export(artifact, kernel_out)
+
+    print(f"Saved {out} + {kernel_out} (version {artifact['version']}) in {time.perf_counter() - t0:.2f}s")
+    print(f"  train R² = {metrics['train_r2']:.4f}   test R² = {metrics['test_r2']:.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+import io
+import os
+import sys
+import argparse
+import numpy as np
+from features import FeatureEncoder, TRANSMISSION_POS, VEHICLE_CLASS_POS
+from preprocessing import normalize_transmission_code
+from artifact_io import write_artifact
+from linear_kernel import KERNEL_FORMAT
+
+# ----------------------------------
+# FLATTENED TREE-ENSEMBLE INFERENCE
+# ----------------------------------
+# A DecisionTree or RandomForest from the training pipeline, exported as one node table
+# shared by all trees. Nodes are renumbered so each split's children sit side by side
+# (right = left + 1), and leaves point at themselves with an infinite threshold. Every
+# tree can then be walked in lockstep for a whole batch, a fixed `depth` number of times:
+#   node = left[node] + (x[feature[node]] > threshold[node])
+# Encoded rows are standardized and rounded to float32 before the walk, exactly as the
+# sklearn pipeline does, so values sitting on a threshold branch the same way; thresholds
+# are rounded down to float32 too, which keeps every comparison in single precision.
+#   python tree_kernel.py --model fuel_model_forest.sav               # export the .npz
+#   python tree_kernel.py --model fuel_model_forest.sav --benchmark   # against sklearn
+
+TREE_KERNEL_PATH = "fuel_model_tree.npz"
+FOREST_KERNEL_PATH = "fuel_model_forest.npz"
+KIND = "trees"
+
+BLOCK_ROWS = 1024  # rows walked together; keeps the (trees x rows) node array in cache
+
+
+class TreeKernel:
+
+    def __init__(self, feature, threshold, left, value, roots, depth, mean, scale, fuel_types, version=""):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.int32)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.depth = int(depth)
+        self.mean = np.ascontiguousarray(mean, dtype=np.float64)
+        self.scale = np.ascontiguousarray(scale, dtype=np.float64)
+        self.fuel_types = [str(f) for f in fuel_types]
+        self.version = version
+        self._encoder = None
+        self._fuel_pos = {f: 5 + i for i, f in enumerate(sorted(self.fuel_types))}
+        self._n_features = 5 + len(self.fuel_types)
+        # leaf values pre-divided by the tree count, so the forest average is a sum
+        self._leaf_share = self.value / len(self.roots)
+        # for a float32 x:  x > t  <=>  x > (largest float32 <= t)
+        threshold32 = self.threshold.astype(np.float32)
+        above = threshold32.astype(np.float64) > self.threshold
+        threshold32[above] = np.nextafter(threshold32[above], np.float32(-np.inf))
+        self._threshold32 = threshold32
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def encoder(self):
+        if self._encoder is None:
+            import pandas as pd
+
+            self._encoder = FeatureEncoder().fit(pd.DataFrame({"Fuel Type": self.fuel_types}))
+        return self._encoder
+
+    def _walk(self, X):
+        # feature-major copy of the block, so x[feature[node]] for row r is flat[feature * n + r]
+        n = len(X)
+        flat = ((X - self.mean) / self.scale).astype(np.float32).T.ravel()
+        column = self.feature * np.int32(n)
+        rows = np.arange(n, dtype=np.int32)[None, :]
+        node = np.repeat(self.roots[:, None], n, axis=1)
+        for _ in range(self.depth):
+            right = flat.take(column.take(node) + rows) > self._threshold32.take(node)
+            node = self.left.take(node)
+            node += right
+        return self._leaf_share.take(node).sum(axis=0)
+
+    def _walk_one(self, x):
+        # one row: the node array is just one entry per tree
+        x = ((x - self.mean) / self.scale).astype(np.float32)
+        node = self.roots
+        for _ in range(self.depth):
+            node = self.left[node] + (x[self.feature[node]] > self._threshold32[node])
+        return float(self._leaf_share[node].sum())
+
+    def predict_encoded(self, X):
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        if len(X) <= BLOCK_ROWS:
+            return self._walk(X)
+        return np.concatenate([self._walk(X[i:i + BLOCK_ROWS]) for i in range(0, len(X), BLOCK_ROWS)])
+
+    def predict(self, frame):
+        return self.predict_encoded(self.encoder.transform(frame))
+
+    def encode_rows(self, rows):
+        # FeatureEncoder's encoding with dict lookups, for INPUT_COLUMNS-ordered plain rows
+        X = np.zeros((len(rows), self._n_features), dtype=np.float64)
+        for i, (vehicle_class, engine, cylinders, transmission, co2, fuel_type) in enumerate(rows):
+            X[i, :5] = (
+                float(engine), float(cylinders), float(co2),
+                TRANSMISSION_POS.get(normalize_transmission_code(transmission), -1.0),
+                VEHICLE_CLASS_POS.get(vehicle_class, -1.0),
+            )
+            pos = self._fuel_pos.get(fuel_type)
+            if pos is not None:
+                X[i, pos] = 1.0
+        return X
+
+    def predict_rows(self, rows):
+        return self.predict_encoded(self.encode_rows(rows))
+
+    def predict_row(self, vehicle_class, engine, cylinders, transmission, co2, fuel_type):
+        return self._walk_one(self.encode_rows([(vehicle_class, engine, cylinders, transmission, co2, fuel_type)])[0])
+
+    def to_bytes(self):
+        buf = io.BytesIO()
+        np.savez(
+            buf,
+            format=np.int64(KERNEL_FORMAT),
+            kind=np.asarray(KIND),
+            feature=self.feature.astype(np.int32),
+            threshold=self.threshold,
+            left=self.left.astype(np.int32),
+            value=self.value,
+            roots=self.roots.astype(np.int32),
+            depth=np.int64(self.depth),
+            mean=self.mean,
+            scale=self.scale,
+            fuel_types=np.asarray(self.fuel_types, dtype=str),
+            version=np.asarray(self.version),
+        )
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, raw):
+        with np.load(io.BytesIO(raw), allow_pickle=False) as z:
+            if int(z["format"]) != KERNEL_FORMAT or str(z["kind"]) != KIND:
+                raise ValueError("not a tree kernel of a supported format")
+            return cls(z["feature"], z["threshold"], z["left"], z["value"], z["roots"], int(z["depth"]),
+                       z["mean"], z["scale"], z["fuel_types"].tolist(), str(z["version"]))
+
+
+def _flatten(tree, nodes):
+    # breadth-first renumbering of one sklearn tree_ into `nodes`; returns its root index
+    children_left, children_right = tree.children_left, tree.children_right
+    root = len(nodes["feature"])
+    order, slot = [0], {0: root}
+    for name in nodes:
+        nodes[name].append(0)
+    depth = {0: 0}
+    max_depth = 0
+    i = 0
+    while i < len(order):
+        src = order[i]
+        dst = slot[src]
+        i += 1
+        nodes["value"][dst] = float(tree.value[src].ravel()[0])
+        if children_left[src] == -1:
+            # leaf: loops back onto itself for the remaining levels of the walk
+            nodes["feature"][dst], nodes["threshold"][dst], nodes["left"][dst] = 0, np.inf, dst
+            continue
+        nodes["feature"][dst] = int(tree.feature[src])
+        nodes["threshold"][dst] = float(tree.threshold[src])
+        nodes["left"][dst] = len(nodes["feature"])
+        for child in (children_left[src], children_right[src]):
+            slot[child] = len(nodes["feature"])
+            depth[child] = depth[src] + 1
+            max_depth = max(max_depth, depth[child])
+            order.append(child)
+            for name in nodes:
+                nodes[name].append(0)
+    return root, max_depth
+
+
+def flatten_pipeline(pipeline, version=""):
+    encoder, scaler, model = (pipeline.named_steps[k] for k in ("encode", "scale", "model"))
+    nodes = {"feature": [], "threshold": [], "left": [], "value": []}
+    roots, depth = [], 0
+    for estimator in getattr(model, "estimators_", [model]):
+        root, tree_depth = _flatten(estimator.tree_, nodes)
+        roots.append(root)
+        depth = max(depth, tree_depth)
+    return TreeKernel(nodes["feature"], nodes["threshold"], nodes["left"], nodes["value"], roots, depth,
+                      scaler.mean_, scaler.scale_, encoder.fuel_types_, version)
+
+
+def export_tree_kernel(artifact, path=FOREST_KERNEL_PATH):
+    kernel = flatten_pipeline(artifact["pipeline"], artifact.get("version", ""))
+    write_artifact(path, kernel.to_bytes())
+    return kernel
+
+
+def benchmark(artifact, rows=100_000, repeat=10):
+    from benchmark import best_of, rate, sample_frame
+    from model_registry import load_model
+
+    pipeline = artifact["pipeline"]
+    kernel = flatten_pipeline(pipeline)
+    linear = load_model()
+    frame = sample_frame(rows)
+    row = frame.iloc[0].tolist()
+
+    drift = np.max(np.abs(kernel.predict(frame) - pipeline.predict(frame)))
+    results = [
+        ("single row", best_of(lambda: pipeline.predict(frame.iloc[:1]), repeat * 5),
+         best_of(lambda: kernel.predict_row(*row), repeat * 50), best_of(lambda: linear.predict_row(*row), repeat * 50), 1),
+        (f"{rows:,} rows", best_of(lambda: pipeline.predict(frame), 3),
+         best_of(lambda: kernel.predict(frame), 3), best_of(lambda: linear.predict(frame), 3), rows),
+    ]
+    return results, float(drift)
+
+
+def main(argv=None):
+    from benchmark import rate
+    from model_registry import load_artifact
+
+    parser = argparse.ArgumentParser(description="Flatten a trained tree / forest pipeline into a NumPy-only node table.")
+    parser.add_argument("--model", required=True, help="a .sav artifact trained with --model tree or forest")
+    parser.add_argument("--out", help="default: the .sav path with .npz")
+    parser.add_argument("--benchmark", action="store_true")
+    args = parser.parse_args(argv)
+
+    artifact = load_artifact(args.model)
+    out = args.out or f"{os.path.splitext(args.model)[0]}.npz"
+    kernel = export_tree_kernel(artifact, out)
+    print(f"Exported {out} ({os.path.getsize(out)} bytes, {kernel.n_trees} trees, "
+          f"{len(kernel.feature)} nodes, depth {kernel.depth})")
+
+    if args.benchmark:
+        results, drift = benchmark(artifact)
+        print(f"max |kernel - sklearn| = {drift:.2e}")
+        print(f"{'case':<14} {'sklearn':>12} {'tree kernel':>12} {'linear':>12} {'speed-up':>9}")
+        for name, base, fast, linear, rows in results:
+            print(f"{name:<14} {rate(base, rows):>12} {rate(fast, rows):>12} {rate(linear, rows):>12} {base / fast:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import numpy as np
+from training import prepare_frame, split, frame_fingerprint
+
+# ----------------------------------
+# RANDOM FOREST HYPERPARAMETER SEARCH
+# ----------------------------------
+# Successive halving over the notebook's random_grid with n_estimators as the budget:
+# every candidate starts with a few trees, the best third survive each rung and their
+# forests are grown with warm_start instead of refitted; the search stops once a single
+# candidate is left. The encode+scale step is fitted once per CV fold and reused by
+# every candidate. The winner is written to BEST_PARAMS_PATH.
+#   python tuning.py               # search and persist
+#   python tuning.py --benchmark   # compare against the notebook's RandomizedSearchCV
+
+BEST_PARAMS_PATH = "rf_best_params.json"
+
+# notebook grid (n_estimators is the halving budget instead of a sampled parameter)
+RANDOM_GRID = {
+    'n_estimators': [10, 20, 30, 40, 50, 60, 70, 80, 90, 100],
+    'max_features': ['sqrt', 'log2'],
+    'max_depth': [6, 7, 8, 9, 10, 11, 12, 13, 14, 15],
+    'criterion': ["squared_error", "poisson"],
+    'min_samples_split': [2, 3, 4, 5, 6],
+}
+
+CV_FOLDS = 5
+RANDOM_STATE = 42
+
+
+def fold_cache(xtrain, ytrain, n_splits=CV_FOLDS):
+    # fit the preprocessing once per fold; every candidate reuses these arrays
+    from sklearn.base import clone
+    from sklearn.model_selection import KFold
+    from training import build_pipeline
+
+    preprocess = build_pipeline()[:-1]
+    y = np.asarray(ytrain, dtype=np.float64)
+    folds = []
+    for train_idx, val_idx in KFold(n_splits=n_splits).split(xtrain):
+        prep = clone(preprocess)
+        folds.append((
+            prep.fit_transform(xtrain.iloc[train_idx]), y[train_idx],
+            prep.transform(xtrain.iloc[val_idx]), y[val_idx],
+        ))
+    return folds
+
+
+def _sample_candidates(n_candidates, random_state):
+    from sklearn.model_selection import ParameterSampler
+
+    grid = {k: v for k, v in RANDOM_GRID.items() if k != "n_estimators"}
+    return list(ParameterSampler(grid, n_iter=n_candidates, random_state=random_state))
+
+
+def _rungs(min_trees, max_trees, eta):
+    rungs, r = [], min_trees
+    while r < max_trees:
+        rungs.append(r)
+        r *= eta
+    return rungs + [max_trees]
+
+
+def halving_search(xtrain, ytrain, n_candidates=27, eta=3, min_trees=10, max_trees=100, random_state=RANDOM_STATE, n_jobs=1):
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import r2_score
+
+    folds = fold_cache(xtrain, ytrain)
+    candidates = _sample_candidates(n_candidates, random_state)
+    forests = {
+        i: [RandomForestRegressor(warm_start=True, random_state=random_state, n_jobs=n_jobs, **params) for _ in folds]
+        for i, params in enumerate(candidates)
+    }
+
+    history = []
+    alive = list(forests)
+    for rung, n_trees in enumerate(_rungs(min_trees, max_trees, eta)):
+        scores = {}
+        for i in alive:
+            fold_scores = []
+            for rf, (xt, yt, xv, yv) in zip(forests[i], folds):
+                rf.set_params(n_estimators=n_trees)
+                rf.fit(xt, yt)  # warm_start: only the new trees are built
+                fold_scores.append(r2_score(yv, rf.predict(xv)))
+            scores[i] = float(np.mean(fold_scores))
+        history.append({"rung": rung, "n_estimators": n_trees, "candidates": len(alive), "best_cv_r2": max(scores.values())})
+
+        ranked = sorted(alive, key=scores.get, reverse=True)
+        keep = max(1, len(ranked) // eta)
+        if n_trees >= max_trees or keep == 1:
+            # a lone survivor is not grown further: the rung it won at is its n_estimators
+            best = ranked[0]
+            break
+        for i in ranked[keep:]:
+            del forests[i]
+        alive = ranked[:keep]
+
+    return {"params": {**candidates[best], "n_estimators": n_trees}, "cv_r2": scores[best], "history": history}
+
+
+def randomized_search(xtrain, ytrain, n_iter=25, random_state=RANDOM_STATE, n_jobs=1):
+    # the notebook's search, on the same per-fold pipeline so scores are comparable
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.model_selection import RandomizedSearchCV, KFold
+    from training import build_pipeline
+
+    pipeline = build_pipeline()
+    pipeline.steps[-1] = ("model", RandomForestRegressor(random_state=random_state))
+    grid = {f"model__{k}": v for k, v in RANDOM_GRID.items()}
+    rscv = RandomizedSearchCV(pipeline, grid, n_iter=n_iter, cv=KFold(CV_FOLDS), n_jobs=n_jobs, random_state=random_state)
+    rscv.fit(xtrain, ytrain)
+    params = {k.split("__", 1)[1]: v for k, v in rscv.best_params_.items()}
+    return {"params": params, "cv_r2": float(rscv.best_score_)}
+
+
+def holdout_r2(params, xtrain, ytrain, xtest, ytest, random_state=RANDOM_STATE):
+    from sklearn.ensemble import RandomForestRegressor
+    from training import build_pipeline
+
+    pipeline = build_pipeline()
+    pipeline.steps[-1] = ("model", RandomForestRegressor(random_state=random_state, **params))
+    return float(pipeline.fit(xtrain, ytrain).score(xtest, ytest))
+
+
+def _timed(fn, *args, **kwargs):
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - wall, time.process_time() - cpu
+
+
+def save_best_params(result, data_sha256, path=BEST_PARAMS_PATH):
+    record = {
+        "model": "RandomForestRegressor",
+        "params": result["params"],
+        "cv_r2": round(result["cv_r2"], 6),
+        "data_sha256": data_sha256,
+        "searched_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=2)
+    os.replace(tmp, path)
+    return record
+
+
+def load_best_params(path=BEST_PARAMS_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["params"]
+
+
+def main(argv=None):
+    from vehicle_data import DATA_PATH, load_vehicle_data
+
+    parser = argparse.ArgumentParser(description="Tune the RandomForest model with warm-started successive halving.")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--out", default=BEST_PARAMS_PATH)
+    parser.add_argument("--candidates", type=int, default=27)
+    parser.add_argument("--n-jobs", type=int, default=1, help="CPU-seconds are only measured for this process, so benchmark with 1")
+    parser.add_argument("--benchmark", action="store_true", help="also run the notebook's RandomizedSearchCV and compare")
+    args = parser.parse_args(argv)
+
+    df = prepare_frame(load_vehicle_data(args.data))
+    xtrain, xtest, ytrain, ytest = split(df)
+
+    halving, wall, cpu = _timed(halving_search, xtrain, ytrain, n_candidates=args.candidates, n_jobs=args.n_jobs)
+    record = save_best_params(halving, frame_fingerprint(df), args.out)
+    print(f"halving search   wall {wall:7.2f}s  cpu {cpu:7.2f}s  cv R² {halving['cv_r2']:.4f}  -> {args.out}")
+    for h in halving["history"]:
+        print(f"  rung {h['rung']}: {h['candidates']:>2} candidates x {h['n_estimators']:>3} trees  best cv R² {h['best_cv_r2']:.4f}")
+    print(f"  best {record['params']}")
+
+    if args.benchmark:
+        baseline, b_wall, b_cpu = _timed(randomized_search, xtrain, ytrain, n_jobs=args.n_jobs)
+        print(f"randomized 25x5  wall {b_wall:7.2f}s  cpu {b_cpu:7.2f}s  cv R² {baseline['cv_r2']:.4f}")
+        print(f"  best {baseline['params']}")
+        print(f"speed-up: {b_wall / wall:.1f}x wall, {b_cpu / cpu:.1f}x cpu")
+        print(f"held-out test R²: halving {holdout_r2(halving['params'], xtrain, ytrain, xtest, ytest):.4f}"
+              f"  randomized {holdout_r2(baseline['params'], xtrain, ytrain, xtest, ytest):.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
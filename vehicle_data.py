@@ -0,0 +1,17 @@
+import os
+import functools
+from dataset_store import STORE_DIR, ensure_store, load_store
+
+DATA_PATH = os.path.join("data", "vehicles_data_2022.csv")
+
+
+@functools.lru_cache(maxsize=4)
+def _load_version(path, mtime_ns, size, store_dir):
+    # the store is rebuilt only when the source changes; columns come back memory-mapped
+    return load_store(ensure_store(path, store_dir))
+
+
+def load_vehicle_data(path=DATA_PATH, store_dir=STORE_DIR):
+    # shared read-only across reruns and sessions
+    st = os.stat(path)
+    return _load_version(path, st.st_mtime_ns, st.st_size, store_dir)
@@ -0,0 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# ----------------------------------
+# CONCURRENT WARM-UP
+# ----------------------------------
+# Runs independent start-up loads (model, assets, news) side by side.
+# Progress callbacks fire on the calling thread, so they may touch Streamlit elements.
+
+
+def run_concurrently(tasks, on_progress=None, max_workers=None):
+    results, errors = {}, {}
+    if not tasks:
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks), thread_name_prefix="warm-up") as pool:
+        futures = {pool.submit(fn): name for name, fn in tasks.items()}
+        for done, future in enumerate(as_completed(futures), 1):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+            if on_progress:
+                on_progress(done, len(tasks), name)
+    return results, errors